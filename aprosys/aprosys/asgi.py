@@ -9,8 +9,29 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
+from django.core.handlers.asgi import ASGIHandler
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "aprosys.settings")
 
-application = get_asgi_application()
+# URLconf das requisições ASGI: troca as listagens de pesquisa pelas views
+# assíncronas
+URLCONF = 'aprosys.urls_asgi'
+
+
+class AprosysASGIHandler(ASGIHandler):
+    def create_request(self, scope, body_file):
+        request, error_response = super().create_request(scope, body_file)
+        if request is not None:
+            request.urlconf = URLCONF
+        return request, error_response
+
+
+# Equivalente a get_asgi_application(), com o handler acima
+django.setup(set_prefix=False)
+application = AprosysASGIHandler()
+
+# Antes da primeira requisição (settings.AQUECER_NA_INICIALIZACAO)
+from modules.academico.aquecimento import aquecer_na_inicializacao  # noqa
+
+aquecer_na_inicializacao()
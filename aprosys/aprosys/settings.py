@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -43,10 +44,14 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "modules.academico.middleware.EstaticosMiddleware",
+    "modules.academico.middleware.MetricasMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "modules.academico.middleware.PerfilVoluntarioMiddleware",
+    "modules.academico.middleware.ReplicaMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -55,7 +60,8 @@ ROOT_URLCONF = "aprosys.urls"
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        # DjangoTemplates medindo o tempo de renderização (Server-Timing)
+        "BACKEND": "modules.academico.instrumentacao.DjangoTemplatesMedidos",
         "DIRS": [BASE_DIR / 'aprosys' / 'templates'],
         "APP_DIRS": True,
         "OPTIONS": {
@@ -78,9 +84,64 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        "OPTIONS": {
+            # Transações já começam com o lock de escrita: com o padrão
+            # (DEFERRED), uma transação que lê e depois escreve falha com
+            # "database is locked" sem esperar o busy_timeout.
+            "transaction_mode": "IMMEDIATE",
+        },
+    }
+}
+
+# Pragmas aplicados a cada conexão SQLite (modules/academico/sqlite.py).
+# Com WAL as leituras não esperam as escritas, e synchronous=NORMAL só
+# sincroniza o disco nos checkpoints (seguro com WAL).
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,  # ms esperando o lock antes de falhar
+    'mmap_size': 128 * 1024 * 1024,
+    'cache_size': -20000,  # negativo: em KiB (20 MB)
+    'temp_store': 'MEMORY',
+}
+
+# Réplica de leitura, opcional, usada pelas pesquisas e relatórios
+# (modules/academico/roteamento.py). Localmente pode ser uma cópia do
+# db.sqlite3 atualizada com `manage.py sincronizar_replica`; em produção,
+# troque por um ENGINE/NAME apontando para a réplica do PostgreSQL.
+if os.environ.get('APROSYS_REPLICA_DB'):
+    DATABASES['replica'] = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": os.environ['APROSYS_REPLICA_DB'],
+        # Nos testes a réplica é o próprio banco de teste
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_ROUTERS = ['modules.academico.roteamento.ReplicaRouter']
+
+# Cache compartilhado por todos os processos da instalação: os servidores
+# e o `manage.py runworker`. As versões dos models (conditional.py), a
+# visibilidade dos professores, as estatísticas e os fragmentos de menu são
+# invalidados por quem grava, inclusive pelas tarefas do worker; com um
+# cache por processo (LocMemCache, o padrão do Django) os demais processos
+# continuariam servindo dados antigos. A pasta precisa ser a mesma para
+# todos (no docker-compose.yml, o volume do projeto). Com processos em
+# mais de uma máquina, use APROSYS_REDIS_URL (settings_producao.py).
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('APROSYS_CACHE_DIR', BASE_DIR / 'cache'),
+        'OPTIONS': {
+            # Versões, visibilidade por professor e fragmentos por papel
+            # e página passam das 300 entradas do padrão
+            'MAX_ENTRIES': 10000,
+        },
     }
 }
 
+# Segundos em que a sessão lê só do primário depois de gravar algo
+REPLICA_ATRASO_MAXIMO = 10
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -118,6 +179,22 @@ USE_TZ = True
 
 STATIC_URL = "static/"
 STATICFILES_DIRS = [BASE_DIR / 'aprosys/static']
+# Gerado pelo collectstatic: nomes com hash, cópias .gz/.br e PNGs
+# otimizados, servidos pelo EstaticosMiddleware com DEBUG desligado
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'modules.academico.estaticos.EstaticosStorage',
+    },
+}
+
+# Arquivos gerados/enviados (fotos, boletins)
+MEDIA_URL = 'media/'
+MEDIA_ROOT = BASE_DIR / 'media'
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
@@ -126,3 +203,66 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 LOGIN_REDIRECT_URL = "/home"
 AUTH_USER_MODEL = 'academico.CustomUser'
+
+# Carrega o usuário junto com o perfil de Voluntario em uma única query
+AUTHENTICATION_BACKENDS = ['modules.academico.backends.VoluntarioBackend']
+
+# Tempos de SQL, templates e view de cada resposta no cabeçalho
+# Server-Timing (modules/academico/instrumentacao.py)
+SERVER_TIMING = True
+
+# Token aceito em /metrics além do login de equipe (is_staff), para o
+# coletor do Prometheus: Authorization: Bearer <token>
+METRICAS_TOKEN = os.environ.get('APROSYS_METRICAS_TOKEN', '')
+
+# Queries acima de CONSULTA_LENTA_MS milissegundos (None desliga) são
+# registradas em CONSULTA_LENTA_ARQUIVO, com o plano de execução em uma
+# fração sorteada delas (modules/academico/consultas_lentas.py). Para
+# revisar: manage.py consultas_lentas
+CONSULTA_LENTA_MS = 100
+CONSULTA_LENTA_EXPLAIN = 0.1
+CONSULTA_LENTA_ARQUIVO = BASE_DIR / 'consultas_lentas.jsonl'
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'mensagem': {'format': '%(message)s'},
+    },
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+        'consultas_lentas': {
+            'class': 'logging.handlers.RotatingFileHandler',
+            'filename': CONSULTA_LENTA_ARQUIVO,
+            'maxBytes': 10 * 1024 * 1024,
+            'backupCount': 5,
+            'encoding': 'utf-8',
+            'delay': True,
+            'formatter': 'mensagem',
+        },
+    },
+    'loggers': {
+        'aprosys.consultas_lentas': {
+            'handlers': ['consultas_lentas'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+        'aprosys.aquecimento': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
+
+# Cache do HTML do menu lateral e do rodapé, por papel e página ativa
+# ({% include_cacheado %}, modules/academico/templatetags/fragmentos.py)
+FRAGMENTOS_CACHE = True
+
+# Compila os templates e carrega os URLconfs ao subir o servidor, antes da
+# primeira requisição (modules/academico/aquecimento.py). Ligado em
+# settings_producao.py; em desenvolvimento o runserver recarrega o
+# processo a cada alteração.
+AQUECER_NA_INICIALIZACAO = False
@@ -0,0 +1,61 @@
+"""
+Settings de produção: os de settings.py com DEBUG desligado, chave e hosts
+vindos do ambiente, loader de templates em cache explícito e aquecimento
+na inicialização do servidor.
+
+O cache precisa ser compartilhado por todos os workers do servidor e pelo
+`manage.py runworker` (ver CACHES em settings.py): em uma só máquina basta
+a pasta de APROSYS_CACHE_DIR; com processos em várias máquinas, defina
+APROSYS_REDIS_URL.
+
+Uso: DJANGO_SETTINGS_MODULE=aprosys.settings_producao
+"""
+
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .settings import *  # noqa: F401,F403
+from .settings import TEMPLATES
+
+DEBUG = False
+
+SECRET_KEY = os.environ.get('APROSYS_SECRET_KEY', '')
+if not SECRET_KEY:
+    raise ImproperlyConfigured('Defina a variável APROSYS_SECRET_KEY.')
+
+ALLOWED_HOSTS = os.environ.get('APROSYS_ALLOWED_HOSTS', 'localhost').split(
+    ','
+)
+
+# Templates lidos do disco e compilados uma vez por processo. Com a lista
+# de loaders explícita, APP_DIRS precisa ficar desligado.
+TEMPLATES = [
+    {
+        **TEMPLATES[0],
+        'APP_DIRS': False,
+        'OPTIONS': {
+            **TEMPLATES[0]['OPTIONS'],
+            'loaders': [
+                (
+                    'django.template.loaders.cached.Loader',
+                    [
+                        'django.template.loaders.filesystem.Loader',
+                        'django.template.loaders.app_directories.Loader',
+                    ],
+                ),
+            ],
+        },
+    },
+]
+
+AQUECER_NA_INICIALIZACAO = True
+
+# Requer o pacote redis
+if os.environ.get('APROSYS_REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['APROSYS_REDIS_URL'],
+        }
+    }
@@ -0,0 +1,37 @@
+"""
+URLs do app ASGI (aprosys/asgi.py): as mesmas de aprosys/urls.py, com as
+listagens de pesquisa servidas pelas versões assíncronas das views.
+"""
+from django.urls import path
+from modules.academico import views
+
+from .urls import urlpatterns as urlpatterns_wsgi
+
+urlpatterns = [
+    path(
+        'academico/alunos/pesquisar/',
+        views.apesquisar_aluno,
+        name='pesquisar_aluno',
+    ),
+    path(
+        'academico/disciplinas/pesquisar/',
+        views.apesquisar_disciplina,
+        name='pesquisar_disciplina',
+    ),
+    path(
+        'academico/turmas/pesquisar/',
+        views.apesquisar_turma,
+        name='pesquisar_turma',
+    ),
+    path(
+        'academico/voluntarios/pesquisar/',
+        views.apesquisar_voluntario,
+        name='pesquisar_voluntario',
+    ),
+    path(
+        'academico/cursos/pesquisar/',
+        views.apesquisar_curso,
+        name='pesquisar_curso',
+    ),
+    *urlpatterns_wsgi,
+]
@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "aprosys.settings")
 
 application = get_wsgi_application()
+
+# Antes da primeira requisição (settings.AQUECER_NA_INICIALIZACAO)
+from modules.academico.aquecimento import aquecer_na_inicializacao  # noqa
+
+aquecer_na_inicializacao()
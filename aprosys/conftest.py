@@ -0,0 +1,93 @@
+"""
+Configuração dos testes: o Django é iniciado com aprosys.settings e os
+testes que usam a fixture `dados` rodam num banco de teste criado uma vez
+por sessão e populado por modules/academico/massa.py. O banco e o cache
+da aplicação não são tocados.
+"""
+
+import logging
+import os
+from dataclasses import dataclass
+
+import django
+import pytest
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'aprosys.settings')
+django.setup()
+
+from django.core.cache import cache  # noqa: E402
+from django.test import override_settings  # noqa: E402
+from django.test.utils import (  # noqa: E402
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+from modules.academico import massa  # noqa: E402
+from modules.academico.models import CustomUser, Tarefa  # noqa: E402
+
+ALUNOS = 60
+
+
+@dataclass
+class Dados:
+    massa: massa.Massa
+    usuarios: dict
+
+
+@pytest.fixture(scope='session')
+def dados():
+    """
+    Banco de teste com ALUNOS alunos e um usuário de cada papel
+    (SUPERUSUARIO, COORDENADOR e PROFESSOR).
+    """
+    cache_local = override_settings(CACHES={
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'testes',
+        }
+    })
+    cache_local.enable()
+    setup_test_environment()
+    bancos = setup_databases(verbosity=0, interactive=False)
+    # Os 403/404 esperados (papéis sem acesso) não poluem a saída
+    registro = logging.getLogger('django.request')
+    nivel = registro.level
+    registro.setLevel(logging.ERROR)
+    try:
+        gerados = massa.popular(
+            alunos=ALUNOS, alunos_por_turma=5, semente=ALUNOS
+        )
+        superuser = CustomUser.objects.create_superuser(
+            username=f'admin-{gerados.etiqueta}',
+            email=f'admin.{gerados.etiqueta}@exemplo.org',
+            password=None,
+            nome='Administrador',
+        )
+        # Para as páginas de acompanhamento de tarefa
+        Tarefa.objects.create(
+            tipo='gerar_boletins',
+            parametros={'periodo_id': gerados.periodo.pk},
+            criado_por=superuser,
+        )
+        yield Dados(
+            massa=gerados,
+            usuarios={
+                'SUPERUSUARIO': superuser,
+                'COORDENADOR': gerados.coordenadores[0].user,
+                'PROFESSOR': gerados.professores[0].user,
+            },
+        )
+    finally:
+        registro.setLevel(nivel)
+        teardown_databases(bancos, verbosity=0)
+        teardown_test_environment()
+        cache_local.disable()
+
+
+@pytest.fixture
+def cache_limpo(dados):
+    """Caches da aplicação (visibilidade, estatísticas) vazios no teste."""
+    cache.clear()
+    yield
+    cache.clear()
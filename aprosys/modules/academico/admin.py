@@ -1,10 +1,15 @@
 from django.contrib import admin
 from .models import (
+    Aula,
+    Boletim,
+    Tarefa,
     Curso,
     Turno,
     PeriodoLetivo,
     Turma,
     Disciplina,
+    FrequenciaAluno,
+    FrequenciaProfessor,
     TurmaDisciplina,
     Voluntario,
     Aluno,
@@ -25,4 +30,9 @@ admin.site.register(TurmaDisciplina)
 admin.site.register(Voluntario)
 admin.site.register(Aluno)
 admin.site.register(TurmaAluno)
-admin.site.register(TurmaDisciplinaProfessor)
\ No newline at end of file
+admin.site.register(TurmaDisciplinaProfessor)
+admin.site.register(Aula)
+admin.site.register(FrequenciaAluno)
+admin.site.register(FrequenciaProfessor)
+admin.site.register(Boletim)
+admin.site.register(Tarefa)
@@ -1,7 +1,33 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_migrate
+
+from .consultas_lentas import instalar_registro
+from .instrumentacao import instalar_medicao
+from .sqlite import configurar_conexao
+
+
+def _instalar_indices_busca(sender, using, **kwargs):
+    # Os models só podem ser importados com o registro de apps pronto
+    from .models import Aluno, Disciplina, Turma, Voluntario  # noqa: PLC0415
+    from .search import instalar_indices_busca  # noqa: PLC0415
+
+    instalar_indices_busca([Aluno, Disciplina, Turma, Voluntario], using)
 
 
 class AcademicoConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "modules.academico"
     label = "academico"
+
+    def ready(self):
+        # signals importa os models: só com o registro de apps pronto
+        from . import signals  # noqa: F401, PLC0415
+
+        connection_created.connect(configurar_conexao)
+        connection_created.connect(instalar_medicao)
+        connection_created.connect(instalar_registro)
+
+        # Migrações que recriam tabelas no SQLite apagam os triggers do
+        # índice FTS; após cada migrate o índice é conferido e refeito.
+        post_migrate.connect(_instalar_indices_busca, sender=self)
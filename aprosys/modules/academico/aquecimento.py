@@ -0,0 +1,78 @@
+"""
+Aquecimento do processo servidor antes da primeira requisição: compila
+todos os templates das pastas DIRS (guardados pelo loader em cache) e
+carrega os URLconfs, com as views que eles importam.
+
+Roda em aprosys/wsgi.py e aprosys/asgi.py quando
+settings.AQUECER_NA_INICIALIZACAO está ligado (ver settings_producao.py):
+o aquecimento só vale para o processo em que é feito, por isso não basta
+um comando de deploy. `manage.py aquecer` faz o mesmo e aponta templates
+com erro.
+"""
+
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.template import TemplateSyntaxError, engines
+from django.template.backends.django import DjangoTemplates
+from django.urls import get_resolver
+
+logger = logging.getLogger('aprosys.aquecimento')
+
+# URLconfs servidos: o do WSGI e o do ASGI (aprosys/asgi.py)
+URLCONFS = [None, 'aprosys.urls_asgi']
+
+
+@dataclass
+class Aquecimento:
+    templates: int = 0
+    erros: dict = field(default_factory=dict)
+    duracao: float = 0.0
+
+
+def nomes_templates(pasta):
+    for raiz, _, arquivos in os.walk(pasta):
+        for arquivo in arquivos:
+            if not arquivo.startswith('.'):
+                caminho = os.path.join(raiz, arquivo)
+                yield os.path.relpath(caminho, pasta).replace(os.sep, '/')
+
+
+def aquecer():
+    """
+    Compila os templates e carrega os URLconfs. Templates com erro de
+    sintaxe não interrompem o aquecimento; voltam em Aquecimento.erros.
+    """
+    resultado = Aquecimento()
+    inicio = time.perf_counter()
+    for backend in engines.all():
+        if not isinstance(backend, DjangoTemplates):
+            continue
+        for pasta in backend.engine.dirs:
+            for nome in sorted(nomes_templates(pasta)):
+                try:
+                    backend.engine.get_template(nome)
+                except TemplateSyntaxError as erro:
+                    resultado.erros[nome] = str(erro)
+                else:
+                    resultado.templates += 1
+    for urlconf in URLCONFS:
+        # reverse_dict monta as tabelas de resolução e de reverse()
+        get_resolver(urlconf).reverse_dict
+    resultado.duracao = time.perf_counter() - inicio
+    return resultado
+
+
+def aquecer_na_inicializacao():
+    if not getattr(settings, 'AQUECER_NA_INICIALIZACAO', False):
+        return
+    resultado = aquecer()
+    for nome, erro in resultado.erros.items():
+        logger.warning('Template %s com erro: %s', nome, erro)
+    logger.info(
+        '%d templates compilados e URLconfs carregados em %.0f ms.',
+        resultado.templates, resultado.duracao * 1000,
+    )
@@ -0,0 +1,97 @@
+"""
+Auditoria dos índices das listagens de pesquisa: roda EXPLAIN em cada
+SELECT feito pelas páginas e aponta as tabelas varridas inteiras, sem
+índice. Usada por `manage.py auditar_indices` e pelos testes.
+"""
+
+import re
+from contextlib import ExitStack
+from dataclasses import dataclass
+
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+from .consultas_lentas import explain
+
+# (nome da URL, querystring): listagens de pesquisa nas ordenações e
+# filtros mais usados
+CONSULTAS = [
+    ('pesquisar_aluno', ''),
+    ('pesquisar_aluno', 'order=status'),
+    ('pesquisar_aluno', 'order=nome&dir=desc'),
+    ('pesquisar_disciplina', ''),
+    ('pesquisar_disciplina', 'order=status'),
+    ('pesquisar_disciplina_json', ''),
+    ('pesquisar_turma', ''),
+    ('pesquisar_turma', 'order=status'),
+    ('pesquisar_voluntario', ''),
+    ('pesquisar_curso', ''),
+]
+
+# Tabelas pequenas, de cadastro, em que a varredura completa é esperada
+IGNORADAS_PADRAO = [
+    'academico_curso',
+    'academico_periodoletivo',
+    'academico_turno',
+    'django_session',
+    'django_content_type',
+]
+
+# Varredura sem índice nos planos de cada banco. Os "SCAN ... USING
+# INDEX" do SQLite percorrem um índice na ordem do ORDER BY e param no
+# LIMIT, não são varreduras da tabela.
+VARREDURA = {
+    'sqlite': re.compile(r'\bSCAN (\w+)(?! USING)(?! VIRTUAL)\s*$'),
+    'postgresql': re.compile(r'Seq Scan on (\w+)'),
+}
+
+
+@dataclass
+class Plano:
+    banco: str
+    sql: str
+    linhas: list
+    # Tabelas varridas inteiras, sem índice, fora das ignoradas
+    varridas: set
+
+
+def varridas(vendor, linhas, ignoradas=IGNORADAS_PADRAO):
+    padrao = VARREDURA.get(vendor)
+    if padrao is None:
+        return set()
+    return {
+        encontrada.group(1)
+        for linha in linhas
+        if (encontrada := padrao.search(linha))
+        and encontrada.group(1) not in ignoradas
+    }
+
+
+def auditar(client, url, ignoradas=IGNORADAS_PADRAO):
+    """
+    Faz o GET em `url` e retorna (status, [Plano de cada SELECT feito]).
+    """
+    with ExitStack() as pilha:
+        contextos = [
+            pilha.enter_context(CaptureQueriesContext(conexao))
+            for conexao in connections.all()
+        ]
+        response = client.get(url)
+        if response.streaming:
+            b''.join(response.streaming_content)
+
+    planos = []
+    for contexto in contextos:
+        conexao = contexto.connection
+        for query in contexto.captured_queries:
+            sql = query['sql']
+            if not sql.lstrip().upper().startswith('SELECT'):
+                continue
+            linhas = explain(conexao, sql)
+            planos.append(Plano(
+                banco=conexao.alias,
+                sql=sql,
+                linhas=linhas,
+                varridas=varridas(conexao.vendor, linhas, ignoradas),
+            ))
+    return response.status_code, planos
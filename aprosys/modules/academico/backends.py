@@ -0,0 +1,31 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+
+class VoluntarioBackend(ModelBackend):
+    """
+    Backend de autenticação que carrega o usuário junto com o perfil de
+    Voluntario em uma única query, evitando a query extra a cada acesso a
+    `request.user.voluntario` (decorators, views e templates).
+    """
+
+    def get_user(self, user_id):
+        UserModel = get_user_model()
+        try:
+            user = UserModel._default_manager.select_related(
+                'voluntario'
+            ).get(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
+
+    async def aget_user(self, user_id):
+        # O ModelBackend assíncrono não passa pelo get_user acima
+        UserModel = get_user_model()
+        try:
+            user = await UserModel._default_manager.select_related(
+                'voluntario'
+            ).aget(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
@@ -0,0 +1,179 @@
+"""
+Geração em lote dos boletins de um período letivo.
+
+Os dados de todas as matrículas são lidos com poucas queries, os PDFs são
+renderizados em paralelo (um processo por núcleo) e gravados no storage em
+caminhos derivados do hash do conteúdo. Matrículas cujos dados não mudaram
+desde a última geração são puladas.
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+
+from .models import Boletim, FrequenciaAluno, TurmaAluno, TurmaDisciplina
+from .pdf import renderizar_boletim
+
+# Incrementar ao mudar o layout do PDF, para que todos os boletins sejam
+# gerados novamente.
+VERSAO_LAYOUT = 1
+CHUNK_SIZE = 200
+
+
+class RelatorioBoletins:
+    def __init__(self):
+        self.total = 0
+        self.gerados = 0
+        self.inalterados = 0
+
+
+def dados_boletins(periodo_id):
+    """
+    Gera (turma_aluno_id, dados) para cada matrícula ativa nas turmas do
+    período. Os dados são apenas tipos simples, para irem ao pool.
+    """
+    disciplinas = defaultdict(list)
+    for td_id, turma_id, nome in (
+        TurmaDisciplina.objects.filter(
+            status=1, turma__periodo_letivo_id=periodo_id
+        )
+        .order_by('disciplina__nome')
+        .values_list('pk', 'turma_id', 'disciplina__nome')
+    ):
+        disciplinas[turma_id].append((td_id, nome))
+
+    frequencias = {
+        (td_id, aluno_id): (aulas, presencas)
+        for td_id, aluno_id, aulas, presencas in FrequenciaAluno.objects
+        .filter(turma_disciplina__turma__periodo_letivo_id=periodo_id)
+        .values_list('turma_disciplina_id', 'aluno_id', 'aulas', 'presencas')
+    }
+
+    matriculas = (
+        TurmaAluno.objects.filter(
+            status=1, turma__periodo_letivo_id=periodo_id
+        )
+        .order_by('turma__nome', 'aluno__nome')
+        .values_list(
+            'pk',
+            'turma_id',
+            'aluno_id',
+            'aluno__nome',
+            'aluno__email',
+            'turma__nome',
+            'turma__curso__nome',
+            'turma__periodo_letivo__nome',
+        )
+    )
+    for (
+        pk, turma_id, aluno_id, aluno, email, turma, curso, periodo
+    ) in matriculas.iterator(chunk_size=2000):
+        linhas = []
+        for td_id, nome in disciplinas[turma_id]:
+            aulas, presencas = frequencias.get((td_id, aluno_id), (0, 0))
+            linhas.append(
+                {'nome': nome, 'aulas': aulas, 'presencas': presencas}
+            )
+        yield pk, {
+            'aluno': aluno,
+            'email': email,
+            'turma': turma,
+            'curso': curso,
+            'periodo': periodo,
+            'disciplinas': linhas,
+            'aulas': sum(linha['aulas'] for linha in linhas),
+            'presencas': sum(linha['presencas'] for linha in linhas),
+        }
+
+
+def hash_dados(dados):
+    payload = json.dumps([VERSAO_LAYOUT, dados], sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def salvar_pdf(conteudo):
+    """
+    Grava o PDF em boletins/<hash>.pdf. PDFs idênticos (ex.: regerados sem
+    mudança) ocupam um único arquivo.
+    """
+    digest = hashlib.sha256(conteudo).hexdigest()
+    nome = f'boletins/{digest[:2]}/{digest}.pdf'
+    if not default_storage.exists(nome):
+        nome = default_storage.save(nome, ContentFile(conteudo))
+    return nome
+
+
+def _gravar(pendentes, pdfs, relatorio, progresso):
+    resultados = zip(pendentes, pdfs)
+    while lote := list(islice(resultados, CHUNK_SIZE)):
+        boletins = [
+            Boletim(
+                turma_aluno_id=turma_aluno_id,
+                hash_dados=hash_atual,
+                arquivo=salvar_pdf(pdf),
+            )
+            for (turma_aluno_id, hash_atual, _), pdf in lote
+        ]
+        with transaction.atomic():
+            Boletim.objects.bulk_create(
+                boletins,
+                update_conflicts=True,
+                unique_fields=['turma_aluno'],
+                update_fields=['hash_dados', 'arquivo', 'gerado_em'],
+            )
+        relatorio.gerados += len(boletins)
+        if progresso:
+            progresso(relatorio.gerados, len(pendentes))
+
+
+def gerar_boletins(periodo_id, workers=None, forcar=False, progresso=None):
+    """
+    Gera os boletins do período e retorna um RelatorioBoletins. `workers`
+    é o número de processos (padrão: um por núcleo); `forcar` refaz também
+    os boletins inalterados. `progresso(gerados, pendentes)` é chamado a
+    cada lote gravado.
+    """
+    relatorio = RelatorioBoletins()
+    existentes = dict(
+        Boletim.objects.filter(
+            turma_aluno__turma__periodo_letivo_id=periodo_id
+        ).values_list('turma_aluno_id', 'hash_dados')
+    )
+
+    pendentes = []
+    for turma_aluno_id, dados in dados_boletins(periodo_id):
+        relatorio.total += 1
+        hash_atual = hash_dados(dados)
+        if not forcar and existentes.get(turma_aluno_id) == hash_atual:
+            relatorio.inalterados += 1
+            continue
+        pendentes.append((turma_aluno_id, hash_atual, dados))
+
+    workers = min(workers or os.cpu_count() or 1, len(pendentes))
+    dados = [item[2] for item in pendentes]
+    if workers <= 1:
+        _gravar(
+            pendentes, map(renderizar_boletim, dados), relatorio, progresso
+        )
+        return relatorio
+
+    # spawn: os processos filhos não herdam conexões de banco nem threads
+    # do servidor; só importam o módulo pdf, que não depende do Django.
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context('spawn')
+    ) as pool:
+        pdfs = pool.map(
+            renderizar_boletim,
+            dados,
+            chunksize=max(1, len(dados) // (workers * 4)),
+        )
+        _gravar(pendentes, pdfs, relatorio, progresso)
+    return relatorio
@@ -0,0 +1,111 @@
+import hashlib
+import uuid
+from functools import cache as memoize
+from functools import wraps
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+
+
+def _versao_key(model):
+    return f'academico:geracao:{model._meta.label_lower}'
+
+
+def _nova_versao():
+    return uuid.uuid4().hex
+
+
+def bump_versao(model):
+    """
+    Marca o model como alterado. Chamado pelos signals de post_save/
+    post_delete; operações em massa (bulk_create, update) devem chamar
+    diretamente.
+    """
+    cache.set(_versao_key(model), _nova_versao(), None)
+
+
+def get_versoes(models):
+    """
+    Retorna {model: geração}. Se o cache tiver perdido a versão de um
+    model, uma nova é criada, o que invalida os ETags antigos em vez de
+    arriscar um 304 indevido.
+    """
+    keys = {_versao_key(model): model for model in models}
+    encontradas = cache.get_many(keys)
+    faltando = {}
+    for key in keys:
+        if key not in encontradas:
+            faltando[key] = encontradas[key] = _nova_versao()
+    if faltando:
+        cache.set_many(faltando, None)
+    return {keys[key]: versao for key, versao in encontradas.items()}
+
+
+@memoize
+def _deploy_stamp():
+    # Muda a cada deploy de templates ou código do app, para que HTML novo
+    # não seja mascarado por um 304 com dados inalterados.
+    dirs = [Path(d) for t in settings.TEMPLATES for d in t.get('DIRS', [])]
+    dirs.append(Path(__file__).resolve().parent)
+    mtimes = [
+        f.stat().st_mtime
+        for d in dirs
+        for f in d.rglob('*')
+        if f.suffix in {'.html', '.py'}
+    ]
+    return str(max(mtimes, default=0))
+
+
+def conditional_page(*models):
+    """
+    Decorator de views GET que respondem 304 (ETag) enquanto nenhum dos
+    `models` for alterado. O ETag também varia por usuário, querystring e
+    token CSRF, já que todas as páginas embutem o formulário de logout.
+    Não há Last-Modified: a data das versões não distingue usuários nem
+    páginas, e um If-Modified-Since sozinho validaria a página de outro.
+    """
+
+    def _versoes(request):
+        if not hasattr(request, '_versoes_condicionais'):
+            request._versoes_condicionais = get_versoes(models)
+        return request._versoes_condicionais
+
+    def etag_func(request, *args, **kwargs):
+        versoes = _versoes(request)
+        partes = [
+            _deploy_stamp(),
+            request.get_full_path(),
+            str(request.user.pk),
+            request.META.get('CSRF_COOKIE', ''),
+            *(versoes[model] for model in models),
+        ]
+        return hashlib.sha1('|'.join(partes).encode()).hexdigest()
+
+    def decorator(view_func):
+        conditional_view = condition(etag_func=etag_func)(view_func)
+
+        if iscoroutinefunction(view_func):
+            # O condition() calcula o ETag de forma síncrona também nas views
+            # async; as versões vêm só do cache, sem acesso ao banco.
+            @wraps(view_func)
+            async def _async_wrapped(request, *args, **kwargs):
+                response = await conditional_view(request, *args, **kwargs)
+                patch_cache_control(response, private=True, no_cache=True)
+                return response
+
+            return _async_wrapped
+
+        @wraps(view_func)
+        def _wrapped(request, *args, **kwargs):
+            response = conditional_view(request, *args, **kwargs)
+            # Obriga o navegador a revalidar em vez de usar cache heurístico
+            patch_cache_control(response, private=True, no_cache=True)
+            return response
+
+        return _wrapped
+
+    return decorator
@@ -0,0 +1,89 @@
+"""
+Registro das queries lentas.
+
+Um execute_wrapper, instalado em cada conexão nova (connection_created,
+ver apps.py), mede as queries e registra as que passam de
+settings.CONSULTA_LENTA_MS no logger `aprosys.consultas_lentas`, uma linha
+JSON por query, com o nome da URL e o caminho da requisição que a fez
+(instrumentacao.medicao_atual). Em uma fração sorteada dos SELECTs
+(settings.CONSULTA_LENTA_EXPLAIN) o plano de execução vai junto.
+
+Os parâmetros das queries não são registrados, pois podem conter dados
+pessoais de alunos e voluntários. Para revisar o arquivo, use
+`manage.py consultas_lentas`.
+"""
+
+import json
+import logging
+import random
+import time
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.utils import timezone
+
+from .instrumentacao import medicao_atual
+
+logger = logging.getLogger('aprosys.consultas_lentas')
+
+
+def explain(conexao, sql, params=None):
+    """
+    Linhas do plano de `sql` (EXPLAIN QUERY PLAN no SQLite, EXPLAIN nos
+    demais bancos). Usa um cursor sem os execute_wrappers, para não ser
+    medido nem registrado.
+    """
+    prefixo = (
+        'EXPLAIN QUERY PLAN ' if conexao.vendor == 'sqlite' else 'EXPLAIN '
+    )
+    with conexao.wrap_database_errors:
+        cursor = conexao.create_cursor()
+        try:
+            cursor.execute(prefixo + sql, params)
+            # SQLite: (id, parent, notused, detail); PostgreSQL: (linha,)
+            return [str(linha[-1]) for linha in cursor.fetchall()]
+        finally:
+            cursor.close()
+
+
+def _explicavel(sql, many):
+    return not many and sql.lstrip()[:6].upper().startswith(
+        ('SELECT', 'WITH')
+    )
+
+
+def registrar_consulta_lenta(execute, sql, params, many, context):
+    limite = getattr(settings, 'CONSULTA_LENTA_MS', None)
+    if limite is None:
+        return execute(sql, params, many, context)
+    inicio = time.perf_counter()
+    resultado = execute(sql, params, many, context)
+    duracao = (time.perf_counter() - inicio) * 1000
+    if duracao >= limite:
+        _registrar(context['connection'], sql, params, many, duracao)
+    return resultado
+
+
+def _registrar(conexao, sql, params, many, duracao):
+    medicao = medicao_atual()
+    registro = {
+        'data': timezone.now().isoformat(timespec='seconds'),
+        'duracao_ms': round(duracao, 1),
+        'banco': conexao.alias,
+        # Fora de uma requisição (comandos, runworker) ficam nulos
+        'url_name': medicao and medicao.url_name,
+        'caminho': medicao and medicao.caminho,
+        'sql': sql,
+    }
+    amostra = getattr(settings, 'CONSULTA_LENTA_EXPLAIN', 0)
+    if _explicavel(sql, many) and random.random() < amostra:
+        try:
+            registro['plano'] = explain(conexao, sql, params)
+        except DatabaseError as erro:
+            registro['plano'] = [f'Erro no EXPLAIN: {erro}']
+    logger.info(json.dumps(registro, ensure_ascii=False))
+
+
+def instalar_registro(sender, connection, **kwargs):
+    if registrar_consulta_lenta not in connection.execute_wrappers:
+        connection.execute_wrappers.append(registrar_consulta_lenta)
@@ -0,0 +1,54 @@
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from .models import TurmaDisciplina
+
+# Os signals de TurmaAluno/TurmaDisciplina/TurmaDisciplinaProfessor
+# invalidam o cache; o timeout cobre alterações feitas por update()/bulk_*.
+ESTATISTICAS_TIMEOUT = 60 * 60
+
+GLOBAL = 'global'
+
+
+def _cache_key(voluntario_id):
+    return f'academico:dashboard:{voluntario_id}'
+
+
+def _calcular_estatisticas(voluntario_id):
+    # Uma única query: as contagens distintas partem das disciplinas ativas
+    # das turmas (filtradas pelo professor, quando houver).
+    turma_disciplinas = TurmaDisciplina.objects.filter(status=1)
+    if voluntario_id != GLOBAL:
+        turma_disciplinas = turma_disciplinas.filter(
+            turmadisciplinaprofessor__voluntario_id=voluntario_id,
+            turmadisciplinaprofessor__status=1,
+        )
+    return turma_disciplinas.aggregate(
+        alunos=Count(
+            'turma__turmaaluno__aluno',
+            filter=Q(turma__turmaaluno__status=1),
+            distinct=True,
+        ),
+        disciplinas=Count('disciplina', distinct=True),
+        turmas=Count('turma', distinct=True),
+    )
+
+
+def get_estatisticas(request):
+    """
+    Retorna {'alunos': ..., 'disciplinas': ..., 'turmas': ...} para os cards
+    da home: do próprio professor ou, para os demais perfis, do sistema todo.
+    """
+    voluntario_id = request.user.pk if request.perfil.is_professor else GLOBAL
+    key = _cache_key(voluntario_id)
+    estatisticas = cache.get(key)
+    if estatisticas is None:
+        estatisticas = _calcular_estatisticas(voluntario_id)
+        cache.set(key, estatisticas, ESTATISTICAS_TIMEOUT)
+    return estatisticas
+
+
+def invalidar_estatisticas(voluntario_ids):
+    # Toda alteração de vínculo também muda os totais gerais
+    keys = [_cache_key(pk) for pk in voluntario_ids if pk is not None]
+    cache.delete_many([*keys, _cache_key(GLOBAL)])
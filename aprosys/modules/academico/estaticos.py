@@ -0,0 +1,85 @@
+"""
+Storage dos arquivos estáticos usado pelo collectstatic.
+
+Além dos nomes com hash do conteúdo (ManifestStaticFilesStorage), grava
+cópias pré-comprimidas (.gz e, se o módulo brotli estiver instalado, .br)
+dos arquivos de texto e recomprime os PNGs sem perda. O
+EstaticosMiddleware serve essas variantes com cache longo.
+"""
+
+import gzip
+import io
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+from PIL import Image
+
+try:
+    import brotli
+except ImportError:  # opcional: sem ele são geradas apenas as cópias .gz
+    brotli = None
+
+COMPRIMIVEIS = ('.css', '.js', '.svg', '.json', '.txt', '.html', '.xml')
+# Abaixo disso o ganho não compensa o cabeçalho Content-Encoding
+TAMANHO_MINIMO = 256
+
+
+def otimizar_png(conteudo):
+    """
+    Recomprime o PNG sem perda. Retorna None se não ficou menor.
+    """
+    with Image.open(io.BytesIO(conteudo)) as imagem:
+        saida = io.BytesIO()
+        imagem.save(saida, 'PNG', optimize=True)
+    otimizado = saida.getvalue()
+    return otimizado if len(otimizado) < len(conteudo) else None
+
+
+def comprimir(conteudo):
+    """
+    Retorna {extensão: bytes} com as versões comprimidas que ficaram
+    menores que o original.
+    """
+    variantes = {'.gz': gzip.compress(conteudo, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variantes['.br'] = brotli.compress(conteudo)
+    return {
+        extensao: comprimido
+        for extensao, comprimido in variantes.items()
+        if len(comprimido) < len(conteudo) * 0.95
+    }
+
+
+class EstaticosStorage(ManifestStaticFilesStorage):
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+
+        # Originais e versões com hash (as que vão para o navegador)
+        for nome in {*paths, *self.hashed_files.values()}:
+            if nome.endswith('.png'):
+                self._otimizar(nome)
+            elif nome.endswith(COMPRIMIVEIS):
+                self._comprimir(nome)
+
+    def _ler(self, nome):
+        with self.open(nome) as arquivo:
+            return arquivo.read()
+
+    def _gravar(self, nome, conteudo):
+        if self.exists(nome):
+            self.delete(nome)
+        self.save(nome, ContentFile(conteudo))
+
+    def _otimizar(self, nome):
+        otimizado = otimizar_png(self._ler(nome))
+        if otimizado is not None:
+            self._gravar(nome, otimizado)
+
+    def _comprimir(self, nome):
+        conteudo = self._ler(nome)
+        if len(conteudo) < TAMANHO_MINIMO:
+            return
+        for extensao, comprimido in comprimir(conteudo).items():
+            self._gravar(nome + extensao, comprimido)
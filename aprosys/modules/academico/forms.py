@@ -3,6 +3,7 @@ from django.contrib.auth.forms import UserCreationForm
 from django.urls import reverse
 from django.forms import ModelForm, DateInput
 from .models import Aluno, Curso, CustomUser, Disciplina, PeriodoLetivo, Turma, Voluntario 
+from .search import normalizar
 from .widgets import CustomRelatedFieldWidgetWrapper
 
 
@@ -113,6 +114,54 @@ class AlunoForm(forms.ModelForm):
 
 
 
+class AlunoImportForm(AlunoForm):
+    """
+    Mesmas regras do AlunoForm, adaptadas para validar milhares de linhas
+    de uma planilha sem queries por linha: os cursos vêm de um dicionário
+    pré-carregado e a unicidade do e-mail é conferida em lote pelo
+    importador (modules.academico.importacao).
+    """
+
+    curso_interesse = forms.Field(
+        label='Cursos de Interesse',
+        required=False,
+        widget=forms.MultipleHiddenInput,
+    )
+
+    def __init__(self, *args, cursos=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cursos = cursos or {}
+
+    def clean_curso_interesse(self):
+        cursos = {}
+        for valor in self.cleaned_data['curso_interesse'] or []:
+            curso = self.cursos.get(normalizar(valor))
+            if curso is None:
+                raise forms.ValidationError(
+                    f'Curso "{valor}" não encontrado.'
+                )
+            cursos[curso.pk] = curso
+        return list(cursos.values())
+
+    def validate_unique(self):
+        pass
+
+
+class ImportarAlunosForm(forms.Form):
+    arquivo = forms.FileField(
+        label='Planilha (CSV ou XLSX)',
+        widget=forms.ClearableFileInput(
+            attrs={'accept': '.csv,.xlsx', 'class': 'form-control'}
+        ),
+    )
+
+    def clean_arquivo(self):
+        arquivo = self.cleaned_data['arquivo']
+        if not arquivo.name.lower().endswith(('.csv', '.xlsx')):
+            raise forms.ValidationError('Envie um arquivo .csv ou .xlsx.')
+        return arquivo
+
+
 class PeriodoLetivoForm(forms.ModelForm):
     class Meta:
         model = PeriodoLetivo
@@ -187,4 +236,31 @@ class VoluntarioForm(forms.ModelForm):
             'status_processo_voluntario',
             'tipo_voluntario',
             'disciplina',
-        ]
\ No newline at end of file
+        ]
+
+
+class ChamadaForm(forms.Form):
+    data = forms.DateField(
+        label='Data da aula',
+        widget=DateInput(attrs={'type': 'date'}, format='%Y-%m-%d'),
+    )
+    conteudo = forms.CharField(
+        label='Conteúdo ministrado',
+        required=False,
+        widget=forms.Textarea(attrs={'rows': 3}),
+    )
+    presentes = forms.TypedMultipleChoiceField(
+        label='Presentes',
+        coerce=int,
+        required=False,
+        widget=forms.CheckboxSelectMultiple,
+    )
+
+    def __init__(self, *args, chamada=(), **kwargs):
+        # chamada: tuplas (ordem, aluno_id, nome) de presenca.lista_chamada
+        super().__init__(*args, **kwargs)
+        self.fields['presentes'].choices = [
+            (ordem, nome) for ordem, _, nome in chamada
+        ]
+        for nome in ('data', 'conteudo'):
+            self.fields[nome].widget.attrs.update({'class': 'form-control'})
@@ -0,0 +1,91 @@
+"""
+Miniaturas das fotos dos voluntários.
+
+A cada upload são gravadas versões quadradas em tamanhos fixos, em JPEG e
+WebP, em PASTA no storage. As páginas usam as miniaturas (tag
+{% foto_voluntario %}) em vez de baixar a foto enviada, que pode ter vários
+megabytes.
+"""
+
+import hashlib
+import io
+import os
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+# Lado, em pixels, de cada tamanho. Comporta telas de alta densidade
+# (ex.: a foto de 36px da navbar usa a 'pequena').
+TAMANHOS = {
+    'pequena': 96,
+    'media': 320,
+}
+FORMATOS = {
+    'webp': {'format': 'WEBP', 'quality': 80, 'method': 6},
+    'jpg': {
+        'format': 'JPEG',
+        'quality': 82,
+        'optimize': True,
+        'progressive': True,
+    },
+}
+PASTA = 'voluntarios/perfis/miniaturas'
+
+
+def caminho_miniatura(nome, tamanho, extensao):
+    # O resumo do caminho completo da original separa fotos com o mesmo
+    # nome em pastas ou com extensões diferentes
+    base = os.path.splitext(os.path.basename(nome))[0]
+    resumo = hashlib.sha1(nome.encode()).hexdigest()[:12]
+    return f'{PASTA}/{base}-{resumo}-{tamanho}.{extensao}'
+
+
+def _atualizadas(nome):
+    """
+    As miniaturas existem e são mais novas que a foto original?
+    """
+    try:
+        original = default_storage.get_modified_time(nome)
+        return all(
+            default_storage.get_modified_time(
+                caminho_miniatura(nome, tamanho, extensao)
+            ) >= original
+            for tamanho in TAMANHOS
+            for extensao in FORMATOS
+        )
+    except (FileNotFoundError, NotImplementedError):
+        return False
+
+
+def gerar_miniaturas(nome, forcar=False):
+    """
+    Gera as miniaturas da foto `nome` (caminho no storage). Retorna False
+    se já estavam atualizadas e nada foi gravado.
+    """
+    if not forcar and _atualizadas(nome):
+        return False
+
+    with default_storage.open(nome, 'rb') as arquivo:
+        with Image.open(arquivo) as original:
+            # Fotos de celular vêm deitadas com a rotação só no EXIF
+            imagem = ImageOps.exif_transpose(original).convert('RGB')
+
+    for tamanho, lado in TAMANHOS.items():
+        miniatura = ImageOps.fit(
+            imagem, (lado, lado), Image.Resampling.LANCZOS
+        )
+        for extensao, opcoes in FORMATOS.items():
+            conteudo = io.BytesIO()
+            miniatura.save(conteudo, **opcoes)
+            caminho = caminho_miniatura(nome, tamanho, extensao)
+            # Sem apagar antes, o storage gravaria com outro nome
+            default_storage.delete(caminho)
+            default_storage.save(caminho, ContentFile(conteudo.getvalue()))
+    return True
+
+
+def apagar_miniaturas(nome):
+    for tamanho in TAMANHOS:
+        for extensao in FORMATOS:
+            default_storage.delete(caminho_miniatura(nome, tamanho, extensao))
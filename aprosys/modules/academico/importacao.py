@@ -0,0 +1,318 @@
+"""
+Importação em lote de alunos a partir de planilhas CSV/XLSX.
+
+As linhas são lidas em streaming e processadas em lotes: cada lote é
+validado com as regras do AlunoForm, gravado com um único bulk_create e tem
+os vínculos de curso_interesse inseridos também em lote. A memória usada
+não depende do tamanho do arquivo.
+"""
+
+import csv
+import io
+import zipfile
+from datetime import date, timedelta
+from itertools import islice
+from pathlib import PurePath
+from xml.etree.ElementTree import iterparse
+
+from django.db import transaction
+from django.utils.datastructures import MultiValueDict
+
+from .conditional import bump_versao
+from .forms import AlunoImportForm
+from .models import Aluno, Curso
+from .search import normalizar
+
+CHUNK_SIZE = 500
+
+# Campos que aceitam vários valores na mesma célula, separados por vírgula
+CAMPOS_MULTIPLOS = ('periodo_interesse', 'curso_interesse')
+
+
+# Erros guardados no ponto de retomada das importações em segundo plano
+MAX_ERROS_RETOMADA = 1000
+
+
+class RelatorioImportacao:
+    def __init__(self, total=0, importados=0, rejeitados=0, erros=(), lotes=0):
+        self.total = total
+        self.importados = importados
+        self.rejeitados = rejeitados
+        # O JSON do ponto de retomada devolve as tuplas como listas
+        self.erros = [tuple(erro) for erro in erros]
+        # Lotes já processados (e gravados, fora do dry_run)
+        self.lotes = lotes
+
+    def adicionar_erro(self, linha, mensagens):
+        self.rejeitados += 1
+        self.erros.append((linha, mensagens))
+
+    def retomada(self):
+        """
+        Estado do relatório em JSON, para continuar a importação depois do
+        último lote gravado (ver importar_alunos).
+        """
+        return {
+            'total': self.total,
+            'importados': self.importados,
+            'rejeitados': self.rejeitados,
+            'erros': self.erros[:MAX_ERROS_RETOMADA],
+            'lotes': self.lotes,
+        }
+
+
+#region --- LEITURA DAS PLANILHAS ---
+
+def ler_csv(arquivo):
+    """
+    Lê um CSV (separado por vírgula ou ponto e vírgula) linha a linha,
+    retornando dicts indexados pelo cabeçalho.
+    """
+    texto = io.TextIOWrapper(arquivo, encoding='utf-8-sig', newline='')
+    amostra = texto.read(4096)
+    texto.seek(0)
+    try:
+        dialeto = csv.Sniffer().sniff(amostra, delimiters=',;')
+    except csv.Error:
+        dialeto = csv.excel
+    yield from csv.DictReader(texto, dialect=dialeto)
+
+
+XLSX_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+EXCEL_EPOCH = date(1899, 12, 30)
+
+
+def _coluna(referencia):
+    # 'AB12' -> 27 (índice zero-based da coluna)
+    indice = 0
+    for char in referencia:
+        if not char.isalpha():
+            break
+        indice = indice * 26 + (ord(char.upper()) - ord('A') + 1)
+    return indice - 1
+
+
+def _shared_strings(pacote):
+    if 'xl/sharedStrings.xml' not in pacote.namelist():
+        return []
+    strings = []
+    with pacote.open('xl/sharedStrings.xml') as xml:
+        for _, elem in iterparse(xml):
+            if elem.tag == f'{XLSX_NS}si':
+                strings.append(
+                    ''.join(t.text or '' for t in elem.iter(f'{XLSX_NS}t'))
+                )
+                elem.clear()
+    return strings
+
+
+def _valor_celula(celula, strings):
+    tipo = celula.get('t')
+    if tipo == 'inlineStr':
+        return ''.join(t.text or '' for t in celula.iter(f'{XLSX_NS}t'))
+    valor = celula.find(f'{XLSX_NS}v')
+    if valor is None or valor.text is None:
+        return ''
+    if tipo == 's':
+        return strings[int(valor.text)]
+    if tipo is None or tipo == 'n':
+        # Números inteiros vêm como '12.0' em algumas planilhas
+        numero = float(valor.text)
+        return str(int(numero)) if numero.is_integer() else valor.text
+    return valor.text
+
+
+def ler_xlsx(arquivo):
+    """
+    Lê a primeira planilha de um XLSX em streaming (sem dependências
+    externas), retornando dicts indexados pelo cabeçalho.
+    """
+    with zipfile.ZipFile(arquivo) as pacote:
+        strings = _shared_strings(pacote)
+        cabecalho = None
+        with pacote.open('xl/worksheets/sheet1.xml') as xml:
+            for _, elem in iterparse(xml):
+                if elem.tag != f'{XLSX_NS}row':
+                    continue
+                valores = {}
+                for celula in elem.iter(f'{XLSX_NS}c'):
+                    coluna = _coluna(celula.get('r', ''))
+                    valores[coluna] = _valor_celula(celula, strings)
+                elem.clear()
+                if cabecalho is None:
+                    cabecalho = valores
+                    continue
+                yield {
+                    nome: valores.get(coluna, '')
+                    for coluna, nome in cabecalho.items()
+                }
+
+
+def ler_planilha(arquivo, nome):
+    if PurePath(nome).suffix.lower() == '.xlsx':
+        return ler_xlsx(arquivo)
+    return ler_csv(arquivo)
+
+#endregion ---
+
+
+#region --- VALIDAÇÃO E GRAVAÇÃO ---
+
+def _mapa_escolhas(form):
+    """
+    Para cada campo com choices, mapeia o rótulo normalizado para o valor,
+    permitindo que a planilha traga "Ativo" em vez de "1".
+    """
+    mapas = {}
+    for nome, field in form.base_fields.items():
+        choices = getattr(field, 'choices', None)
+        if choices and nome != 'curso_interesse':
+            mapas[nome] = {
+                normalizar(rotulo): str(valor) for valor, rotulo in choices
+            }
+    return mapas
+
+
+def _data_excel(valor):
+    # Datas do Excel chegam como número de dias desde 1899-12-30
+    if valor.isdigit():
+        return (EXCEL_EPOCH + timedelta(days=int(valor))).isoformat()
+    return valor
+
+
+def _valores_iniciais(form):
+    # Colunas ausentes/vazias recebem o mesmo valor inicial que o formulário
+    # de cadastro já traz preenchido (ex.: status Ativo, estado civil).
+    return {
+        nome: str(field.initial)
+        for nome, field in form.base_fields.items()
+        if field.initial is not None and not callable(field.initial)
+    }
+
+
+def _dados_formulario(linha, escolhas, iniciais):
+    dados = MultiValueDict(
+        {nome: [valor] for nome, valor in iniciais.items()}
+    )
+    for coluna, conteudo in linha.items():
+        if coluna is None:
+            continue
+        nome = coluna.strip()
+        valor = (conteudo or '').strip()
+        mapa = escolhas.get(nome, {})
+        if nome in CAMPOS_MULTIPLOS:
+            itens = [v.strip() for v in valor.split(',') if v.strip()]
+            dados.setlist(nome, [mapa.get(normalizar(v), v) for v in itens])
+        else:
+            if not valor and nome in iniciais:
+                continue
+            if nome == 'nascimento':
+                valor = _data_excel(valor)
+            dados[nome] = mapa.get(normalizar(valor), valor)
+    return dados
+
+
+def _em_lotes(iteravel, tamanho):
+    iterador = iter(iteravel)
+    while lote := list(islice(iterador, tamanho)):
+        yield lote
+
+
+def _gravar_lote(validos):
+    alunos = []
+    for _, aluno, _ in validos:
+        # bulk_create não chama save(): o texto de busca é gerado aqui
+        aluno.busca = aluno.texto_busca()
+        alunos.append(aluno)
+
+    CursoInteresse = Aluno.curso_interesse.through
+    with transaction.atomic():
+        Aluno.objects.bulk_create(alunos)
+        CursoInteresse.objects.bulk_create([
+            CursoInteresse(aluno_id=aluno.pk, curso_id=curso.pk)
+            for _, aluno, cursos in validos
+            for curso in cursos
+        ])
+    return len(alunos)
+
+
+def importar_alunos(
+    linhas,
+    chunk_size=CHUNK_SIZE,
+    dry_run=False,
+    ao_concluir_lote=None,
+    retomada=None,
+):
+    """
+    Valida e grava as linhas (dicts campo -> valor) em lotes, retornando um
+    RelatorioImportacao com o total importado e os erros por linha.
+
+    `ao_concluir_lote(relatorio)` é chamado depois de cada lote, na mesma
+    transação que o grava. Com `retomada` (um relatorio.retomada() gravado
+    por ele) os lotes já gravados são pulados: uma nova tentativa da mesma
+    importação não insere as mesmas linhas de novo.
+    """
+    relatorio = RelatorioImportacao(**(retomada or {}))
+    gravados = relatorio.lotes
+    cursos = {}
+    for curso in Curso.objects.all():
+        cursos[str(curso.pk)] = curso
+        cursos[normalizar(curso.nome)] = curso
+    escolhas = _mapa_escolhas(AlunoImportForm)
+    iniciais = _valores_iniciais(AlunoImportForm)
+    emails_vistos = set()
+
+    # A linha 1 da planilha é o cabeçalho
+    lotes = _em_lotes(enumerate(linhas, start=2), chunk_size)
+    for indice, lote in enumerate(lotes):
+        # Os e-mails dos lotes pulados já estão no banco e são conferidos
+        # com os existentes
+        if indice < gravados:
+            continue
+        relatorio.total += len(lote)
+        validos = []
+        for numero, linha in lote:
+            form = AlunoImportForm(
+                _dados_formulario(linha, escolhas, iniciais), cursos=cursos
+            )
+            if form.is_valid():
+                # O is_valid() já preencheu form.instance com os dados
+                cursos_aluno = form.cleaned_data['curso_interesse']
+                validos.append((numero, form.instance, cursos_aluno))
+            else:
+                relatorio.adicionar_erro(numero, [
+                    f'{campo}: {erro}'
+                    for campo, erros in form.errors.items()
+                    for erro in erros
+                ])
+
+        # Unicidade do e-mail conferida com uma query por lote
+        emails = [aluno.email for _, aluno, _ in validos]
+        existentes = set(
+            Aluno.objects.filter(email__in=emails).values_list(
+                'email', flat=True
+            )
+        )
+        unicos = []
+        for numero, aluno, cursos_aluno in validos:
+            if aluno.email in existentes or aluno.email in emails_vistos:
+                relatorio.adicionar_erro(
+                    numero, [f'email: {aluno.email} já está cadastrado.']
+                )
+                continue
+            emails_vistos.add(aluno.email)
+            unicos.append((numero, aluno, cursos_aluno))
+
+        with transaction.atomic():
+            if unicos and not dry_run:
+                relatorio.importados += _gravar_lote(unicos)
+            relatorio.lotes += 1
+            if ao_concluir_lote:
+                ao_concluir_lote(relatorio)
+
+    if relatorio.importados:
+        # bulk_create não dispara signals
+        bump_versao(Aluno)
+    return relatorio
+
+#endregion ---
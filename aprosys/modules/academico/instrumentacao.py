@@ -0,0 +1,267 @@
+"""
+Medição do tempo de cada requisição: SQL (quantidade e tempo), view e
+renderização de templates.
+
+O MetricasMiddleware abre uma Medicao por requisição, guardada em uma
+ContextVar (que acompanha a view também quando ela roda em thread sob
+ASGI). As queries são medidas por um execute_wrapper instalado em cada
+conexão nova (connection_created, ver apps.py) e os templates pelo backend
+DjangoTemplatesMedidos. Ao fim da requisição os tempos vão para o
+cabeçalho Server-Timing e para os histogramas por nome de URL, expostos
+em formato texto do Prometheus pela view `metricas`.
+
+Os histogramas ficam na memória do processo: com vários processos de
+servidor, cada um expõe os seus.
+"""
+
+import hmac
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.template import TemplateDoesNotExist
+from django.template.backends.django import (
+    DjangoTemplates,
+    Template,
+    reraise,
+)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Limites dos buckets, como os padrões dos clientes Prometheus
+SEGUNDOS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10,
+)
+QUERIES = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+_medicao = ContextVar('medicao', default=None)
+
+
+class Medicao:
+    """
+    Tempos (em segundos) e queries de uma requisição, com o caminho e o
+    nome da URL (conhecido a partir do process_view).
+    """
+
+    def __init__(self, caminho=''):
+        self.caminho = caminho
+        self.url_name = None
+        self.inicio = time.perf_counter()
+        self.inicio_view = None
+        self.sql = 0.0
+        self.queries = 0
+        self.template = 0.0
+        self.view = 0.0
+        self._renderizando = 0
+
+    @contextmanager
+    def renderizando(self):
+        # Só o template mais externo conta: render_to_string dentro de um
+        # template não é somado duas vezes
+        self._renderizando += 1
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._renderizando -= 1
+            if not self._renderizando:
+                self.template += time.perf_counter() - inicio
+
+    def server_timing(self, total):
+        return ', '.join([
+            f'sql;dur={self.sql * 1000:.1f};desc="{self.queries} queries"',
+            f'tpl;dur={self.template * 1000:.1f}',
+            f'view;dur={self.view * 1000:.1f}',
+            f'total;dur={total * 1000:.1f}',
+        ])
+
+
+def iniciar_medicao(caminho=''):
+    medicao = Medicao(caminho)
+    return medicao, _medicao.set(medicao)
+
+
+def encerrar_medicao(token):
+    _medicao.reset(token)
+
+
+def medicao_atual():
+    """
+    Medicao da requisição em andamento, ou None fora de uma requisição.
+    """
+    return _medicao.get()
+
+
+def iniciar_view(url_name):
+    medicao = _medicao.get()
+    if medicao is not None:
+        medicao.url_name = url_name
+        medicao.inicio_view = time.perf_counter()
+
+
+def medir_query(execute, sql, params, many, context):
+    """
+    execute_wrapper de todas as conexões; sem Medicao ativa (comandos,
+    tarefas) só executa a query.
+    """
+    medicao = _medicao.get()
+    if medicao is None:
+        return execute(sql, params, many, context)
+    inicio = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        medicao.sql += time.perf_counter() - inicio
+        medicao.queries += 1
+
+
+def instalar_medicao(sender, connection, **kwargs):
+    if medir_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(medir_query)
+
+
+class TemplateMedido(Template):
+    def render(self, context=None, request=None):
+        medicao = _medicao.get()
+        if medicao is None:
+            return super().render(context, request)
+        with medicao.renderizando():
+            return super().render(context, request)
+
+
+class DjangoTemplatesMedidos(DjangoTemplates):
+    """
+    Backend DjangoTemplates que soma o tempo de renderização à Medicao da
+    requisição.
+    """
+
+    def from_string(self, template_code):
+        return TemplateMedido(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return TemplateMedido(
+                self.engine.get_template(template_name), self
+            )
+        except TemplateDoesNotExist as exc:
+            reraise(exc, self)
+
+
+#region --- HISTOGRAMAS ---
+def _rotulo(valor):
+    valor = valor.replace('\\', '\\\\').replace('"', '\\"')
+    return valor.replace('\n', '\\n')
+
+
+class Histograma:
+    """
+    Histograma por nome de URL no formato do Prometheus (buckets
+    cumulativos, _sum e _count).
+    """
+
+    def __init__(self, nome, ajuda, limites):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.limites = limites
+        self.series = {}
+        self._lock = threading.Lock()
+
+    def observar(self, view, valor):
+        indice = bisect_left(self.limites, valor)
+        with self._lock:
+            serie = self.series.get(view)
+            if serie is None:
+                # Contagem por bucket (o último é o +Inf) e soma
+                serie = self.series[view] = [
+                    [0] * (len(self.limites) + 1), 0.0
+                ]
+            serie[0][indice] += 1
+            serie[1] += valor
+
+    def exportar(self):
+        linhas = [
+            f'# HELP {self.nome} {self.ajuda}',
+            f'# TYPE {self.nome} histogram',
+        ]
+        with self._lock:
+            series = [
+                (view, list(contagens), soma)
+                for view, (contagens, soma) in sorted(self.series.items())
+            ]
+        for view, contagens, soma in series:
+            rotulo = f'view="{_rotulo(view)}"'
+            acumulado = 0
+            for limite, contagem in zip(
+                (*self.limites, '+Inf'), contagens
+            ):
+                acumulado += contagem
+                linhas.append(
+                    f'{self.nome}_bucket{{{rotulo},le="{limite}"}} '
+                    f'{acumulado}'
+                )
+            linhas.append(f'{self.nome}_sum{{{rotulo}}} {soma}')
+            linhas.append(f'{self.nome}_count{{{rotulo}}} {acumulado}')
+        return linhas
+
+
+DURACAO = Histograma(
+    'aprosys_request_duration_seconds',
+    'Tempo total da requisição.',
+    SEGUNDOS,
+)
+DURACAO_VIEW = Histograma(
+    'aprosys_view_duration_seconds',
+    'Tempo da view, incluindo SQL e templates.',
+    SEGUNDOS,
+)
+DURACAO_SQL = Histograma(
+    'aprosys_sql_duration_seconds',
+    'Tempo das queries SQL da requisição.',
+    SEGUNDOS,
+)
+DURACAO_TEMPLATE = Histograma(
+    'aprosys_template_duration_seconds',
+    'Tempo de renderização dos templates da requisição.',
+    SEGUNDOS,
+)
+QUANTIDADE_SQL = Histograma(
+    'aprosys_sql_queries',
+    'Queries SQL por requisição.',
+    QUERIES,
+)
+HISTOGRAMAS = (
+    DURACAO, DURACAO_VIEW, DURACAO_SQL, DURACAO_TEMPLATE, QUANTIDADE_SQL,
+)
+
+
+def registrar(view, medicao, total):
+    DURACAO.observar(view, total)
+    DURACAO_VIEW.observar(view, medicao.view)
+    DURACAO_SQL.observar(view, medicao.sql)
+    DURACAO_TEMPLATE.observar(view, medicao.template)
+    QUANTIDADE_SQL.observar(view, medicao.queries)
+
+
+def exportar():
+    return '\n'.join(
+        linha for histograma in HISTOGRAMAS
+        for linha in histograma.exportar()
+    ) + '\n'
+
+
+def autorizado(request):
+    """
+    /metrics é restrito à equipe (is_staff) ou a quem enviar o token de
+    settings.METRICAS_TOKEN (para o coletor do Prometheus).
+    """
+    if request.user.is_staff:
+        return True
+    token = getattr(settings, 'METRICAS_TOKEN', '')
+    enviado = request.headers.get('Authorization', '')
+    return bool(token) and hmac.compare_digest(
+        enviado.encode(), f'Bearer {token}'.encode()
+    )
+#endregion ---
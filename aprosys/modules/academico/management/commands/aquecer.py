@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+from modules.academico.aquecimento import aquecer
+
+
+class Command(BaseCommand):
+    help = (
+        'Compila todos os templates das pastas DIRS e carrega os URLconfs, '
+        'como o servidor faz na inicialização com '
+        'AQUECER_NA_INICIALIZACAO. O cache vale só para este processo: use '
+        'no deploy para conferir que nenhum template tem erro de sintaxe.'
+    )
+
+    def handle(self, *args, **options):
+        resultado = aquecer()
+        for nome, erro in resultado.erros.items():
+            self.stderr.write(self.style.ERROR(f'{nome}: {erro}'))
+        if resultado.erros:
+            raise CommandError(
+                f'{len(resultado.erros)} template(s) com erro.'
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'{resultado.templates} templates compilados e URLconfs '
+            f'carregados em {resultado.duracao * 1000:.0f} ms.'
+        ))
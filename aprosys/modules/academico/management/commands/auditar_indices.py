@@ -0,0 +1,88 @@
+from http import HTTPStatus
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import reverse
+from modules.academico.auditoria import CONSULTAS, IGNORADAS_PADRAO, auditar
+
+
+def _usuarios():
+    """
+    Um usuário por papel: superusuário e cada tipo de voluntário.
+    """
+    ativos = get_user_model().objects.filter(is_active=True)
+    usuarios = {}
+    superuser = ativos.filter(is_superuser=True).first()
+    if superuser:
+        usuarios['SUPERUSUARIO'] = superuser
+    for user in ativos.filter(
+        is_superuser=False, voluntario__isnull=False
+    ).select_related('voluntario').order_by('pk'):
+        usuarios.setdefault(user.voluntario.tipo_voluntario, user)
+    return usuarios
+
+
+class Command(BaseCommand):
+    help = (
+        'Executa as listagens de pesquisa com um usuário de cada papel, '
+        'roda EXPLAIN em cada SELECT e termina com erro se alguma '
+        'consulta varrer uma tabela inteira sem índice. No PostgreSQL o '
+        'planejador prefere varreduras em tabelas pequenas: rode em um '
+        'banco com volume real (ex.: manage.py seed_academico).'
+    )
+
+    def add_arguments(self, parser):  # noqa: PLR6301 (hook do Django)
+        parser.add_argument(
+            '--ignorar',
+            nargs='*',
+            default=IGNORADAS_PADRAO,
+            help='Tabelas em que a varredura completa é aceita.',
+        )
+        parser.add_argument(
+            '--planos',
+            action='store_true',
+            help='Mostra o plano de todas as consultas, não só as com '
+            'problema.',
+        )
+
+    def handle(self, *args, **options):
+        self.ignoradas = set(options['ignorar'])
+        self.planos = options['planos']
+        usuarios = _usuarios()
+        if not usuarios:
+            raise CommandError('Nenhum usuário ativo encontrado.')
+
+        problemas = 0
+        for papel, user in usuarios.items():
+            client = Client()
+            client.force_login(user)
+            for nome, querystring in CONSULTAS:
+                url = reverse(nome)
+                if querystring:
+                    url += f'?{querystring}'
+                problemas += self._auditar(client, papel, url)
+
+        if problemas:
+            raise CommandError(
+                f'{problemas} consulta(s) com varredura completa de tabela.'
+            )
+        self.stdout.write(
+            self.style.SUCCESS('Nenhuma varredura completa encontrada.')
+        )
+
+    def _auditar(self, client, papel, url):
+        status, planos = auditar(client, url, self.ignoradas)
+        if status == HTTPStatus.FORBIDDEN:
+            return 0
+        problemas = 0
+        for plano in planos:
+            if plano.varridas:
+                problemas += 1
+            if plano.varridas or self.planos:
+                estilo = self.style.ERROR if plano.varridas else str
+                self.stdout.write(estilo(f'[{papel}] {url} ({plano.banco})'))
+                self.stdout.write(f'  {plano.sql}')
+                for linha in plano.linhas:
+                    self.stdout.write(f'    {linha}')
+        return problemas
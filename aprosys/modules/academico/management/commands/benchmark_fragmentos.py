@@ -0,0 +1,122 @@
+import logging
+import re
+import statistics
+from http import HTTPStatus
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+from modules.academico.medicoes import (
+    argumentos,
+    paginas,
+    voluntario_ativo,
+)
+
+PAPEIS = ['COORDENADOR', 'PROFESSOR']
+TEMPO_TEMPLATE = re.compile(r'\btpl;dur=([\d.]+)')
+
+
+def _medir(client, url, total, cache_ligado):
+    """
+    Mediana do tempo de templates da página, em ms, ou None se ela
+    não for uma página HTML renderizada.
+    """
+    with override_settings(FRAGMENTOS_CACHE=cache_ligado):
+        # A primeira requisição aquece o cache e o loader de templates
+        response = client.get(url)
+        if response.status_code != HTTPStatus.OK or not response.get(
+            'Content-Type', ''
+        ).startswith('text/html'):
+            return None
+        tempos = []
+        for _ in range(total):
+            response = client.get(url)
+            tempo = TEMPO_TEMPLATE.search(
+                response.get('Server-Timing', '')
+            )
+            if tempo is None:
+                return None
+            tempos.append(float(tempo.group(1)))
+    return statistics.median(tempos)
+
+
+class Command(BaseCommand):
+    help = (
+        'Mede, em cada página HTML de modules/academico/urls.py, o tempo de '
+        'renderização dos templates (Server-Timing) com e sem o cache dos '
+        'fragmentos do logged_base.html (menu lateral e rodapé, ver '
+        'templatetags/fragmentos.py), como coordenador e professor, e '
+        'mostra o tempo economizado por página.'
+    )
+
+    def add_arguments(self, parser):  # noqa: PLR6301 (hook do Django)
+        parser.add_argument(
+            '--coordenador',
+            help='Usuário coordenador (padrão: o primeiro ativo).',
+        )
+        parser.add_argument(
+            '--professor',
+            help='Usuário professor (padrão: o primeiro ativo com '
+            'disciplinas).',
+        )
+        parser.add_argument(
+            '--requisicoes',
+            type=int,
+            default=20,
+            help='Requisições medidas por página, papel e modo (padrão: 20).',
+        )
+        parser.add_argument(
+            '--host',
+            default='localhost',
+            help='Cabeçalho Host das requisições (padrão: localhost).',
+        )
+
+    # Server-Timing ligado mesmo que a instalação o desligue
+    @override_settings(SERVER_TIMING=True)
+    def handle(self, *args, **options):
+        if options['requisicoes'] < 1:
+            raise CommandError('--requisicoes deve ser positivo.')
+        usuarios = {
+            'COORDENADOR': voluntario_ativo(
+                'COORDENADOR', options['coordenador']
+            ),
+            'PROFESSOR': voluntario_ativo('PROFESSOR', options['professor']),
+        }
+        urls = paginas(argumentos(usuarios['PROFESSOR']))
+
+        self.stdout.write(
+            f'{"página":28} {"papel":12} {"sem cache":>10} '
+            f'{"com cache":>10} {"economia":>9}'
+        )
+        economias = []
+        registro = logging.getLogger('django.request')
+        nivel = registro.level
+        registro.setLevel(logging.ERROR)
+        try:
+            for papel in PAPEIS:
+                client = Client(
+                    raise_request_exception=False, HTTP_HOST=options['host']
+                )
+                client.force_login(usuarios[papel].user)
+                for nome, url in urls:
+                    sem = _medir(
+                        client, url, options['requisicoes'], False
+                    )
+                    if sem is None:
+                        continue
+                    com = _medir(
+                        client, url, options['requisicoes'], True
+                    )
+                    economias.append(sem - com)
+                    self.stdout.write(
+                        f'{nome:28} {papel:12} {sem:8.2f}ms {com:8.2f}ms '
+                        f'{sem - com:7.2f}ms'
+                    )
+        finally:
+            registro.setLevel(nivel)
+
+        if economias:
+            self.stdout.write(self.style.SUCCESS(
+                f'Economia mediana por página: '
+                f'{statistics.median(economias):.2f} ms '
+                f'({len(economias)} páginas).'
+            ))
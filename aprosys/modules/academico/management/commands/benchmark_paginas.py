@@ -0,0 +1,193 @@
+import json
+import logging
+import time
+from datetime import datetime
+from http import HTTPStatus
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from modules.academico.medicoes import (
+    argumentos,
+    paginas,
+    percentil,
+    requisitar,
+    voluntario_ativo,
+)
+from modules.academico.models import (
+    Aluno,
+    Disciplina,
+    Turma,
+    TurmaAluno,
+    Voluntario,
+)
+
+PAPEIS = ['COORDENADOR', 'PROFESSOR']
+
+
+def _medir(client, url, total):
+    # A primeira requisição aquece templates e caches e conta as queries
+    queries, status = requisitar(client, url)
+    latencias = []
+    for _ in range(total):
+        inicio = time.perf_counter()
+        response = client.get(url)
+        if response.streaming:
+            b''.join(response.streaming_content)
+        latencias.append(time.perf_counter() - inicio)
+    return {
+        'url': url,
+        'status': status,
+        'queries': queries,
+        'p50_ms': percentil(latencias, 50) * 1000,
+        'p95_ms': percentil(latencias, 95) * 1000,
+        'p99_ms': percentil(latencias, 99) * 1000,
+        'max_ms': max(latencias) * 1000,
+    }
+
+
+def _anteriores(caminho):
+    if not caminho:
+        return {}
+    try:
+        with open(caminho, encoding='utf-8') as arquivo:
+            dados = json.load(arquivo)
+    except (OSError, ValueError) as erro:
+        raise CommandError(f'Não foi possível ler {caminho}: {erro}')
+    return {
+        (r['pagina'], r['papel']): r for r in dados['resultados']
+    }
+
+
+def _volume():
+    return {
+        'alunos': Aluno.objects.count(),
+        'turmas': Turma.objects.count(),
+        'disciplinas': Disciplina.objects.count(),
+        'voluntarios': Voluntario.objects.count(),
+        'matriculas': TurmaAluno.objects.count(),
+        'usuarios': get_user_model().objects.count(),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        'Abre cada página de modules/academico/urls.py como coordenador e '
+        'professor, no banco configurado, e mostra a latência (p50/p95/p99) '
+        'e o número de queries de cada uma. Os resultados podem ser '
+        'gravados em JSON e comparados com os de outra versão. Popule o '
+        'banco antes com manage.py seed_academico.'
+    )
+
+    def add_arguments(self, parser):  # noqa: PLR6301 (hook do Django)
+        parser.add_argument(
+            '--coordenador',
+            help='Usuário coordenador (padrão: o primeiro ativo).',
+        )
+        parser.add_argument(
+            '--professor',
+            help='Usuário professor (padrão: o primeiro ativo com '
+            'disciplinas).',
+        )
+        parser.add_argument(
+            '--requisicoes',
+            type=int,
+            default=20,
+            help='Requisições medidas por página e papel (padrão: 20).',
+        )
+        parser.add_argument(
+            '--pagina',
+            action='append',
+            dest='paginas',
+            help='Nome da rota a medir (pode repetir; padrão: todas).',
+        )
+        parser.add_argument(
+            '--host',
+            default='localhost',
+            help='Cabeçalho Host das requisições (padrão: localhost).',
+        )
+        parser.add_argument(
+            '--rotulo',
+            default='',
+            help='Identificação da execução no JSON (ex.: a versão).',
+        )
+        parser.add_argument(
+            '--json',
+            help='Arquivo onde gravar os resultados em JSON.',
+        )
+        parser.add_argument(
+            '--comparar',
+            help='JSON de uma execução anterior para comparar o p95.',
+        )
+
+    def handle(self, *args, **options):
+        if options['requisicoes'] < 1:
+            raise CommandError('--requisicoes deve ser positivo.')
+        usuarios = {
+            'COORDENADOR': voluntario_ativo(
+                'COORDENADOR', options['coordenador']
+            ),
+            'PROFESSOR': voluntario_ativo('PROFESSOR', options['professor']),
+        }
+        urls = paginas(argumentos(usuarios['PROFESSOR']))
+        if options['paginas']:
+            urls = [(n, u) for n, u in urls if n in options['paginas']]
+            if not urls:
+                raise CommandError('Nenhuma das páginas informadas existe.')
+        anteriores = _anteriores(options['comparar'])
+
+        self.stdout.write(
+            f'{"página":28} {"papel":12} {"status":>6} {"queries":>7} '
+            f'{"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8}'
+        )
+        resultados = []
+        # Os 403 esperados (professor em páginas de coordenação) não poluem
+        # a saída
+        registro = logging.getLogger('django.request')
+        nivel = registro.level
+        registro.setLevel(logging.ERROR)
+        try:
+            for papel in PAPEIS:
+                client = Client(
+                    raise_request_exception=False, HTTP_HOST=options['host']
+                )
+                client.force_login(usuarios[papel].user)
+                for nome, url in urls:
+                    resultado = {
+                        'pagina': nome,
+                        'papel': papel,
+                        **_medir(client, url, options['requisicoes']),
+                    }
+                    resultados.append(resultado)
+                    self._mostrar(resultado, anteriores.get((nome, papel)))
+        finally:
+            registro.setLevel(nivel)
+
+        if options['json']:
+            with open(options['json'], 'w', encoding='utf-8') as arquivo:
+                json.dump(
+                    {
+                        'rotulo': options['rotulo'],
+                        'data': datetime.now().isoformat(timespec='seconds'),
+                        'requisicoes': options['requisicoes'],
+                        'volume': _volume(),
+                        'resultados': resultados,
+                    },
+                    arquivo,
+                    indent=2,
+                )
+
+    def _mostrar(self, r, anterior):
+        linha = (
+            f'{r["pagina"]:28} {r["papel"]:12} {r["status"]:>6} '
+            f'{r["queries"]:>7} {r["p50_ms"]:8.1f} {r["p95_ms"]:8.1f} '
+            f'{r["p99_ms"]:8.1f}'
+        )
+        if anterior:
+            variacao = (r['p95_ms'] / anterior['p95_ms'] - 1) * 100
+            linha += f'  p95 {variacao:+.0f}%'
+            if r['queries'] != anterior['queries']:
+                linha += f', queries {anterior["queries"]} -> {r["queries"]}'
+        if r['status'] >= HTTPStatus.INTERNAL_SERVER_ERROR:
+            linha = self.style.ERROR(linha)
+        self.stdout.write(linha)
@@ -0,0 +1,231 @@
+import asyncio
+import io
+import json
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from modules.academico.medicoes import percentil
+
+URLS_PADRAO = [
+    '/academico/alunos/pesquisar/',
+    '/academico/disciplinas/pesquisar/',
+    '/academico/turmas/pesquisar/',
+    '/academico/voluntarios/pesquisar/',
+    '/academico/cursos/pesquisar/',
+]
+
+
+def _login(username):
+    User = get_user_model()
+    usuarios = User.objects.filter(is_active=True)
+    if username:
+        user = usuarios.filter(username=username).first()
+    else:
+        user = usuarios.filter(is_superuser=True).first()
+    if user is None:
+        raise CommandError('Usuário não encontrado.')
+    client = Client()
+    client.force_login(user)
+    cookie = client.cookies[settings.SESSION_COOKIE_NAME]
+    return f'{settings.SESSION_COOKIE_NAME}={cookie.value}'
+
+
+def _resumo(latencias, status, duracao):
+    return {
+        'rps': len(latencias) / duracao,
+        'p50_ms': statistics.median(latencias) * 1000,
+        'p99_ms': percentil(latencias, 99) * 1000,
+        'max_ms': max(latencias) * 1000,
+        'erros': sum(1 for s in status if s != HTTPStatus.OK),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        'Compara requisições/s e latência (p50/p99) das listagens de '
+        'pesquisa servidas pelo app WSGI (views síncronas, uma thread por '
+        'requisição) e pelo app ASGI (views assíncronas), com a mesma '
+        'concorrência. As requisições são feitas em processo, direto nos '
+        'handlers, sem servidor HTTP.'
+    )
+
+    def add_arguments(self, parser):  # noqa: PLR6301 (hook do Django)
+        parser.add_argument(
+            '--usuario',
+            help='Usuário das requisições (padrão: um superusuário).',
+        )
+        parser.add_argument(
+            '--requisicoes',
+            type=int,
+            default=200,
+            help='Requisições por URL em cada app (padrão: 200).',
+        )
+        parser.add_argument(
+            '--concorrencia',
+            type=int,
+            default=16,
+            help='Requisições simultâneas (padrão: 16).',
+        )
+        parser.add_argument(
+            '--url',
+            action='append',
+            dest='urls',
+            help='URL a medir (pode repetir; padrão: as cinco pesquisas).',
+        )
+        parser.add_argument(
+            '--host',
+            default='localhost',
+            help='Cabeçalho Host das requisições (padrão: localhost).',
+        )
+        parser.add_argument(
+            '--json',
+            help='Arquivo onde gravar os resultados em JSON.',
+        )
+
+    def handle(self, *args, **options):
+        # Importar os apps roda o aquecimento dos caches: só quando o comando
+        # executa, não ao carregá-lo (ex.: --help)
+        from aprosys.asgi import application as asgi_app  # noqa: PLC0415
+        from aprosys.wsgi import application as wsgi_app  # noqa: PLC0415
+
+        self.cookie = _login(options['usuario'])
+        self.host = options['host']
+        urls = options['urls'] or URLS_PADRAO
+        total = options['requisicoes']
+        concorrencia = options['concorrencia']
+
+        resultados = []
+        for url in urls:
+            # Primeira requisição fora da medição (templates, caches)
+            self._wsgi(wsgi_app, url)
+            asyncio.run(self._asgi(asgi_app, url))
+
+            wsgi = self._medir_wsgi(wsgi_app, url, total, concorrencia)
+            asgi = asyncio.run(
+                self._medir_asgi(asgi_app, url, total, concorrencia)
+            )
+            resultados.append({'url': url, 'wsgi': wsgi, 'asgi': asgi})
+            for nome, r in (('WSGI', wsgi), ('ASGI', asgi)):
+                self.stdout.write(
+                    f'{url:40} {nome}  {r["rps"]:8.1f} req/s  '
+                    f'p50 {r["p50_ms"]:7.1f} ms  p99 {r["p99_ms"]:7.1f} ms'
+                    + (f'  {r["erros"]} erros' if r['erros'] else '')
+                )
+
+        if options['json']:
+            with open(options['json'], 'w', encoding='utf-8') as arquivo:
+                json.dump(
+                    {
+                        'requisicoes': total,
+                        'concorrencia': concorrencia,
+                        'resultados': resultados,
+                    },
+                    arquivo,
+                    indent=2,
+                )
+
+    def _wsgi(self, app, url):
+        partes = urlsplit(url)
+        environ = {
+            'REQUEST_METHOD': 'GET',
+            'PATH_INFO': partes.path,
+            'QUERY_STRING': partes.query,
+            'SERVER_NAME': self.host,
+            'SERVER_PORT': '80',
+            'SERVER_PROTOCOL': 'HTTP/1.1',
+            'HTTP_HOST': self.host,
+            'HTTP_COOKIE': self.cookie,
+            'REMOTE_ADDR': '127.0.0.1',
+            'wsgi.input': io.BytesIO(),
+            'wsgi.errors': sys.stderr,
+            'wsgi.url_scheme': 'http',
+        }
+        status = []
+        resposta = app(environ, lambda s, headers: status.append(s))
+        try:
+            for _ in resposta:
+                pass
+        finally:
+            resposta.close()
+        return int(status[0].split()[0])
+
+    def _medir_wsgi(self, app, url, total, concorrencia):
+        def requisicao(_):
+            inicio = time.perf_counter()
+            status = self._wsgi(app, url)
+            return time.perf_counter() - inicio, status
+
+        inicio = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concorrencia) as pool:
+            medidas = list(pool.map(requisicao, range(total)))
+        duracao = time.perf_counter() - inicio
+        return _resumo(
+            [m[0] for m in medidas], [m[1] for m in medidas], duracao
+        )
+
+    async def _asgi(self, app, url):
+        partes = urlsplit(url)
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': 'GET',
+            'scheme': 'http',
+            'path': partes.path,
+            'raw_path': partes.path.encode(),
+            'query_string': partes.query.encode(),
+            'root_path': '',
+            'headers': [
+                (b'host', self.host.encode()),
+                (b'cookie', self.cookie.encode()),
+            ],
+            'client': ('127.0.0.1', 0),
+            'server': (self.host, 80),
+        }
+        corpo_enviado = False
+        desconectado = asyncio.Event()
+
+        async def receive():
+            nonlocal corpo_enviado
+            if not corpo_enviado:
+                corpo_enviado = True
+                return {'type': 'http.request', 'body': b''}
+            # O handler fica escutando a desconexão do cliente
+            await desconectado.wait()
+            return {'type': 'http.disconnect'}
+
+        status = []
+
+        async def send(mensagem):
+            if mensagem['type'] == 'http.response.start':
+                status.append(mensagem['status'])
+
+        await app(scope, receive, send)
+        desconectado.set()
+        return status[0]
+
+    async def _medir_asgi(self, app, url, total, concorrencia):
+        semaforo = asyncio.Semaphore(concorrencia)
+
+        async def requisicao():
+            async with semaforo:
+                inicio = time.perf_counter()
+                status = await self._asgi(app, url)
+                return time.perf_counter() - inicio, status
+
+        inicio = time.perf_counter()
+        medidas = await asyncio.gather(
+            *(requisicao() for _ in range(total))
+        )
+        duracao = time.perf_counter() - inicio
+        return _resumo(
+            [m[0] for m in medidas], [m[1] for m in medidas], duracao
+        )
@@ -0,0 +1,138 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from modules.academico.sqlite import aplicar_pragmas
+
+# Perfil padrão do Django: journal em rollback, synchronous=FULL,
+# transações DEFERRED e 5 s de espera pelo lock (timeout do sqlite3).
+PERFIL_PADRAO = {'pragmas': {}, 'begin': 'BEGIN'}
+
+
+def _conectar(caminho, perfil):
+    # isolation_level=None: as transações são abertas explicitamente,
+    # como o Django faz em atomic()
+    conexao = sqlite3.connect(
+        caminho, timeout=5, isolation_level=None,
+        check_same_thread=False,
+    )
+    aplicar_pragmas(conexao.cursor(), perfil['pragmas'])
+    return conexao
+
+
+def _medir(caminho, perfil, escritores, transacoes):
+    conexao = _conectar(caminho, perfil)
+    conexao.execute(
+        'CREATE TABLE registro (id INTEGER PRIMARY KEY, escritor '
+        'INTEGER, valor TEXT, total INTEGER)'
+    )
+    conexao.close()
+
+    latencias = []
+    erros = [0]
+    lock = threading.Lock()
+    inicio_comum = threading.Barrier(escritores)
+
+    def escrever(numero):
+        conexao = _conectar(caminho, perfil)
+        cursor = conexao.cursor()
+        inicio_comum.wait()
+        for _ in range(transacoes):
+            inicio = time.perf_counter()
+            try:
+                # Lê e depois escreve na mesma transação, como as views
+                # que conferem um registro antes de gravar
+                cursor.execute(perfil['begin'])
+                cursor.execute(
+                    'SELECT COUNT(*) FROM registro WHERE escritor = ?',
+                    (numero,),
+                )
+                total = cursor.fetchone()[0]
+                cursor.execute(
+                    'INSERT INTO registro (escritor, valor, total) '
+                    'VALUES (?, ?, ?)',
+                    (numero, 'x' * 200, total),
+                )
+                cursor.execute('COMMIT')
+            except sqlite3.OperationalError:
+                if conexao.in_transaction:
+                    cursor.execute('ROLLBACK')
+                with lock:
+                    erros[0] += 1
+                continue
+            with lock:
+                latencias.append(time.perf_counter() - inicio)
+        conexao.close()
+
+    threads = [
+        threading.Thread(target=escrever, args=(n,))
+        for n in range(escritores)
+    ]
+    inicio = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    duracao = time.perf_counter() - inicio
+
+    latencias.sort()
+    p99 = latencias[int(len(latencias) * 0.99)] if latencias else 0
+    return {
+        'tps': len(latencias) / duracao,
+        'p99_ms': p99 * 1000,
+        'erros': erros[0],
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        'Mede a vazão de escrita no SQLite com N escritores em paralelo, '
+        'com o perfil padrão e com o ajustado (settings.SQLITE_PRAGMAS e '
+        'transações IMMEDIATE). Usa um banco temporário, não o da '
+        'aplicação.'
+    )
+
+    def add_arguments(self, parser):  # noqa: PLR6301 (hook do Django)
+        parser.add_argument(
+            '--escritores',
+            type=int,
+            nargs='+',
+            default=[1, 4, 8, 16],
+            help='Quantidades de escritores a testar (padrão: 1 4 8 16).',
+        )
+        parser.add_argument(
+            '--transacoes',
+            type=int,
+            default=200,
+            help='Transações por escritor (padrão: 200).',
+        )
+
+    def handle(self, *args, **options):
+        perfis = {
+            'padrao': PERFIL_PADRAO,
+            'ajustado': {
+                'pragmas': settings.SQLITE_PRAGMAS,
+                'begin': 'BEGIN IMMEDIATE',
+            },
+        }
+        self.stdout.write(
+            f'{"perfil":10} {"escritores":>10} {"transações/s":>13} '
+            f'{"p99 (ms)":>9} {"locked":>7}'
+        )
+        for escritores in options['escritores']:
+            for nome, perfil in perfis.items():
+                with tempfile.TemporaryDirectory() as pasta:
+                    resultado = _medir(
+                        os.path.join(pasta, 'bench.sqlite3'),
+                        perfil,
+                        escritores,
+                        options['transacoes'],
+                    )
+                self.stdout.write(
+                    f'{nome:10} {escritores:>10} {resultado["tps"]:>13.1f} '
+                    f'{resultado["p99_ms"]:>9.1f} {resultado["erros"]:>7}'
+                )
@@ -0,0 +1,83 @@
+import json
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from modules.academico.medicoes import percentil
+
+
+class Command(BaseCommand):
+    help = (
+        'Resume o registro de queries lentas (settings.'
+        'CONSULTA_LENTA_ARQUIVO e suas cópias rotacionadas): agrupa por '
+        'nome de URL e SQL e mostra ocorrências, tempo total, p95 e '
+        'máximo, com o último plano de execução capturado.'
+    )
+
+    def add_arguments(self, parser):  # noqa: PLR6301 (hook do Django)
+        parser.add_argument(
+            '--arquivo',
+            help='Arquivo JSONL (padrão: settings.CONSULTA_LENTA_ARQUIVO).',
+        )
+        parser.add_argument(
+            '--view',
+            help='Mostra só as queries deste nome de URL.',
+        )
+        parser.add_argument(
+            '--limite',
+            type=int,
+            default=20,
+            help='Quantidade de grupos exibidos (padrão: 20).',
+        )
+        parser.add_argument(
+            '--planos',
+            action='store_true',
+            help='Mostra o último plano de execução de cada grupo.',
+        )
+
+    def handle(self, *args, **options):
+        arquivo = Path(options['arquivo'] or settings.CONSULTA_LENTA_ARQUIVO)
+        # Cópias do RotatingFileHandler (.1 é a mais recente), da mais
+        # antiga para a atual: o último plano de cada grupo é o mais novo
+        copias = [
+            p for p in arquivo.parent.glob(f'{arquivo.name}.*')
+            if p.suffix[1:].isdigit()
+        ]
+        copias.sort(key=lambda p: int(p.suffix[1:]), reverse=True)
+        arquivos = [a for a in (*copias, arquivo) if a.is_file()]
+        if not arquivos:
+            raise CommandError(f'Nenhum registro encontrado em {arquivo}.')
+
+        grupos = defaultdict(lambda: {'duracoes': [], 'plano': None})
+        for caminho in arquivos:
+            with open(caminho, encoding='utf-8') as entrada:
+                for linha in entrada:
+                    try:
+                        registro = json.loads(linha)
+                    except ValueError:
+                        continue
+                    view = registro.get('url_name') or '(fora de requisição)'
+                    if options['view'] and view != options['view']:
+                        continue
+                    grupo = grupos[(view, registro['sql'])]
+                    grupo['duracoes'].append(registro['duracao_ms'])
+                    if registro.get('plano'):
+                        grupo['plano'] = registro['plano']
+
+        ordenados = sorted(
+            grupos.items(), key=lambda item: -sum(item[1]['duracoes'])
+        )
+        for (view, sql), grupo in ordenados[:options['limite']]:
+            duracoes = grupo['duracoes']
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f'{view}: {len(duracoes)}x, total {sum(duracoes):.0f} ms, '
+                f'p95 {percentil(duracoes, 95):.0f} ms, '
+                f'máx {max(duracoes):.0f} ms'
+            ))
+            self.stdout.write(f'  {sql}')
+            if options['planos'] and grupo['plano']:
+                for linha in grupo['plano']:
+                    self.stdout.write(f'    {linha}')
+        if not grupos:
+            self.stdout.write('Nenhuma query lenta registrada.')
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand, CommandError
+from modules.academico.boletins import gerar_boletins
+from modules.academico.models import PeriodoLetivo
+
+
+class Command(BaseCommand):
+    help = (
+        'Gera os boletins em PDF de todas as matrículas ativas do período '
+        'letivo, em paralelo, pulando os que não mudaram desde a última '
+        'geração.'
+    )
+
+    def add_arguments(self, parser):  # noqa: PLR6301 (hook do Django)
+        parser.add_argument('periodo', type=int, help='ID do período letivo')
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=None,
+            help='Processos de renderização (padrão: um por núcleo).',
+        )
+        parser.add_argument(
+            '--forcar',
+            action='store_true',
+            help='Gera novamente também os boletins inalterados.',
+        )
+
+    def handle(self, *args, **options):
+        if not PeriodoLetivo.objects.filter(pk=options['periodo']).exists():
+            raise CommandError(
+                f'Período letivo não encontrado: {options["periodo"]}'
+            )
+
+        relatorio = gerar_boletins(
+            options['periodo'],
+            workers=options['workers'],
+            forcar=options['forcar'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'{relatorio.total} matrículas, {relatorio.gerados} boletins '
+            f'gerados, {relatorio.inalterados} inalterados.'
+        ))
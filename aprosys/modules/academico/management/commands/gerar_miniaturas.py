@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from modules.academico.imagens import gerar_miniaturas
+from modules.academico.models import Voluntario
+
+
+class Command(BaseCommand):
+    help = (
+        'Gera as miniaturas (JPEG e WebP) das fotos dos voluntários que '
+        'ainda não as têm ou cuja foto mudou, ex.: fotos enviadas antes '
+        'das miniaturas existirem ou com miniaturas de nome antigo.'
+    )
+
+    def add_arguments(self, parser):  # noqa: PLR6301 (hook do Django)
+        parser.add_argument(
+            '--forcar',
+            action='store_true',
+            help='Gera novamente todas as miniaturas.',
+        )
+
+    def handle(self, *args, **options):
+        fotos = (
+            Voluntario.objects.exclude(foto='')
+            .exclude(foto__isnull=True)
+            .values_list('foto', flat=True)
+        )
+        geradas = falhas = 0
+        for nome in fotos.iterator():
+            try:
+                geradas += gerar_miniaturas(nome, forcar=options['forcar'])
+            except OSError as erro:
+                falhas += 1
+                self.stderr.write(f'{nome}: {erro}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Miniaturas geradas para {geradas} fotos ({falhas} com erro).'
+        ))
@@ -0,0 +1,59 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from modules.academico.importacao import (
+    CHUNK_SIZE,
+    importar_alunos,
+    ler_planilha,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Importa alunos de uma planilha CSV ou XLSX, validando cada linha '
+        'com as regras do AlunoForm e gravando em lotes.'
+    )
+
+    def add_arguments(self, parser):  # noqa: PLR6301 (hook do Django)
+        parser.add_argument('arquivo', help='Caminho do arquivo .csv/.xlsx')
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=CHUNK_SIZE,
+            help=f'Linhas por lote (padrão: {CHUNK_SIZE}).',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Apenas valida o arquivo, sem gravar nada.',
+        )
+
+    def handle(self, *args, **options):
+        caminho = Path(options['arquivo'])
+        if not caminho.is_file():
+            raise CommandError(f'Arquivo não encontrado: {caminho}')
+
+        with caminho.open('rb') as arquivo:
+            relatorio = importar_alunos(
+                ler_planilha(arquivo, caminho.name),
+                chunk_size=options['chunk_size'],
+                dry_run=options['dry_run'],
+            )
+
+        for linha, mensagens in relatorio.erros:
+            for mensagem in mensagens:
+                self.stderr.write(f'Linha {linha}: {mensagem}')
+
+        validas = relatorio.total - relatorio.rejeitados
+        resumo = (
+            f'{relatorio.total} linhas lidas, {validas} válidas, '
+            f'{relatorio.rejeitados} com erro.'
+        )
+        if options['dry_run']:
+            self.stdout.write(
+                f'{resumo} Nenhum aluno foi gravado (--dry-run).'
+            )
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f'{resumo} {relatorio.importados} alunos importados.'
+            ))
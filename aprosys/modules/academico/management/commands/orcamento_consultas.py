@@ -0,0 +1,98 @@
+import logging
+from http import HTTPStatus
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+from django.test.utils import (
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+from modules.academico.medicoes import ORCAMENTOS, medir_volume
+
+
+class Command(BaseCommand):
+    help = (
+        'Cria um banco de teste, popula com massa de dados em dois volumes '
+        'e abre cada página de modules/academico/urls.py como superusuário, '
+        'coordenador e professor. Termina com erro se alguma página passar '
+        'do orçamento de queries (ORCAMENTOS) ou fizer mais queries no '
+        'volume maior (N+1). Não altera o banco da aplicação.'
+    )
+
+    def add_arguments(self, parser):  # noqa: PLR6301 (hook do Django)
+        parser.add_argument(
+            '--volumes',
+            type=int,
+            nargs=2,
+            default=[20, 3000],
+            metavar=('MENOR', 'MAIOR'),
+            help='Alunos em cada volume medido (padrão: 20 3000).',
+        )
+
+    def handle(self, *args, **options):
+        medicoes = [self._medir(alunos) for alunos in options['volumes']]
+        menor, maior = medicoes
+
+        falhas = []
+        self.stdout.write(
+            f'{"página":28} {"papel":12} {"queries":>7} {"maior":>6} '
+            f'{"limite":>6}'
+        )
+        for (nome, papel), (queries, status) in sorted(menor.items()):
+            queries_maior, status_maior = maior[(nome, papel)]
+            limite = ORCAMENTOS.get(nome)
+            problemas = []
+            if status_maior >= HTTPStatus.INTERNAL_SERVER_ERROR:
+                problemas.append(f'status {status_maior}')
+            if queries_maior > queries:
+                problemas.append('cresce com o volume')
+            if limite is None:
+                problemas.append('sem orçamento')
+            elif queries_maior > limite:
+                problemas.append('acima do orçamento')
+            linha = (
+                f'{nome:28} {papel:12} {queries:>7} {queries_maior:>6} '
+                f'{"-" if limite is None else limite:>6}'
+            )
+            if problemas:
+                falhas.append(f'{nome} ({papel}): {", ".join(problemas)}')
+                linha = self.style.ERROR(f'{linha}  {", ".join(problemas)}')
+            self.stdout.write(linha)
+
+        if falhas:
+            raise CommandError(
+                f'{len(falhas)} página(s) fora do orçamento de queries:\n'
+                + '\n'.join(falhas)
+            )
+        self.stdout.write(self.style.SUCCESS('Todas dentro do orçamento.'))
+
+    # O cache local evita apagar um cache compartilhado com a aplicação
+    @override_settings(CACHES={
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'orcamento-consultas',
+        }
+    })
+    def _medir(self, alunos):
+        """
+        Retorna {(nome da URL, papel): (queries, status)} com `alunos`
+        alunos em um banco de teste novo.
+        """
+        setup_test_environment()
+        bancos = setup_databases(verbosity=0, interactive=False)
+        # Os 403/404 esperados (papéis sem acesso) não poluem a saída
+        registro = logging.getLogger('django.request')
+        nivel = registro.level
+        registro.setLevel(logging.ERROR)
+        try:
+            dados, resultados = medir_volume(alunos)
+            self.stdout.write('Volume: ' + ', '.join(
+                f'{total} {nome}' for nome, total in dados.totais.items()
+            ))
+            return resultados
+        finally:
+            registro.setLevel(nivel)
+            teardown_databases(bancos, verbosity=0)
+            teardown_test_environment()
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from modules.academico.conditional import bump_versao
+from modules.academico.models import FrequenciaAluno, FrequenciaProfessor
+from modules.academico.presenca import reconstruir_frequencias
+
+
+class Command(BaseCommand):
+    help = (
+        'Recalcula os consolidados de frequência (por aluno e por '
+        'professor/período) a partir de todas as aulas registradas.'
+    )
+
+    def add_arguments(self, parser):  # noqa: PLR6301 (hook do Django)
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='Aulas lidas e linhas gravadas por lote (padrão: 2000).',
+        )
+
+    def handle(self, *args, **options):
+        alunos, professores = reconstruir_frequencias(
+            chunk_size=options['chunk_size']
+        )
+        bump_versao(FrequenciaAluno)
+        bump_versao(FrequenciaProfessor)
+        self.stdout.write(self.style.SUCCESS(
+            f'{alunos} frequências de alunos e {professores} de professores '
+            'recalculadas.'
+        ))
@@ -0,0 +1,86 @@
+import os
+import signal
+import socket
+import threading
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+from modules.academico import tarefas
+
+
+class Command(BaseCommand):
+    help = (
+        'Executa as tarefas em segundo plano enfileiradas pelas páginas '
+        '(importações, boletins, exclusões em massa).'
+    )
+
+    def add_arguments(self, parser):  # noqa: PLR6301 (hook do Django)
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=2,
+            help='Tarefas executadas ao mesmo tempo (threads).',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=2.0,
+            help='Segundos de espera quando a fila está vazia.',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Executa as tarefas pendentes e termina.',
+        )
+
+    def handle(self, *args, **options):
+        self.parar = threading.Event()
+        for sinal in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sinal, self._encerrar)
+
+        nome = f'{socket.gethostname()}:{os.getpid()}'
+        threads = [
+            threading.Thread(
+                target=self._loop,
+                args=(f'{nome}:{i}', options['poll_interval'],
+                      options['once']),
+                daemon=True,
+            )
+            for i in range(max(1, options['concurrency']))
+        ]
+        self.stdout.write(
+            f'Worker {nome} iniciado com {len(threads)} threads.'
+        )
+        for thread in threads:
+            thread.start()
+        # join com timeout para o sinal ser atendido pela thread principal
+        for thread in threads:
+            while thread.is_alive():
+                thread.join(timeout=1)
+        self.stdout.write('Worker encerrado.')
+
+    def _encerrar(self, signum, frame):
+        self.stdout.write('Encerrando após as tarefas em andamento...')
+        self.parar.set()
+
+    def _loop(self, worker, poll_interval, once):
+        try:
+            while not self.parar.is_set():
+                close_old_connections()
+                tarefas.recuperar_travadas()
+                tarefa = tarefas.reservar_proxima(worker)
+                if tarefa is None:
+                    if once:
+                        break
+                    self.parar.wait(poll_interval)
+                    continue
+
+                ok = tarefas.executar(tarefa)
+                estilo = self.style.SUCCESS if ok else self.style.ERROR
+                self.stdout.write(estilo(
+                    f'[{worker}] {tarefa.tipo} #{tarefa.pk}: '
+                    f'{"concluída" if ok else "falhou"}'
+                ))
+        finally:
+            # Cada thread tem a própria conexão
+            connection.close()
@@ -0,0 +1,105 @@
+from django.core.management.base import BaseCommand, CommandError
+from modules.academico import massa
+
+
+class Command(BaseCommand):
+    help = (
+        'Popula o banco com uma massa de dados sintética (cursos, período, '
+        'disciplinas, turmas, voluntários, alunos, matrículas e aulas) '
+        'gravada com bulk_create, para reproduzir localmente volumes de '
+        'produção. Pode ser rodado mais de uma vez: cada execução cria '
+        'registros com uma etiqueta própria.'
+    )
+
+    def add_arguments(self, parser):  # noqa: PLR6301 (hook do Django)
+        parser.add_argument(
+            '--alunos',
+            type=int,
+            default=1000,
+            help='Alunos a criar (padrão: 1000).',
+        )
+        parser.add_argument(
+            '--alunos-por-turma',
+            type=int,
+            default=massa.ALUNOS_POR_TURMA,
+            help='Alunos matriculados em cada turma (padrão: '
+            f'{massa.ALUNOS_POR_TURMA}).',
+        )
+        parser.add_argument(
+            '--turmas',
+            type=int,
+            help='Turmas a criar (padrão: alunos / alunos por turma).',
+        )
+        parser.add_argument(
+            '--disciplinas',
+            type=int,
+            help='Disciplinas a criar (padrão: turmas / 5).',
+        )
+        parser.add_argument(
+            '--professores',
+            type=int,
+            help='Professores a criar (padrão: turmas / '
+            f'{massa.TURMAS_POR_PROFESSOR}).',
+        )
+        parser.add_argument(
+            '--coordenadores',
+            type=int,
+            default=2,
+            help='Coordenadores a criar (padrão: 2).',
+        )
+        parser.add_argument(
+            '--cursos',
+            type=int,
+            default=10,
+            help='Cursos a criar (padrão: 10).',
+        )
+        parser.add_argument(
+            '--aulas',
+            type=int,
+            default=4,
+            help='Aulas com chamada por turma/disciplina (padrão: 4).',
+        )
+        parser.add_argument(
+            '--senha',
+            default='aprosys',
+            help='Senha dos usuários criados (padrão: aprosys).',
+        )
+        parser.add_argument(
+            '--semente',
+            type=int,
+            help='Semente dos dados aleatórios, para repetir uma massa.',
+        )
+
+    def handle(self, *args, **options):
+        quantidades = [
+            options['alunos'],
+            options['alunos_por_turma'],
+            options['coordenadores'],
+            options['cursos'],
+        ] + [
+            options[nome]
+            for nome in ('turmas', 'disciplinas', 'professores')
+            if options[nome] is not None
+        ]
+        if min(quantidades) < 1 or options['aulas'] < 0:
+            raise CommandError('As quantidades devem ser positivas.')
+
+        dados = massa.popular(
+            alunos=options['alunos'],
+            aulas=options['aulas'],
+            alunos_por_turma=options['alunos_por_turma'],
+            turmas=options['turmas'],
+            disciplinas=options['disciplinas'],
+            professores=options['professores'],
+            coordenadores=options['coordenadores'],
+            cursos=options['cursos'],
+            senha=options['senha'],
+            semente=options['semente'],
+        )
+        for nome, total in dados.totais.items():
+            self.stdout.write(f'{nome:14} {total:>8}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Massa {dados.etiqueta} criada. Logins: '
+            f'{dados.coordenadores[0].user.username} (coordenador), '
+            f'{dados.professores[0].user.username} (professor).'
+        ))
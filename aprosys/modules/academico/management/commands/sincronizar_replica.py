@@ -0,0 +1,63 @@
+import sqlite3
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from modules.academico.roteamento import REPLICA, replica_configurada
+
+
+def _copiar(origem, destino):
+    # A API de backup copia uma imagem consistente mesmo com o primário
+    # em uso (e com WAL)
+    fonte = sqlite3.connect(origem)
+    copia = sqlite3.connect(destino)
+    try:
+        fonte.backup(copia)
+    finally:
+        copia.close()
+        fonte.close()
+
+
+class Command(BaseCommand):
+    help = (
+        'Copia o banco primário para a réplica SQLite local '
+        '(APROSYS_REPLICA_DB), para testar o roteamento de leituras sem '
+        'um servidor com replicação. Com --intervalo repete a cópia, '
+        'simulando uma réplica que fica até N segundos atrasada.'
+    )
+
+    def add_arguments(self, parser):  # noqa: PLR6301 (hook do Django)
+        parser.add_argument(
+            '--intervalo',
+            type=float,
+            help='Segundos entre as cópias (padrão: copia uma vez e sai).',
+        )
+
+    def handle(self, *args, **options):
+        if not replica_configurada():
+            raise CommandError(
+                'Réplica não configurada: defina APROSYS_REPLICA_DB com o '
+                'caminho do arquivo.'
+            )
+        if any(
+            connections[alias].vendor != 'sqlite'
+            for alias in (DEFAULT_DB_ALIAS, REPLICA)
+        ):
+            raise CommandError(
+                'Só é possível copiar entre bancos SQLite; com PostgreSQL '
+                'use a replicação do servidor.'
+            )
+        origem = connections[DEFAULT_DB_ALIAS].settings_dict['NAME']
+        destino = connections[REPLICA].settings_dict['NAME']
+
+        intervalo = options['intervalo']
+        while True:
+            inicio = time.perf_counter()
+            _copiar(origem, destino)
+            self.stdout.write(
+                f'Réplica atualizada em '
+                f'{(time.perf_counter() - inicio) * 1000:.0f} ms.'
+            )
+            if not intervalo:
+                return
+            time.sleep(intervalo)
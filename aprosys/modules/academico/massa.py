@@ -0,0 +1,297 @@
+"""
+Massa de dados sintética para medições (orçamento de queries, benchmarks).
+
+Gera períodos, cursos, disciplinas, turmas, voluntários, alunos, matrículas
+e aulas com chamada em volumes proporcionais ao número de alunos, gravando
+tudo com bulk_create. Os nomes levam uma etiqueta aleatória, de modo que
+a função pode ser chamada mais de uma vez no mesmo banco.
+"""
+
+import random
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from . import presenca
+from .conditional import bump_versao
+from .dashboard import invalidar_estatisticas
+from .models import (
+    Aluno,
+    Curso,
+    CustomUser,
+    Disciplina,
+    PeriodoLetivo,
+    Turma,
+    TurmaAluno,
+    TurmaDisciplina,
+    TurmaDisciplinaProfessor,
+    Voluntario,
+)
+
+NOMES = [
+    'Ana', 'Bruno', 'Carla', 'Diego', 'Elisa', 'Fábio', 'Gabriela',
+    'Heitor', 'Isabela', 'João', 'Júlia', 'Lucas', 'Maria', 'Mateus',
+    'Natália', 'Otávio', 'Paula', 'Rafael', 'Sofia', 'Thiago', 'Vitória',
+]
+SOBRENOMES = [
+    'Almeida', 'Barbosa', 'Cardoso', 'Conceição', 'Costa', 'Ferreira',
+    'Gomes', 'Lima', 'Martins', 'Oliveira', 'Pereira', 'Ribeiro', 'Santos',
+    'Silva', 'Souza',
+]
+AREAS = [area for area, _ in Disciplina.AREA_CONHECIMENTO_CHOICES]
+
+# Proporções em relação ao número de alunos
+ALUNOS_POR_TURMA = 20
+TURMAS_POR_PROFESSOR = 5
+DISCIPLINAS_POR_TURMA = 4
+LOTE = 500
+# Fração de presenças nas chamadas e de alunos ativos
+PRESENCA = 0.85
+ALUNOS_ATIVOS = 0.9
+# Aulas por registrar_aulas: o upsert consulta as aulas existentes com um
+# OR por aula
+AULAS_POR_REGISTRO = 100
+
+
+@dataclass
+class Massa:
+    """
+    Registros principais gerados por popular(), para montar URLs e logins.
+    """
+
+    etiqueta: str
+    periodo: PeriodoLetivo
+    coordenadores: list = field(default_factory=list)
+    professores: list = field(default_factory=list)
+    totais: dict = field(default_factory=dict)
+
+
+def _nome(aleatorio):
+    return (
+        f'{aleatorio.choice(NOMES)} {aleatorio.choice(SOBRENOMES)} '
+        f'{aleatorio.choice(SOBRENOMES)}'
+    )
+
+
+def _com_busca(objetos):
+    # bulk_create não chama save(): o texto de busca é gerado aqui
+    for objeto in objetos:
+        objeto.busca = objeto.texto_busca()
+    return objetos
+
+
+def _voluntarios(etiqueta, tipo, quantidade, senha, aleatorio):
+    users = CustomUser.objects.bulk_create(
+        [
+            CustomUser(
+                username=f'{tipo.lower()}{i:03}-{etiqueta}',
+                email=f'{tipo.lower()}{i}.{etiqueta}@exemplo.org',
+                nome=_nome(aleatorio),
+                password=senha,
+            )
+            for i in range(quantidade)
+        ],
+        batch_size=LOTE,
+    )
+    return Voluntario.objects.bulk_create(
+        _com_busca([
+            Voluntario(
+                user=user,
+                nome=user.nome,
+                cpf=f'{tipo[0]}{etiqueta}{i:07}',
+                email=user.email,
+                rua='Rua Exemplo',
+                numero=str(i),
+                tipo_voluntario=tipo,
+                status_processo_voluntario=Voluntario.STATUS_ATIVO,
+            )
+            for i, user in enumerate(users)
+        ]),
+        batch_size=LOTE,
+    )
+
+
+def _aulas(turma_disciplinas, matriculas, aulas, inicio, aleatorio):
+    """
+    Registra `aulas` aulas por turma/disciplina, com ~85% de presença.
+    """
+    lote = []
+    for turma_disciplina in turma_disciplinas:
+        ordens = matriculas[turma_disciplina.turma_id]
+        for semana in range(aulas):
+            lote.append(presenca.montar_aula(
+                turma_disciplina,
+                inicio + timedelta(weeks=semana),
+                ordens,
+                [o for o in ordens if aleatorio.random() < PRESENCA],
+            ))
+            if len(lote) >= AULAS_POR_REGISTRO:
+                presenca.registrar_aulas(lote)
+                lote = []
+    if lote:
+        presenca.registrar_aulas(lote)
+
+
+def popular(  # noqa: PLR0913, PLR0914 (uma opção por volume gerado)
+    *,
+    alunos=1000,
+    aulas=4,
+    alunos_por_turma=ALUNOS_POR_TURMA,
+    turmas=None,
+    disciplinas=None,
+    professores=None,
+    coordenadores=2,
+    cursos=10,
+    senha='aprosys',
+    semente=None,
+):
+    """
+    Grava uma massa de dados proporcional a `alunos` e retorna um Massa.
+    As quantidades não informadas (None) seguem as proporções do módulo.
+    Todos os usuários criados têm a senha `senha`.
+    """
+    aleatorio = random.Random(semente)
+    etiqueta = f'{aleatorio.getrandbits(24):06x}'
+    turmas_total = turmas or max(1, alunos // alunos_por_turma)
+    professores_total = professores or max(
+        1, turmas_total // TURMAS_POR_PROFESSOR
+    )
+    disciplinas_total = max(
+        DISCIPLINAS_POR_TURMA, disciplinas or turmas_total // 5
+    )
+    turmas_por_professor = -(-turmas_total // professores_total)
+    cursos_total, coordenadores_total = cursos, coordenadores
+    senha = make_password(senha)
+    inicio = date(date.today().year, 2, 1)
+
+    with transaction.atomic():
+        periodo = PeriodoLetivo.objects.create(
+            ano=inicio.year,
+            semestre=1,
+            nome=f'{inicio.year}.1 ({etiqueta})',
+            data_inicio=inicio,
+            data_fim=inicio + timedelta(weeks=20),
+            status=1,
+        )
+        cursos = Curso.objects.bulk_create([
+            Curso(nome=f'Curso {i:03} {etiqueta}')
+            for i in range(cursos_total)
+        ])
+        disciplinas = Disciplina.objects.bulk_create(_com_busca([
+            Disciplina(
+                nome=f'Disciplina {i:03} {etiqueta}',
+                area_conhecimento=AREAS[i % len(AREAS)],
+                status=int(i % 10 != 0),
+            )
+            for i in range(disciplinas_total)
+        ]))
+        turmas = Turma.objects.bulk_create(
+            _com_busca([
+                Turma(
+                    nome=f'Turma {i:04} {etiqueta}',
+                    capacidade=alunos_por_turma * 2,
+                    data_inicio=periodo.data_inicio,
+                    data_fim=periodo.data_fim,
+                    status=1,
+                    periodo_letivo=periodo,
+                    curso=cursos[i % len(cursos)],
+                )
+                for i in range(turmas_total)
+            ]),
+            batch_size=LOTE,
+        )
+        coordenadores = _voluntarios(
+            etiqueta, 'COORDENADOR', coordenadores_total, senha, aleatorio
+        )
+        professores = _voluntarios(
+            etiqueta, 'PROFESSOR', professores_total, senha, aleatorio
+        )
+
+        turma_disciplinas = TurmaDisciplina.objects.bulk_create(
+            [
+                TurmaDisciplina(turma=turma, disciplina=disciplina)
+                for turma in turmas
+                for disciplina in aleatorio.sample(
+                    disciplinas, DISCIPLINAS_POR_TURMA
+                )
+            ],
+            batch_size=LOTE,
+        )
+        # Cada professor fica com as disciplinas de algumas turmas seguidas
+        por_professor = DISCIPLINAS_POR_TURMA * turmas_por_professor
+        TurmaDisciplinaProfessor.objects.bulk_create(
+            [
+                TurmaDisciplinaProfessor(
+                    turma_disciplina=turma_disciplina,
+                    voluntario=professores[
+                        min(i // por_professor, professores_total - 1)
+                    ],
+                )
+                for i, turma_disciplina in enumerate(turma_disciplinas)
+            ],
+            batch_size=LOTE,
+        )
+
+        criados = Aluno.objects.bulk_create(
+            _com_busca([
+                Aluno(
+                    nome=_nome(aleatorio),
+                    email=f'aluno{i}.{etiqueta}@exemplo.org',
+                    contato=f'1199{i:07}'[:11],
+                    nascimento=date(2000, 1, 1)
+                    + timedelta(days=aleatorio.randrange(3650)),
+                    cidade='São Paulo',
+                    estado='SP',
+                    rua='Rua Exemplo',
+                    numero=str(i),
+                    status=int(aleatorio.random() < ALUNOS_ATIVOS),
+                )
+                for i in range(alunos)
+            ]),
+            batch_size=LOTE,
+        )
+        matriculas = {turma.pk: [] for turma in turmas}
+        vinculos = []
+        for i, aluno in enumerate(criados):
+            turma = turmas[i % turmas_total]
+            ordem = len(matriculas[turma.pk])
+            matriculas[turma.pk].append(ordem)
+            vinculos.append(
+                TurmaAluno(aluno=aluno, turma=turma, ordem=ordem)
+            )
+        TurmaAluno.objects.bulk_create(vinculos, batch_size=LOTE)
+        for turma in turmas:
+            turma.proxima_ordem = len(matriculas[turma.pk])
+        Turma.objects.bulk_update(
+            turmas, ['proxima_ordem'], batch_size=LOTE
+        )
+
+    # Cada lote de aulas tem sua própria transação (registrar_aulas)
+    _aulas(turma_disciplinas, matriculas, aulas, inicio, aleatorio)
+
+    # bulk_create não dispara signals
+    for model in (
+        PeriodoLetivo, Curso, Disciplina, Turma, Voluntario, Aluno,
+        TurmaAluno, TurmaDisciplina, TurmaDisciplinaProfessor,
+    ):
+        bump_versao(model)
+    invalidar_estatisticas([])
+
+    return Massa(
+        etiqueta=etiqueta,
+        periodo=periodo,
+        coordenadores=coordenadores,
+        professores=professores,
+        totais={
+            'alunos': len(criados),
+            'cursos': len(cursos),
+            'turmas': len(turmas),
+            'disciplinas': len(disciplinas),
+            'coordenadores': len(coordenadores),
+            'professores': len(professores),
+            'matriculas': len(vinculos),
+            'aulas': len(turma_disciplinas) * aulas,
+        },
+    )
@@ -0,0 +1,235 @@
+"""
+Apoio às medições das páginas (orcamento_consultas, benchmark_paginas,
+benchmark_fragmentos e os testes de orçamento de queries): monta a URL
+de cada rota de modules/academico/urls.py com registros reais do banco e
+faz as requisições contando as queries.
+"""
+
+from contextlib import ExitStack
+
+from django.core.cache import cache
+from django.core.management.base import CommandError
+from django.db import connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, reverse
+
+from . import massa
+from .models import (
+    CustomUser,
+    Tarefa,
+    TurmaAluno,
+    TurmaDisciplinaProfessor,
+    Voluntario,
+)
+from .urls import urlpatterns
+
+# Rotas fora das medições: alteram dados no GET, servem arquivos fora do
+# banco ou não renderizam
+IGNORADAS = {
+    'logout',
+    'excluir_disciplina',
+    'excluir_curso',
+    'baixar_boletim',
+    # Os templates de academico/periodos/ ainda não existem
+    'cadastrar_periodo',
+    'pesquisar_periodo',
+}
+
+# Máximo de queries por página (para qualquer papel e volume de dados),
+# conferido por orcamento_consultas e pelos testes. Ao mudar uma view,
+# ajuste aqui conscientemente; nunca deve depender do número de linhas
+# exibidas.
+ORCAMENTOS = {
+    'user_registration': 0,
+    'home': 6,
+    'pesquisar_aluno': 8,
+    'cadastrar_aluno': 6,
+    'editar_aluno': 8,
+    'detalhes_aluno': 8,
+    'importar_alunos': 5,
+    'exportar_alunos': 8,
+    'cadastrar_disciplina': 5,
+    'pesquisar_disciplina': 9,
+    'pesquisar_disciplina_json': 9,
+    'editar_disciplina': 6,
+    'excluir_disciplinas_massa': 5,
+    'cadastrar_turma': 7,
+    'pesquisar_turma': 8,
+    'exportar_turmas': 8,
+    'cadastrar_voluntario': 7,
+    'pesquisar_voluntario': 3,
+    'exportar_voluntarios': 3,
+    'listar_chamadas': 8,
+    'registrar_presenca': 16,
+    'relatorio_frequencia': 9,
+    'boletins': 7,
+    'acompanhar_tarefa': 3,
+    'status_tarefa': 3,
+    'metricas': 2,
+    'cadastrar_curso': 5,
+    'editar_curso': 6,
+    'pesquisar_curso': 3,
+    'excluir_cursos_massa': 5,
+    'informacoes_curso': 3,
+}
+
+
+def percentil(valores, p):
+    ordenados = sorted(valores)
+    indice = min(len(ordenados) - 1, round(p / 100 * (len(ordenados) - 1)))
+    return ordenados[indice]
+
+
+def voluntario_ativo(tipo, username=None):
+    """
+    Voluntário ativo do `tipo` com login `username` (por padrão o
+    primeiro; professor, o primeiro com disciplinas), para os comandos de
+    benchmark.
+    """
+    voluntarios = Voluntario.objects.filter(
+        tipo_voluntario=tipo,
+        status_processo_voluntario=Voluntario.STATUS_ATIVO,
+        user__is_active=True,
+    ).select_related('user')
+    if username:
+        voluntarios = voluntarios.filter(user__username=username)
+    elif tipo == 'PROFESSOR':
+        voluntarios = voluntarios.filter(
+            turmadisciplinaprofessor__status=1
+        ).distinct()
+    voluntario = voluntarios.order_by('pk').first()
+    if voluntario is None:
+        raise CommandError(
+            f'Nenhum voluntário {tipo.lower()} ativo encontrado '
+            '(popule o banco com manage.py seed_academico).'
+        )
+    return voluntario
+
+
+def argumentos(professor):
+    """
+    Valores dos parâmetros das URLs e querystrings, tirados das disciplinas
+    do `professor` (Voluntario) para que ele também veja as páginas
+    completas. Parâmetros sem registro no banco ficam None.
+    """
+    vinculo = (
+        TurmaDisciplinaProfessor.objects.filter(
+            voluntario=professor, status=1
+        )
+        .select_related('turma_disciplina__turma')
+        .order_by('pk')
+        .first()
+    )
+    if vinculo is None:
+        return {'kwargs': {}, 'querystrings': {}}
+    turma_disciplina = vinculo.turma_disciplina
+    turma = turma_disciplina.turma
+    turma_aluno = (
+        TurmaAluno.objects.filter(turma=turma).order_by('pk').first()
+    )
+    tarefa = Tarefa.objects.order_by('-pk').first()
+
+    return {
+        'kwargs': {
+            'aluno_id': turma_aluno and turma_aluno.aluno_id,
+            'disciplina_id': turma_disciplina.disciplina_id,
+            'turma_disciplina_id': turma_disciplina.pk,
+            'turma_aluno_id': turma_aluno and turma_aluno.pk,
+            'curso_id': turma.curso_id,
+            'pk': {
+                'informacoes_curso': turma.curso_id,
+                'acompanhar_tarefa': tarefa and tarefa.pk,
+                'status_tarefa': tarefa and tarefa.pk,
+            },
+        },
+        'querystrings': {
+            'relatorio_frequencia': (
+                f'periodo={turma.periodo_letivo_id}'
+                f'&turma_disciplina={turma_disciplina.pk}'
+            ),
+            'boletins': f'periodo={turma.periodo_letivo_id}',
+        },
+    }
+
+
+def paginas(valores):
+    """
+    Lista (nome da rota, URL) das rotas medidas, pulando as que dependem de
+    um registro que não existe no banco.
+    """
+    resultado = []
+    for padrao in urlpatterns:
+        if not isinstance(padrao, URLPattern):
+            continue
+        if not padrao.name or padrao.name in IGNORADAS:
+            continue
+        kwargs = {}
+        for parametro in padrao.pattern.converters:
+            valor = valores['kwargs'].get(parametro)
+            if isinstance(valor, dict):
+                valor = valor.get(padrao.name)
+            kwargs[parametro] = valor
+        if None in kwargs.values():
+            continue
+        url = reverse(padrao.name, kwargs=kwargs)
+        querystring = valores['querystrings'].get(padrao.name)
+        if querystring:
+            url += f'?{querystring}'
+        resultado.append((padrao.name, url))
+    return resultado
+
+
+def requisitar(client, url):
+    """
+    Faz o GET (lendo também o corpo das respostas em streaming) e retorna
+    (queries em todos os bancos, status).
+    """
+    with ExitStack() as pilha:
+        contextos = [
+            pilha.enter_context(CaptureQueriesContext(conexao))
+            for conexao in connections.all()
+        ]
+        response = client.get(url)
+        if response.streaming:
+            b''.join(response.streaming_content)
+    return sum(len(contexto) for contexto in contextos), response.status_code
+
+
+def medir_volume(alunos):
+    """
+    Popula o banco atual com `alunos` alunos (massa.popular) e abre cada
+    página como superusuário, coordenador e professor, sem caches
+    aquecidos (visibilidade, estatísticas). Retorna (massa gerada,
+    {(nome da rota, papel): (queries, status)}).
+    """
+    # Turmas e listagens também crescem: em um volume pequeno cabem em uma
+    # página, então uma query por linha aparece na comparação
+    dados = massa.popular(
+        alunos=alunos, alunos_por_turma=max(2, alunos // 50), semente=alunos
+    )
+    usuarios = {
+        'SUPERUSUARIO': CustomUser.objects.create_superuser(
+            username=f'admin-{dados.etiqueta}',
+            email=f'admin.{dados.etiqueta}@exemplo.org',
+            password=None,
+            nome='Administrador',
+        ),
+        'COORDENADOR': dados.coordenadores[0].user,
+        'PROFESSOR': dados.professores[0].user,
+    }
+    # Para as páginas de acompanhamento de tarefa
+    Tarefa.objects.create(
+        tipo='gerar_boletins',
+        parametros={'periodo_id': dados.periodo.pk},
+        criado_por=usuarios['SUPERUSUARIO'],
+    )
+    urls = paginas(argumentos(dados.professores[0]))
+    resultados = {}
+    for papel, user in usuarios.items():
+        client = Client(raise_request_exception=False)
+        client.force_login(user)
+        for nome, url in urls:
+            cache.clear()
+            resultados[(nome, papel)] = requisitar(client, url)
+    return dados, resultados
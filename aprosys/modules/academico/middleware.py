@@ -0,0 +1,244 @@
+import mimetypes
+import os
+import time
+from pathlib import Path
+
+from asgiref.sync import (
+    iscoroutinefunction,
+    markcoroutinefunction,
+    sync_to_async,
+)
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import FileResponse, HttpResponseNotModified
+from django.utils.functional import SimpleLazyObject
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+from .instrumentacao import (
+    encerrar_medicao,
+    iniciar_medicao,
+    iniciar_view,
+    registrar,
+)
+from .perfil import aget_perfil, get_perfil
+from .roteamento import amarcar_escrita, marcar_escrita
+
+
+class PerfilVoluntarioMiddleware:
+    """
+    Disponibiliza `request.perfil` (papel do voluntário logado), carregado
+    da sessão e recalculado apenas quando a versão do perfil muda.
+
+    Deve vir depois de SessionMiddleware e AuthenticationMiddleware.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self._acall(request)
+        request.perfil = SimpleLazyObject(lambda: get_perfil(request))
+        return self.get_response(request)
+
+    async def _acall(self, request):
+        # Sob ASGI o usuário e o perfil são carregados antes da view: o
+        # carregamento sob demanda faria queries síncronas no event loop.
+        request.user = await request.auser()
+        request.perfil = await aget_perfil(request)
+        return await self.get_response(request)
+
+
+class ReplicaMiddleware:
+    """
+    Registra na sessão as requisições que alteram dados, para que as
+    leituras seguintes do mesmo usuário não vão para a réplica enquanto ela
+    pode estar atrasada (ver roteamento.py).
+
+    Deve vir depois de SessionMiddleware e AuthenticationMiddleware.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self._acall(request)
+        response = self.get_response(request)
+        marcar_escrita(request, response)
+        return response
+
+    async def _acall(self, request):
+        response = await self.get_response(request)
+        await amarcar_escrita(request, response)
+        return response
+
+
+class MetricasMiddleware:
+    """
+    Mede cada requisição (ver instrumentacao.py): devolve os tempos de SQL,
+    templates e view no cabeçalho Server-Timing, se settings.SERVER_TIMING
+    estiver ligado, e os registra nos histogramas de /metrics pelo nome da
+    URL. O corpo das respostas em streaming não entra na medição.
+
+    Deve vir logo depois do EstaticosMiddleware, para medir também sessão
+    e autenticação.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+            # Um process_view síncrono rodaria em thread a cada requisição
+            self.process_view = self._aprocess_view
+        self.server_timing = getattr(settings, 'SERVER_TIMING', True)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self._acall(request)
+        medicao, token = iniciar_medicao(request.path)
+        try:
+            response = self.get_response(request)
+        finally:
+            encerrar_medicao(token)
+        return self._finalizar(request, response, medicao)
+
+    async def _acall(self, request):
+        medicao, token = iniciar_medicao(request.path)
+        try:
+            response = await self.get_response(request)
+        finally:
+            encerrar_medicao(token)
+        return self._finalizar(request, response, medicao)
+
+    def process_view(  # noqa: PLR6301 (hook do Django)
+        self, request, view_func, view_args, view_kwargs
+    ):
+        iniciar_view(request.resolver_match.view_name)
+
+    async def _aprocess_view(  # noqa: PLR6301 (hook do Django)
+        self, request, *args
+    ):
+        iniciar_view(request.resolver_match.view_name)
+
+    def _finalizar(self, request, response, medicao):
+        fim = time.perf_counter()
+        if medicao.inicio_view is not None:
+            medicao.view = fim - medicao.inicio_view
+        total = fim - medicao.inicio
+        if self.server_timing:
+            response['Server-Timing'] = medicao.server_timing(total)
+        registrar(medicao.url_name or 'nao_encontrada', medicao, total)
+        return response
+
+
+# Um ano: arquivos com hash no nome nunca mudam de conteúdo
+CACHE_IMUTAVEL = 'public, max-age=31536000, immutable'
+CACHE_REVALIDAR = 'public, max-age=0, must-revalidate'
+
+
+class EstaticosMiddleware:
+    """
+    Serve os arquivos gerados pelo collectstatic (STATIC_ROOT) quando o
+    DEBUG está desligado, antes de sessão e autenticação. Usa a cópia .br
+    ou .gz quando o navegador aceita, e os nomes com hash (ver
+    estaticos.EstaticosStorage) vão com cache imutável.
+
+    Deve vir logo depois do SecurityMiddleware.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        # Em desenvolvimento o runserver serve das pastas de origem
+        if settings.DEBUG or not settings.STATIC_ROOT:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        self.prefixo = '/' + settings.STATIC_URL.lstrip('/')
+        self.raiz = Path(settings.STATIC_ROOT).resolve()
+        self.imutaveis = set(
+            getattr(staticfiles_storage, 'hashed_files', {}).values()
+        )
+
+    def _estatico(self, request):
+        return request.method in {'GET', 'HEAD'} and (
+            request.path_info.startswith(self.prefixo)
+        )
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self._acall(request)
+        if self._estatico(request):
+            response = self._servir(request)
+            if response is not None:
+                return response
+        return self.get_response(request)
+
+    async def _acall(self, request):
+        if self._estatico(request):
+            response = await sync_to_async(
+                self._servir, thread_sensitive=False
+            )(request)
+            if response is not None:
+                return response
+        return await self.get_response(request)
+
+    def _servir(self, request):
+        nome = request.path_info[len(self.prefixo):]
+        try:
+            caminho = (self.raiz / nome).resolve()
+        except (OSError, ValueError):
+            return None
+        # Caminhos com '..' ou absolutos não saem do STATIC_ROOT
+        if not caminho.is_relative_to(self.raiz) or not caminho.is_file():
+            return None
+        caminho = str(caminho)
+
+        stat = os.stat(caminho)
+        if not was_modified_since(
+            request.headers.get('If-Modified-Since'), stat.st_mtime
+        ):
+            return HttpResponseNotModified()
+
+        aceitas = {
+            parte.split(';')[0].strip()
+            for parte in request.headers.get('Accept-Encoding', '').split(',')
+        }
+        arquivo, codificacao = caminho, None
+        for extensao, encoding in (('.br', 'br'), ('.gz', 'gzip')):
+            if encoding in aceitas and os.path.isfile(caminho + extensao):
+                arquivo, codificacao = caminho + extensao, encoding
+                break
+
+        content_type = mimetypes.guess_type(nome)[0]
+        response = FileResponse(
+            open(arquivo, 'rb'),
+            content_type=content_type or 'application/octet-stream',
+            filename=os.path.basename(nome),
+        )
+        if codificacao:
+            response['Content-Encoding'] = codificacao
+        response['Vary'] = 'Accept-Encoding'
+        response['Last-Modified'] = http_date(stat.st_mtime)
+        response['Cache-Control'] = (
+            CACHE_IMUTAVEL if nome in self.imutaveis else CACHE_REVALIDAR
+        )
+        return response
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:16
+
+from django.db import migrations, models
+
+from modules.academico.search import instalar_indices_busca, normalizar
+
+SEARCH_FIELDS = {
+    'Aluno': ('nome', 'email'),
+    'Disciplina': ('nome', 'get_area_conhecimento_display'),
+    'Turma': ('nome',),
+    'Voluntario': ('nome', 'email'),
+}
+
+
+def preencher_busca(apps, schema_editor):
+    for model_name, fields in SEARCH_FIELDS.items():
+        model = apps.get_model('academico', model_name)
+        objs = list(model.objects.all())
+        for obj in objs:
+            partes = []
+            for nome in fields:
+                valor = getattr(obj, nome)
+                partes.append(str(valor() if callable(valor) else valor or ''))
+            obj.busca = normalizar(' '.join(partes))
+        model.objects.bulk_update(objs, ['busca'], batch_size=500)
+
+
+def criar_indices(apps, schema_editor):
+    instalar_indices_busca(
+        [apps.get_model('academico', name) for name in SEARCH_FIELDS],
+        using=schema_editor.connection.alias,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academico', '0006_remove_aluno_curso_interesse_aluno_curso_interesse'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aluno',
+            name='busca',
+            field=models.CharField(blank=True, default='', editable=False, max_length=400, verbose_name='Texto de busca'),
+        ),
+        migrations.AddField(
+            model_name='disciplina',
+            name='busca',
+            field=models.CharField(blank=True, default='', editable=False, max_length=400, verbose_name='Texto de busca'),
+        ),
+        migrations.AddField(
+            model_name='turma',
+            name='busca',
+            field=models.CharField(blank=True, default='', editable=False, max_length=400, verbose_name='Texto de busca'),
+        ),
+        migrations.AddField(
+            model_name='voluntario',
+            name='busca',
+            field=models.CharField(blank=True, default='', editable=False, max_length=400, verbose_name='Texto de busca'),
+        ),
+        migrations.RunPython(preencher_busca, migrations.RunPython.noop),
+        migrations.RunPython(criar_indices, migrations.RunPython.noop),
+    ]
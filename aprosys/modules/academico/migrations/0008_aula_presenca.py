@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def numerar_matriculas(apps, schema_editor):
+    # Matrículas existentes recebem a ordem de criação dentro de cada turma
+    TurmaAluno = apps.get_model('academico', 'TurmaAluno')
+    matriculas = list(TurmaAluno.objects.order_by('turma_id', 'pk'))
+    turma_anterior, ordem = None, 0
+    for matricula in matriculas:
+        if matricula.turma_id != turma_anterior:
+            turma_anterior, ordem = matricula.turma_id, 0
+        matricula.ordem = ordem
+        ordem += 1
+    TurmaAluno.objects.bulk_update(matriculas, ['ordem'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academico', '0007_busca_normalizada'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='turmaaluno',
+            name='ordem',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Ordem de matrícula'),
+        ),
+        migrations.RunPython(numerar_matriculas, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='turmaaluno',
+            unique_together={('turma', 'aluno'), ('turma', 'ordem')},
+        ),
+        migrations.CreateModel(
+            name='Aula',
+            fields=[
+                ('id_aula', models.AutoField(primary_key=True, serialize=False)),
+                ('data', models.DateField(verbose_name='Data da aula')),
+                ('conteudo', models.TextField(blank=True, verbose_name='Conteúdo ministrado')),
+                ('chamada', models.BinaryField(default=b'', verbose_name='Alunos na chamada')),
+                ('presentes', models.BinaryField(default=b'', verbose_name='Alunos presentes')),
+                ('total_chamada', models.PositiveIntegerField(default=0, verbose_name='Total na chamada')),
+                ('total_presentes', models.PositiveIntegerField(default=0, verbose_name='Total de presentes')),
+                ('atualizado_em', models.DateTimeField(auto_now=True, verbose_name='Atualizado em')),
+                ('registrado_por', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='academico.voluntario', verbose_name='Registrado por')),
+                ('turma_disciplina', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aulas', to='academico.turmadisciplina', verbose_name='Turma Disciplina')),
+            ],
+            options={
+                'verbose_name': 'Aula',
+                'verbose_name_plural': 'Aulas',
+                'unique_together': {('turma_disciplina', 'data')},
+            },
+        ),
+    ]
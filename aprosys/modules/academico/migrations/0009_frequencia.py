@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academico', '0008_aula_presenca'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FrequenciaAluno',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('aulas', models.IntegerField(default=0, verbose_name='Aulas')),
+                ('presencas', models.IntegerField(default=0, verbose_name='Presenças')),
+                ('aluno', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='frequencias', to='academico.aluno', verbose_name='Aluno')),
+                ('turma_disciplina', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='frequencias', to='academico.turmadisciplina', verbose_name='Turma Disciplina')),
+            ],
+            options={
+                'verbose_name': 'Frequência do Aluno',
+                'verbose_name_plural': 'Frequências dos Alunos',
+                'unique_together': {('turma_disciplina', 'aluno')},
+            },
+        ),
+        migrations.CreateModel(
+            name='FrequenciaProfessor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('aulas', models.IntegerField(default=0, verbose_name='Aulas')),
+                ('chamadas', models.IntegerField(default=0, verbose_name='Alunos nas chamadas')),
+                ('presencas', models.IntegerField(default=0, verbose_name='Presenças')),
+                ('periodo_letivo', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='frequencias', to='academico.periodoletivo', verbose_name='Período Letivo')),
+                ('voluntario', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='frequencias', to='academico.voluntario', verbose_name='Professor')),
+            ],
+            options={
+                'verbose_name': 'Frequência do Professor',
+                'verbose_name_plural': 'Frequências dos Professores',
+                'unique_together': {('voluntario', 'periodo_letivo')},
+            },
+        ),
+    ]
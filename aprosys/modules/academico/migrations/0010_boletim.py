@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academico', '0009_frequencia'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Boletim',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hash_dados', models.CharField(max_length=64, verbose_name='Hash dos dados')),
+                ('arquivo', models.CharField(max_length=200, verbose_name='Arquivo')),
+                ('gerado_em', models.DateTimeField(auto_now=True, verbose_name='Gerado em')),
+                ('turma_aluno', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='boletim', to='academico.turmaaluno', verbose_name='Aluno Turma')),
+            ],
+            options={
+                'verbose_name': 'Boletim',
+                'verbose_name_plural': 'Boletins',
+            },
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:38
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academico', '0010_boletim'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tarefa',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(max_length=50, verbose_name='Tipo')),
+                ('parametros', models.JSONField(blank=True, default=dict, verbose_name='Parâmetros')),
+                ('status', models.CharField(choices=[('PENDENTE', 'Pendente'), ('EXECUTANDO', 'Executando'), ('CONCLUIDA', 'Concluída'), ('FALHOU', 'Falhou')], default='PENDENTE', max_length=10, verbose_name='Status')),
+                ('tentativas', models.PositiveIntegerField(default=0, verbose_name='Tentativas')),
+                ('max_tentativas', models.PositiveIntegerField(default=3, verbose_name='Máximo de tentativas')),
+                ('executar_em', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Executar em')),
+                ('progresso', models.PositiveSmallIntegerField(default=0, verbose_name='Progresso (%)')),
+                ('mensagem', models.CharField(blank=True, max_length=200, verbose_name='Mensagem')),
+                ('resultado', models.JSONField(blank=True, null=True, verbose_name='Resultado')),
+                ('erro', models.TextField(blank=True, verbose_name='Erro')),
+                ('worker', models.CharField(blank=True, max_length=100, verbose_name='Worker')),
+                ('criado_em', models.DateTimeField(auto_now_add=True, verbose_name='Criado em')),
+                ('atualizado_em', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Atualizado em')),
+                ('concluido_em', models.DateTimeField(blank=True, null=True, verbose_name='Concluído em')),
+                ('criado_por', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL, verbose_name='Criado por')),
+            ],
+            options={
+                'verbose_name': 'Tarefa',
+                'verbose_name_plural': 'Tarefas',
+                'indexes': [models.Index(fields=['status', 'executar_em'], name='academico_t_status_984781_idx')],
+            },
+        ),
+    ]
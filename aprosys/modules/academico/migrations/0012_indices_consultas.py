@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academico', '0011_tarefa'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='aluno',
+            index=models.Index(fields=['nome', 'id'], name='aluno_nome_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='aluno',
+            index=models.Index(fields=['status', 'id'], name='aluno_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='disciplina',
+            index=models.Index(fields=['status'], name='disciplina_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='turma',
+            index=models.Index(fields=['periodo_letivo', 'status'], name='turma_periodo_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='turma',
+            index=models.Index(fields=['status', 'id_turma'], name='turma_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='turmaaluno',
+            index=models.Index(condition=models.Q(('status', 1)), fields=['turma', 'aluno'], name='ta_turma_ativa_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='turmadisciplina',
+            index=models.Index(condition=models.Q(('status', 1)), fields=['disciplina', 'turma'], name='td_disciplina_ativa_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='turmadisciplinaprofessor',
+            index=models.Index(condition=models.Q(('status', 1)), fields=['voluntario', 'turma_disciplina'], name='tdp_voluntario_ativo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='voluntario',
+            index=models.Index(fields=['nome', 'user'], name='voluntario_nome_idx'),
+        ),
+    ]
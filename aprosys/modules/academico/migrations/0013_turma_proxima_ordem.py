@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:40
+
+from django.db import migrations, models
+
+
+def iniciar_contadores(apps, schema_editor):
+    # O contador continua depois da maior ordem já usada em cada turma
+    Turma = apps.get_model('academico', 'Turma')
+    TurmaAluno = apps.get_model('academico', 'TurmaAluno')
+    ultimas = (
+        TurmaAluno.objects.filter(ordem__isnull=False)
+        .values('turma_id')
+        .annotate(ultima=models.Max('ordem'))
+    )
+    for linha in ultimas:
+        Turma.objects.filter(pk=linha['turma_id']).update(
+            proxima_ordem=linha['ultima'] + 1
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academico', '0012_indices_consultas'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='turma',
+            name='proxima_ordem',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(iniciar_contadores, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academico', '0013_turma_proxima_ordem'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tarefa',
+            name='retomada',
+            field=models.JSONField(blank=True, null=True, verbose_name='Ponto de retomada'),
+        ),
+    ]
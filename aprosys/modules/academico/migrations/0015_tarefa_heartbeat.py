@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:29
+
+from django.db import migrations, models
+
+
+def iniciar_heartbeats(apps, schema_editor):
+    # Tarefas em execução partem da última atualização de progresso, para
+    # que recuperar_travadas continue enxergando as abandonadas
+    Tarefa = apps.get_model('academico', 'Tarefa')
+    Tarefa.objects.filter(status='EXECUTANDO').update(
+        heartbeat_em=models.F('atualizado_em')
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academico', '0014_tarefa_retomada'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tarefa',
+            name='heartbeat_em',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Último heartbeat'),
+        ),
+        migrations.RunPython(iniciar_heartbeats, migrations.RunPython.noop),
+    ]
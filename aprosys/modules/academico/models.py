@@ -1,7 +1,9 @@
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.db import models, router, transaction
 from django.utils import timezone
 
+from .search import normalizar
+
 
 class CustomUser(AbstractUser):
     nome = models.CharField(max_length=150, null=False, blank=False)
@@ -11,6 +13,41 @@ class CustomUser(AbstractUser):
         return self.email
 
 
+class BuscaNormalizadaModel(models.Model):
+    """
+    Mantém na coluna `busca` o texto normalizado (sem acentos, minúsculo)
+    dos campos listados em SEARCH_FIELDS. É a coluna usada pelo índice de
+    texto e por `search.filtro_busca`.
+    """
+
+    SEARCH_FIELDS = ()
+
+    busca = models.CharField(
+        'Texto de busca',
+        max_length=400,
+        blank=True,
+        default='',
+        editable=False,
+    )
+
+    class Meta:
+        abstract = True
+
+    def texto_busca(self):
+        partes = []
+        for nome in self.SEARCH_FIELDS:
+            valor = getattr(self, nome)
+            partes.append(str(valor() if callable(valor) else valor or ''))
+        return normalizar(' '.join(partes))
+
+    def save(self, *args, **kwargs):
+        self.busca = self.texto_busca()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'busca'}
+        super().save(*args, **kwargs)
+
+
 class Curso(models.Model):
     id_curso = models.AutoField(primary_key=True)
     nome = models.CharField('Nome do curso', max_length=30, unique=True)
@@ -48,8 +85,9 @@ class PeriodoLetivo(models.Model):
         return self.nome
 
 
-class Turma(models.Model):
+class Turma(BuscaNormalizadaModel):
     STATUS = {0: 'INATIVO', 1: 'ATIVO'}
+    SEARCH_FIELDS = ('nome',)
 
     id_turma = models.AutoField(primary_key=True)
     nome = models.CharField('Nome da Turma', max_length=30, unique=True)
@@ -71,12 +109,28 @@ class Turma(models.Model):
         null=True,
         blank=False,
     )
+    # Próxima TurmaAluno.ordem livre. Só cresce, para que a posição de um
+    # aluno removido nunca seja dada a outro (ver TurmaAluno.save).
+    proxima_ordem = models.PositiveIntegerField(default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            # Turmas do período (boletins, consolidados de frequência)
+            models.Index(
+                fields=['periodo_letivo', 'status'],
+                name='turma_periodo_status_idx',
+            ),
+            # Listagem ordenada por status (keyset: status, pk)
+            models.Index(
+                fields=['status', 'id_turma'], name='turma_status_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.nome
 
 
-class Disciplina(models.Model):
+class Disciplina(BuscaNormalizadaModel):
     AREA_CONHECIMENTO_CHOICES = (
         ('CIENCIAS_NATUREZA', 'Ciências da Natureza'),
         ('CIENCIAS_HUMANAS', 'Ciências Humanas'),
@@ -89,6 +143,8 @@ class Disciplina(models.Model):
         (1, 'Ativo'),
     )
 
+    SEARCH_FIELDS = ('nome', 'get_area_conhecimento_display')
+
     nome = models.CharField(
         max_length=100,
         unique=True,
@@ -117,6 +173,10 @@ class Disciplina(models.Model):
     class Meta:
         verbose_name = 'Disciplina'
         verbose_name_plural = 'Disciplinas'
+        indexes = [
+            # Totais por status da listagem e ordenação por status
+            models.Index(fields=['status'], name='disciplina_status_idx'),
+        ]
 
     def __str__(self):
         return (
@@ -152,12 +212,23 @@ class TurmaDisciplina(models.Model):
         verbose_name = 'Turma Disciplina'
         verbose_name_plural = 'Disciplinas das Turmas'
         unique_together = ('turma', 'disciplina')
+        indexes = [
+            # Turmas ativas de uma disciplina; as buscas por turma usam o
+            # índice do unique_together
+            models.Index(
+                fields=['disciplina', 'turma'],
+                condition=models.Q(status=1),
+                name='td_disciplina_ativa_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.nome
 
 
-class Voluntario(models.Model):
+class Voluntario(BuscaNormalizadaModel):
+    SEARCH_FIELDS = ('nome', 'email')
+
     user = models.OneToOneField(
         CustomUser,
         on_delete=models.CASCADE,
@@ -239,12 +310,19 @@ class Voluntario(models.Model):
         editable=False,
     )
 
+    class Meta:
+        indexes = [
+            # Listagem ordenada por nome (keyset: nome, pk)
+            models.Index(fields=['nome', 'user'], name='voluntario_nome_idx'),
+        ]
+
     def __str__(self):
         return self.user.username
 
 
-class Aluno(models.Model):
-    
+class Aluno(BuscaNormalizadaModel):
+    SEARCH_FIELDS = ('nome', 'email')
+
     STATUS_CHOICES = (
         (0, 'Inativo'),
         (1, 'Ativo'),
@@ -332,6 +410,13 @@ class Aluno(models.Model):
         null=True
     )
 
+    class Meta:
+        indexes = [
+            # Listagem ordenada por nome ou por status (keyset: campo, pk)
+            models.Index(fields=['nome', 'id'], name='aluno_nome_idx'),
+            models.Index(fields=['status', 'id'], name='aluno_status_idx'),
+        ]
+
     def __str__(self):
         return self.nome
 
@@ -359,14 +444,46 @@ class TurmaAluno(models.Model):
         'Status', choices=STATUS, default=1, null=True, blank=False
     )
 
+    # Posição do aluno na turma, atribuída na matrícula e nunca reutilizada.
+    # É o índice do aluno nos bitmaps de presença das aulas.
+    ordem = models.PositiveIntegerField(
+        'Ordem de matrícula', null=True, blank=True, editable=False
+    )
+
     class Meta:
         verbose_name = 'Aluno Turma'
         verbose_name_plural = 'Alunos das Turmas'
-        unique_together = ('turma', 'aluno')
+        unique_together = [('turma', 'aluno'), ('turma', 'ordem')]
+        indexes = [
+            # Alunos ativos das turmas (visibilidade do professor), sem
+            # ler a tabela
+            models.Index(
+                fields=['turma', 'aluno'],
+                condition=models.Q(status=1),
+                name='ta_turma_ativa_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.nome
 
+    def save(self, *args, **kwargs):
+        if self.ordem is not None or self.turma_id is None:
+            super().save(*args, **kwargs)
+            return
+        using = kwargs.get('using') or router.db_for_write(
+            TurmaAluno, instance=self
+        )
+        with transaction.atomic(using=using):
+            # O UPDATE trava a turma até o fim da transação: matrículas
+            # simultâneas na mesma turma recebem ordens diferentes
+            turma = Turma.objects.using(using).filter(pk=self.turma_id)
+            turma.update(proxima_ordem=models.F('proxima_ordem') + 1)
+            self.ordem = (
+                turma.values_list('proxima_ordem', flat=True).get() - 1
+            )
+            super().save(*args, **kwargs)
+
 
 class TurmaDisciplinaProfessor(models.Model):
     STATUS = {0: 'INATIVO', 1: 'ATIVO'}
@@ -395,6 +512,226 @@ class TurmaDisciplinaProfessor(models.Model):
         verbose_name = 'Voluntário Disicplina'
         verbose_name_plural = 'Professores das Disciplinas nas Turmas'
         unique_together = ('turma_disciplina', 'voluntario')
+        indexes = [
+            # Vínculos ativos do professor (visibility.py)
+            models.Index(
+                fields=['voluntario', 'turma_disciplina'],
+                condition=models.Q(status=1),
+                name='tdp_voluntario_ativo_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.nome
+
+
+class Aula(models.Model):
+    """
+    Uma aula de uma disciplina na turma, com a chamada inteira em uma linha:
+    `chamada` e `presentes` são bitmaps indexados por TurmaAluno.ordem (bit
+    ligado = aluno estava na lista / estava presente). Ver presenca.Bitmap.
+    """
+
+    id_aula = models.AutoField(primary_key=True)
+    turma_disciplina = models.ForeignKey(
+        TurmaDisciplina,
+        on_delete=models.CASCADE,
+        verbose_name='Turma Disciplina',
+        related_name='aulas',
+    )
+    data = models.DateField('Data da aula')
+    conteudo = models.TextField('Conteúdo ministrado', blank=True)
+    chamada = models.BinaryField('Alunos na chamada', default=b'')
+    presentes = models.BinaryField('Alunos presentes', default=b'')
+    total_chamada = models.PositiveIntegerField('Total na chamada', default=0)
+    total_presentes = models.PositiveIntegerField(
+        'Total de presentes', default=0
+    )
+    registrado_por = models.ForeignKey(
+        Voluntario,
+        on_delete=models.SET_NULL,
+        verbose_name='Registrado por',
+        null=True,
+        blank=True,
+    )
+    atualizado_em = models.DateTimeField('Atualizado em', auto_now=True)
+
+    class Meta:
+        verbose_name = 'Aula'
+        verbose_name_plural = 'Aulas'
+        unique_together = ('turma_disciplina', 'data')
+
+    def __str__(self):
+        return f'{self.turma_disciplina_id} - {self.data:%d/%m/%Y}'
+
+
+class FrequenciaAluno(models.Model):
+    """
+    Totais de frequência do aluno em uma disciplina da turma, atualizados
+    incrementalmente a cada chamada (ver presenca.atualizar_frequencias).
+    """
+
+    turma_disciplina = models.ForeignKey(
+        TurmaDisciplina,
+        on_delete=models.CASCADE,
+        verbose_name='Turma Disciplina',
+        related_name='frequencias',
+    )
+    aluno = models.ForeignKey(
+        Aluno,
+        on_delete=models.CASCADE,
+        verbose_name='Aluno',
+        related_name='frequencias',
+    )
+    aulas = models.IntegerField('Aulas', default=0)
+    presencas = models.IntegerField('Presenças', default=0)
+
+    class Meta:
+        verbose_name = 'Frequência do Aluno'
+        verbose_name_plural = 'Frequências dos Alunos'
+        unique_together = ('turma_disciplina', 'aluno')
+
+    def __str__(self):
+        return f'{self.aluno_id} - {self.turma_disciplina_id}'
+
+    @property
+    def percentual(self):
+        return 100 * self.presencas / self.aulas if self.aulas else None
+
+
+class FrequenciaProfessor(models.Model):
+    """
+    Totais das chamadas das disciplinas do professor em um período letivo.
+    Turmas sem período letivo não entram neste consolidado.
+    """
+
+    voluntario = models.ForeignKey(
+        Voluntario,
+        on_delete=models.CASCADE,
+        verbose_name='Professor',
+        related_name='frequencias',
+    )
+    periodo_letivo = models.ForeignKey(
+        PeriodoLetivo,
+        on_delete=models.CASCADE,
+        verbose_name='Período Letivo',
+        related_name='frequencias',
+    )
+    aulas = models.IntegerField('Aulas', default=0)
+    chamadas = models.IntegerField('Alunos nas chamadas', default=0)
+    presencas = models.IntegerField('Presenças', default=0)
+
+    class Meta:
+        verbose_name = 'Frequência do Professor'
+        verbose_name_plural = 'Frequências dos Professores'
+        unique_together = ('voluntario', 'periodo_letivo')
+
+    def __str__(self):
+        return f'{self.voluntario_id} - {self.periodo_letivo_id}'
+
+    @property
+    def percentual(self):
+        return 100 * self.presencas / self.chamadas if self.chamadas else None
+
+
+class Boletim(models.Model):
+    """
+    Último boletim gerado para a matrícula. O PDF fica no storage em um
+    caminho derivado do hash do conteúdo; `hash_dados` identifica os dados
+    usados, para que a próxima geração pule os boletins inalterados.
+    """
+
+    turma_aluno = models.OneToOneField(
+        TurmaAluno,
+        on_delete=models.CASCADE,
+        verbose_name='Aluno Turma',
+        related_name='boletim',
+    )
+    hash_dados = models.CharField('Hash dos dados', max_length=64)
+    arquivo = models.CharField('Arquivo', max_length=200)
+    gerado_em = models.DateTimeField('Gerado em', auto_now=True)
+
+    class Meta:
+        verbose_name = 'Boletim'
+        verbose_name_plural = 'Boletins'
+
+    def __str__(self):
+        return self.arquivo
+
+
+class Tarefa(models.Model):
+    """
+    Tarefa em segundo plano executada pelo `manage.py runworker`. Os tipos
+    disponíveis e suas funções ficam em tarefas.REGISTRO.
+    """
+
+    STATUS_CHOICES = [
+        ('PENDENTE', 'Pendente'),
+        ('EXECUTANDO', 'Executando'),
+        ('CONCLUIDA', 'Concluída'),
+        ('FALHOU', 'Falhou'),
+    ]
+
+    tipo = models.CharField('Tipo', max_length=50)
+    parametros = models.JSONField('Parâmetros', default=dict, blank=True)
+    status = models.CharField(
+        'Status', max_length=10, choices=STATUS_CHOICES, default='PENDENTE'
+    )
+    tentativas = models.PositiveIntegerField('Tentativas', default=0)
+    max_tentativas = models.PositiveIntegerField(
+        'Máximo de tentativas', default=3
+    )
+    executar_em = models.DateTimeField('Executar em', default=timezone.now)
+    progresso = models.PositiveSmallIntegerField('Progresso (%)', default=0)
+    mensagem = models.CharField('Mensagem', max_length=200, blank=True)
+    resultado = models.JSONField('Resultado', null=True, blank=True)
+    # Estado gravado pela função junto com cada parte concluída, para que
+    # uma nova tentativa continue dali em vez de refazer tudo
+    retomada = models.JSONField('Ponto de retomada', null=True, blank=True)
+    erro = models.TextField('Erro', blank=True)
+    worker = models.CharField('Worker', max_length=100, blank=True)
+    criado_por = models.ForeignKey(
+        CustomUser,
+        on_delete=models.SET_NULL,
+        verbose_name='Criado por',
+        null=True,
+        blank=True,
+    )
+    criado_em = models.DateTimeField('Criado em', auto_now_add=True)
+    atualizado_em = models.DateTimeField('Atualizado em', default=timezone.now)
+    # Último sinal do worker durante a execução (atualizar_progresso)
+    heartbeat_em = models.DateTimeField(
+        'Último heartbeat', null=True, blank=True
+    )
+    concluido_em = models.DateTimeField('Concluído em', null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'Tarefa'
+        verbose_name_plural = 'Tarefas'
+        indexes = [models.Index(fields=['status', 'executar_em'])]
+
+    def __str__(self):
+        return f'{self.tipo} #{self.pk} ({self.get_status_display()})'
+
+    @property
+    def finalizada(self):
+        return self.status in {'CONCLUIDA', 'FALHOU'}
+
+    def atualizar_progresso(
+        self, progresso=None, mensagem=None, retomada=None
+    ):
+        """
+        Grava o progresso (e o ponto de retomada) sem tocar nos demais
+        campos. Também é o heartbeat da tarefa: as funções devem chamá-lo a
+        cada lote, já que tarefas sem heartbeat por muito tempo são
+        devolvidas à fila (ver tarefas.recuperar_travadas).
+        """
+        agora = timezone.now()
+        campos = {'atualizado_em': agora, 'heartbeat_em': agora}
+        if progresso is not None:
+            campos['progresso'] = self.progresso = max(0, min(progresso, 100))
+        if mensagem is not None:
+            campos['mensagem'] = self.mensagem = mensagem[:200]
+        if retomada is not None:
+            campos['retomada'] = self.retomada = retomada
+        Tarefa.objects.filter(pk=self.pk).update(**campos)
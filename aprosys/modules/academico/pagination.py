@@ -0,0 +1,183 @@
+import base64
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Q
+
+PAGE_SIZE = 25
+MAX_PAGE_SIZE = 100
+
+
+class KeysetPage:
+    """
+    Página de resultados obtida por paginação keyset (cursor).
+
+    O cursor guarda a ordenação (coluna e direção), o valor da coluna e a
+    pk do último (ou primeiro) registro exibido, de modo que a próxima
+    página é buscada com um WHERE sobre essas colunas em vez de OFFSET. O
+    custo de cada página não depende do tamanho da tabela.
+    """
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    @property
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+def _direcao(direction):
+    return 'desc' if direction == 'desc' else 'asc'
+
+
+def encode_cursor(field, direction, value, pk):
+    payload = json.dumps(
+        [field, _direcao(direction), value, pk], cls=DjangoJSONEncoder
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, field, direction):
+    """
+    Retorna (valor, pk) do cursor ou None se ele for inválido ou tiver sido
+    gerado para outra ordenação (coluna ou direção): nesse caso a listagem
+    volta à primeira página.
+    """
+    if not cursor:
+        return None
+    try:
+        padding = '=' * (-len(cursor) % 4)
+        payload = base64.urlsafe_b64decode(cursor + padding)
+        cursor_field, cursor_direction, value, pk = json.loads(payload)
+    except (ValueError, TypeError):
+        return None
+    if (cursor_field, cursor_direction) != (field, _direcao(direction)):
+        return None
+    return value, pk
+
+
+def _after(field, value, pk):
+    # Na ordenação crescente os NULLs vêm primeiro, ou seja, NULL é tratado
+    # como o menor valor possível (ver _ordering).
+    if value is None:
+        return Q(**{f'{field}__isnull': True, 'pk__gt': pk}) | Q(
+            **{f'{field}__isnull': False}
+        )
+    return Q(**{f'{field}__gt': value}) | Q(**{field: value, 'pk__gt': pk})
+
+
+def _before(field, value, pk):
+    if value is None:
+        return Q(**{f'{field}__isnull': True, 'pk__lt': pk})
+    return (
+        Q(**{f'{field}__lt': value})
+        | Q(**{field: value, 'pk__lt': pk})
+        | Q(**{f'{field}__isnull': True})
+    )
+
+
+def _ordering(field, descending):
+    if descending:
+        return [F(field).desc(nulls_last=True), '-pk']
+    return [F(field).asc(nulls_first=True), 'pk']
+
+
+def order_keyset(queryset, field, direction='asc'):
+    """
+    Ordena o queryset exatamente como as páginas de paginate_keyset, para
+    listagens completas (ex.: exportação) saírem na mesma ordem da tela.
+    """
+    return queryset.order_by(*_ordering(field, direction == 'desc'))
+
+
+def get_page_size(request):
+    try:
+        size = int(request.GET.get('page_size', PAGE_SIZE))
+    except ValueError:
+        size = PAGE_SIZE
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+def _consulta_pagina(request, queryset, field, direction):
+    """
+    Monta, sem executar, a query da página pedida na querystring. Retorna
+    (queryset, montar), onde montar(linhas) gera a KeysetPage a partir das
+    linhas lidas, de forma síncrona ou assíncrona.
+    """
+    descending = direction == 'desc'
+    page_size = get_page_size(request)
+    queryset = queryset.annotate(_keyset_value=F(field))
+
+    after = decode_cursor(request.GET.get('after'), field, direction)
+    before = None if after else decode_cursor(
+        request.GET.get('before'), field, direction
+    )
+
+    if before:
+        # Busca para trás na ordem invertida e depois desinverte a lista
+        condition = (_after if descending else _before)(field, *before)
+        queryset = queryset.filter(condition).order_by(
+            *_ordering(field, not descending)
+        )
+    else:
+        if after:
+            condition = (_before if descending else _after)(field, *after)
+            queryset = queryset.filter(condition)
+        queryset = queryset.order_by(*_ordering(field, descending))
+
+    def montar(rows):
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if before:
+            rows = rows[::-1]
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, after is not None
+
+        next_cursor = previous_cursor = None
+        if rows and has_next:
+            last = rows[-1]
+            next_cursor = encode_cursor(
+                field, direction, last._keyset_value, last.pk
+            )
+        if rows and has_previous:
+            first = rows[0]
+            previous_cursor = encode_cursor(
+                field, direction, first._keyset_value, first.pk
+            )
+        return KeysetPage(rows, next_cursor, previous_cursor)
+
+    return queryset[: page_size + 1], montar
+
+
+def paginate_keyset(request, queryset, field, direction='asc'):
+    """
+    Pagina o queryset pela coluna `field` (+ pk como desempate) usando os
+    parâmetros `after`/`before` da querystring.
+    """
+    queryset, montar = _consulta_pagina(request, queryset, field, direction)
+    return montar(list(queryset))
+
+
+async def apaginate_keyset(request, queryset, field, direction='asc'):
+    """
+    Versão de paginate_keyset para views assíncronas.
+    """
+    queryset, montar = _consulta_pagina(request, queryset, field, direction)
+    return montar([row async for row in queryset])
@@ -0,0 +1,156 @@
+"""
+Gerador mínimo de PDF (texto e linhas com as fontes Helvetica padrão do
+PDF), sem dependências externas.
+
+Este módulo não importa Django: as funções de renderização rodam nos
+processos do pool de boletins.gerar_boletins e recebem apenas dados simples.
+"""
+
+A4 = (595, 842)
+MARGEM = 50
+
+
+def _escapar(texto):
+    texto = str(texto)
+    for char in ('\\', '(', ')'):
+        texto = texto.replace(char, '\\' + char)
+    # WinAnsiEncoding (cp1252) cobre os acentos do português
+    return texto.encode('cp1252', errors='replace')
+
+
+class DocumentoPDF:
+    """
+    Documento A4 montado por comandos de desenho. O resultado é
+    determinístico (sem datas de criação), então os mesmos dados geram os
+    mesmos bytes.
+    """
+
+    def __init__(self):
+        self.paginas = []
+        self.nova_pagina()
+
+    def nova_pagina(self):
+        self.paginas.append([])
+
+    def texto(self, x, y, texto, tamanho=10, negrito=False):
+        fonte = b'/F2' if negrito else b'/F1'
+        self.paginas[-1].append(
+            b'BT %s %d Tf %.2f %.2f Td (%s) Tj ET'
+            % (fonte, tamanho, x, y, _escapar(texto))
+        )
+
+    def linha(self, x1, y1, x2, y2, espessura=0.5):
+        self.paginas[-1].append(
+            b'%.2f w %.2f %.2f m %.2f %.2f l S'
+            % (espessura, x1, y1, x2, y2)
+        )
+
+    def gerar(self):
+        largura, altura = A4
+        objetos = [
+            b'<< /Type /Catalog /Pages 2 0 R >>',
+            None,  # Pages, preenchido depois de numerar as páginas
+            b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica '
+            b'/Encoding /WinAnsiEncoding >>',
+            b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold '
+            b'/Encoding /WinAnsiEncoding >>',
+        ]
+        kids = []
+        for comandos in self.paginas:
+            conteudo = b'\n'.join(comandos)
+            objetos.append(
+                b'<< /Length %d >>\nstream\n%s\nendstream'
+                % (len(conteudo), conteudo)
+            )
+            objetos.append(
+                b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] '
+                b'/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> '
+                b'/Contents %d 0 R >>' % (largura, altura, len(objetos))
+            )
+            kids.append(b'%d 0 R' % len(objetos))
+        objetos[1] = b'<< /Type /Pages /Kids [%s] /Count %d >>' % (
+            b' '.join(kids),
+            len(kids),
+        )
+
+        saida = bytearray(b'%PDF-1.4\n')
+        offsets = []
+        for numero, objeto in enumerate(objetos, start=1):
+            offsets.append(len(saida))
+            saida += b'%d 0 obj\n%s\nendobj\n' % (numero, objeto)
+        xref = len(saida)
+        saida += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objetos) + 1)
+        for offset in offsets:
+            saida += b'%010d 00000 n \n' % offset
+        saida += (
+            b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n'
+            % (len(objetos) + 1, xref)
+        )
+        return bytes(saida)
+
+
+def _percentual(presencas, aulas):
+    if not aulas:
+        return '-'
+    return f'{100 * presencas / aulas:.1f}%'.replace('.', ',')
+
+
+def renderizar_boletim(dados):
+    """
+    Gera o PDF do boletim a partir do dicionário montado por
+    boletins.dados_boletins.
+    """
+    doc = DocumentoPDF()
+    largura, altura = A4
+    y = altura - MARGEM
+
+    doc.texto(MARGEM, y, 'Aprova System', 10)
+    y -= 28
+    doc.texto(MARGEM, y, 'Boletim de Frequência', 18, negrito=True)
+    y -= 30
+    for rotulo, valor in (
+        ('Aluno', dados['aluno']),
+        ('E-mail', dados['email']),
+        ('Turma', dados['turma']),
+        ('Curso', dados['curso'] or '-'),
+        ('Período letivo', dados['periodo']),
+    ):
+        doc.texto(MARGEM, y, f'{rotulo}:', 11, negrito=True)
+        doc.texto(MARGEM + 95, y, valor, 11)
+        y -= 16
+
+    colunas = (MARGEM, 330, 400, 480)
+    y -= 14
+    for x, titulo in zip(
+        colunas, ('Disciplina', 'Aulas', 'Presenças', 'Frequência')
+    ):
+        doc.texto(x, y, titulo, 11, negrito=True)
+    y -= 6
+    doc.linha(MARGEM, y, largura - MARGEM, y, 1)
+
+    for disciplina in dados['disciplinas']:
+        y -= 16
+        if y < MARGEM + 40:
+            doc.nova_pagina()
+            y = altura - MARGEM
+        valores = (
+            disciplina['nome'],
+            disciplina['aulas'],
+            disciplina['presencas'],
+            _percentual(disciplina['presencas'], disciplina['aulas']),
+        )
+        for x, valor in zip(colunas, valores):
+            doc.texto(x, y, valor, 10)
+
+    y -= 10
+    doc.linha(MARGEM, y, largura - MARGEM, y, 1)
+    y -= 18
+    doc.texto(MARGEM, y, 'Frequência geral', 11, negrito=True)
+    doc.texto(
+        colunas[3],
+        y,
+        _percentual(dados['presencas'], dados['aulas']),
+        11,
+        negrito=True,
+    )
+    return doc.gerar()
@@ -0,0 +1,102 @@
+import uuid
+
+from django.core.cache import cache
+
+SESSION_KEY = '_perfil_voluntario'
+
+
+class Perfil:
+    """
+    Papel e dados de saudação do usuário logado, guardados na sessão.
+    """
+
+    def __init__(self, tipo_voluntario=None, nome=''):
+        self.tipo_voluntario = tipo_voluntario
+        self.nome = nome
+
+    @property
+    def is_professor(self):
+        return self.tipo_voluntario == 'PROFESSOR'
+
+    def __bool__(self):
+        return self.tipo_voluntario is not None
+
+
+def _versao_key(user_id):
+    return f'academico:perfil:versao:{user_id}'
+
+
+def versao_perfil(user_id):
+    """
+    Retorna o carimbo de versão do perfil do usuário. Se o cache tiver sido
+    limpo, um novo carimbo é gerado e todas as sessões recarregam o perfil.
+    """
+    key = _versao_key(user_id)
+    versao = cache.get(key)
+    if versao is None:
+        versao = uuid.uuid4().hex
+        cache.set(key, versao, None)
+    return versao
+
+
+async def aversao_perfil(user_id):
+    key = _versao_key(user_id)
+    versao = await cache.aget(key)
+    if versao is None:
+        versao = uuid.uuid4().hex
+        await cache.aset(key, versao, None)
+    return versao
+
+
+def invalidar_perfil(user_id):
+    cache.delete(_versao_key(user_id))
+
+
+def _perfil_do_usuario(user):
+    # O VoluntarioBackend já trouxe o voluntário junto com o usuário, então
+    # este acesso não gera query.
+    voluntario = getattr(user, 'voluntario', None)
+    if voluntario is None:
+        return Perfil()
+    return Perfil(voluntario.tipo_voluntario, voluntario.nome)
+
+
+def _dados_sessao(perfil, versao):
+    return {
+        'versao': versao,
+        'tipo_voluntario': perfil.tipo_voluntario,
+        'nome': perfil.nome,
+    }
+
+
+def get_perfil(request):
+    user = request.user
+    if not user.is_authenticated:
+        return Perfil()
+
+    versao = versao_perfil(user.pk)
+    dados = request.session.get(SESSION_KEY)
+    if dados and dados.get('versao') == versao:
+        return Perfil(dados['tipo_voluntario'], dados['nome'])
+
+    perfil = _perfil_do_usuario(user)
+    request.session[SESSION_KEY] = _dados_sessao(perfil, versao)
+    return perfil
+
+
+async def aget_perfil(request):
+    """
+    Versão de get_perfil para requisições assíncronas (ASGI).
+    """
+    user = await request.auser()
+    if not user.is_authenticated:
+        return Perfil()
+
+    versao = await aversao_perfil(user.pk)
+    dados = await request.session.aget(SESSION_KEY)
+    if dados and dados.get('versao') == versao:
+        return Perfil(dados['tipo_voluntario'], dados['nome'])
+
+    perfil = _perfil_do_usuario(user)
+    await request.session.aset(SESSION_KEY, _dados_sessao(perfil, versao))
+    return perfil
@@ -0,0 +1,409 @@
+"""
+Registro de presença por aula.
+
+Cada Aula guarda a chamada inteira em dois bitmaps indexados pela ordem de
+matrícula (TurmaAluno.ordem): um ano de aulas de uma turma de 40 alunos
+ocupa algumas centenas de linhas de poucos bytes, em vez de milhares de
+linhas aluno × aula. A chamada de uma turma é gravada com um único
+INSERT ... ON CONFLICT DO UPDATE.
+
+Os relatórios de frequência leem FrequenciaAluno e FrequenciaProfessor,
+que são atualizados na mesma transação da chamada, somando apenas a
+diferença entre a chamada anterior e a nova.
+"""
+
+from collections import defaultdict
+from functools import reduce
+from operator import or_
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+
+from .conditional import bump_versao
+from .models import (
+    Aula,
+    FrequenciaAluno,
+    FrequenciaProfessor,
+    TurmaAluno,
+    TurmaDisciplina,
+    TurmaDisciplinaProfessor,
+)
+
+
+class Bitmap:
+    """
+    Conjunto de inteiros não negativos empacotado em bytes (bit i no byte
+    i // 8, posição i % 8).
+    """
+
+    def __init__(self, data=b''):
+        self.data = bytearray(data or b'')
+
+    @classmethod
+    def from_indices(cls, indices):
+        bitmap = cls()
+        for indice in indices:
+            bitmap.add(indice)
+        return bitmap
+
+    def add(self, indice):
+        byte, bit = divmod(indice, 8)
+        if byte >= len(self.data):
+            self.data.extend(bytes(byte + 1 - len(self.data)))
+        self.data[byte] |= 1 << bit
+
+    def __contains__(self, indice):
+        byte, bit = divmod(indice, 8)
+        return byte < len(self.data) and bool(self.data[byte] & (1 << bit))
+
+    def __iter__(self):
+        for byte, valor in enumerate(self.data):
+            resto = valor
+            while resto:
+                menor = resto & -resto
+                yield byte * 8 + menor.bit_length() - 1
+                resto ^= menor
+
+    def __len__(self):
+        return int.from_bytes(self.data, 'little').bit_count()
+
+    def __bytes__(self):
+        return bytes(self.data)
+
+
+def lista_chamada(turma_id):
+    """
+    Alunos com matrícula ativa na turma, na ordem de matrícula, como tuplas
+    (ordem, aluno_id, nome do aluno).
+    """
+    return list(
+        TurmaAluno.objects.filter(turma_id=turma_id, status=1)
+        .order_by('ordem')
+        .values_list('ordem', 'aluno_id', 'aluno__nome')
+    )
+
+
+def montar_aula(turma_disciplina, data, chamada, presentes, **campos):
+    """
+    Cria (sem gravar) a Aula com os bitmaps da chamada. `chamada` e
+    `presentes` são coleções de TurmaAluno.ordem; presentes fora da chamada
+    são ignorados.
+    """
+    chamada = Bitmap.from_indices(chamada)
+    presentes = Bitmap.from_indices(o for o in presentes if o in chamada)
+    return Aula(
+        turma_disciplina=turma_disciplina,
+        data=data,
+        chamada=bytes(chamada),
+        presentes=bytes(presentes),
+        total_chamada=len(chamada),
+        total_presentes=len(presentes),
+        **campos,
+    )
+
+
+def registrar_aulas(aulas):
+    """
+    Grava as aulas em um único upsert (a aula do mesmo dia da mesma
+    turma/disciplina é sobrescrita) e atualiza os consolidados de frequência.
+    """
+    with transaction.atomic():
+        anteriores = _aulas_existentes(aulas)
+        Aula.objects.bulk_create(
+            aulas,
+            update_conflicts=True,
+            unique_fields=['turma_disciplina', 'data'],
+            update_fields=[
+                'conteudo',
+                'chamada',
+                'presentes',
+                'total_chamada',
+                'total_presentes',
+                'registrado_por',
+                'atualizado_em',
+            ],
+        )
+        atualizar_frequencias([
+            (anteriores.get((aula.turma_disciplina_id, aula.data)), aula)
+            for aula in aulas
+        ])
+    # bulk_create não dispara signals
+    bump_versao(Aula)
+    return aulas
+
+
+def _aulas_existentes(aulas):
+    filtro = reduce(or_, (
+        Q(turma_disciplina_id=aula.turma_disciplina_id, data=aula.data)
+        for aula in aulas
+    ))
+    existentes = Aula.objects.select_for_update().filter(filtro).only(
+        'turma_disciplina_id',
+        'data',
+        'chamada',
+        'presentes',
+        'total_chamada',
+        'total_presentes',
+    )
+    return {(a.turma_disciplina_id, a.data): a for a in existentes}
+
+
+#region --- CONSOLIDADOS DE FREQUÊNCIA ---
+
+def _contexto(turma_disciplina_ids=None):
+    """
+    Dados necessários para atribuir as chamadas: turma e período de cada
+    turma/disciplina, aluno de cada (turma, ordem) e professores de cada
+    turma/disciplina. Sem `turma_disciplina_ids`, carrega todas.
+    """
+    turma_disciplinas = TurmaDisciplina.objects.all()
+    matriculas = TurmaAluno.objects.all()
+    vinculos = TurmaDisciplinaProfessor.objects.filter(status=1)
+    if turma_disciplina_ids is not None:
+        turma_disciplinas = turma_disciplinas.filter(
+            pk__in=turma_disciplina_ids
+        )
+        matriculas = matriculas.filter(
+            turma__turmadisciplina__in=turma_disciplina_ids
+        )
+        vinculos = vinculos.filter(
+            turma_disciplina_id__in=turma_disciplina_ids
+        )
+
+    turmas = {
+        td_id: (turma_id, periodo_id)
+        for td_id, turma_id, periodo_id in turma_disciplinas.values_list(
+            'pk', 'turma_id', 'turma__periodo_letivo_id'
+        )
+    }
+    alunos = {
+        (turma_id, ordem): aluno_id
+        for turma_id, ordem, aluno_id in matriculas.values_list(
+            'turma_id', 'ordem', 'aluno_id'
+        )
+    }
+    professores = defaultdict(list)
+    for td_id, voluntario_id in vinculos.values_list(
+        'turma_disciplina_id', 'voluntario_id'
+    ):
+        professores[td_id].append(voluntario_id)
+    return turmas, alunos, professores
+
+
+def _bits(aula):
+    if aula is None:
+        return Bitmap(), Bitmap()
+    return Bitmap(aula.chamada), Bitmap(aula.presentes)
+
+
+def _deltas_alunos(pares, turmas, matriculas):
+    deltas = defaultdict(lambda: [0, 0])
+    for antiga, nova in pares:
+        td_id = (nova or antiga).turma_disciplina_id
+        turma_id, _ = turmas[td_id]
+        chamada_antes, presentes_antes = _bits(antiga)
+        chamada_depois, presentes_depois = _bits(nova)
+        for ordem in {*chamada_antes, *chamada_depois}:
+            aluno_id = matriculas.get((turma_id, ordem))
+            if aluno_id is None:
+                continue
+            delta = deltas[(td_id, aluno_id)]
+            delta[0] += (ordem in chamada_depois) - (ordem in chamada_antes)
+            delta[1] += (ordem in presentes_depois) - (
+                ordem in presentes_antes
+            )
+    return deltas
+
+
+def _totais(aula):
+    if aula is None:
+        return 0, 0, 0
+    return 1, aula.total_chamada, aula.total_presentes
+
+
+def _deltas_professores(pares, turmas, professores):
+    deltas = defaultdict(lambda: [0, 0, 0])
+    for antiga, nova in pares:
+        td_id = (nova or antiga).turma_disciplina_id
+        _, periodo_id = turmas[td_id]
+        if periodo_id is None:
+            continue
+        delta_aula = [
+            depois - antes
+            for antes, depois in zip(_totais(antiga), _totais(nova))
+        ]
+        for voluntario_id in professores[td_id]:
+            delta = deltas[(voluntario_id, periodo_id)]
+            for i, valor in enumerate(delta_aula):
+                delta[i] += valor
+    return deltas
+
+
+def atualizar_frequencias(pares):
+    """
+    Aplica aos consolidados a diferença entre cada par (aula anterior, aula
+    nova); um dos lados é None quando a aula foi criada ou excluída. As
+    aulas contam para os professores vinculados hoje à turma/disciplina,
+    como em reconstruir_frequencias.
+    """
+    pares = [(antiga, nova) for antiga, nova in pares if antiga or nova]
+    if not pares:
+        return
+    turmas, matriculas, professores = _contexto(
+        {(nova or antiga).turma_disciplina_id for antiga, nova in pares}
+    )
+    pares = [
+        (antiga, nova)
+        for antiga, nova in pares
+        if (nova or antiga).turma_disciplina_id in turmas
+    ]
+
+    # Linhas novas só são criadas quando alguma aula foi gravada; na
+    # exclusão apenas as existentes são ajustadas.
+    criar = any(nova is not None for _, nova in pares)
+    _aplicar(
+        FrequenciaAluno,
+        ('turma_disciplina_id', 'aluno_id'),
+        ('aulas', 'presencas'),
+        _deltas_alunos(pares, turmas, matriculas),
+        criar,
+    )
+    _aplicar(
+        FrequenciaProfessor,
+        ('voluntario_id', 'periodo_letivo_id'),
+        ('aulas', 'chamadas', 'presencas'),
+        _deltas_professores(pares, turmas, professores),
+        criar,
+    )
+    bump_versao(FrequenciaAluno)
+    bump_versao(FrequenciaProfessor)
+
+
+def _aplicar(model, chaves, campos, deltas, criar):
+    deltas = {k: v for k, v in deltas.items() if any(v)}
+    if not deltas:
+        return
+    if criar:
+        model.objects.bulk_create(
+            [model(**dict(zip(chaves, chave))) for chave in deltas],
+            ignore_conflicts=True,
+        )
+    # Um UPDATE ... SET campo = campo + delta por combinação de (primeira
+    # chave, deltas): os incrementos são atômicos no banco.
+    grupos = defaultdict(list)
+    for (primeira, segunda), valores in deltas.items():
+        grupos[(primeira, tuple(valores))].append(segunda)
+    for (primeira, valores), segundas in grupos.items():
+        model.objects.filter(
+            **{chaves[0]: primeira, f'{chaves[1]}__in': segundas}
+        ).update(**{
+            campo: F(campo) + valor for campo, valor in zip(campos, valores)
+        })
+
+
+def recalcular_professores(pares):
+    """
+    Recalcula a partir das aulas os consolidados dos pares (voluntario_id,
+    periodo_letivo_id). Usado quando os professores de uma turma/disciplina
+    mudam: as aulas dela passam a contar para os professores vinculados,
+    como em reconstruir_frequencias.
+    """
+    pares = {(v, p) for v, p in pares if v is not None and p is not None}
+    if not pares:
+        return
+    vinculo = 'turma_disciplina__turmadisciplinaprofessor'
+    periodo = 'turma_disciplina__turma__periodo_letivo_id'
+    totais = (
+        Aula.objects.filter(**{
+            f'{vinculo}__voluntario_id__in': {v for v, _ in pares},
+            f'{vinculo}__status': 1,
+            f'{periodo}__in': {p for _, p in pares},
+        })
+        .values_list(f'{vinculo}__voluntario_id', periodo)
+        .annotate(
+            Count('pk'), Sum('total_chamada'), Sum('total_presentes')
+        )
+    )
+    with transaction.atomic():
+        FrequenciaProfessor.objects.filter(reduce(or_, (
+            Q(voluntario_id=v, periodo_letivo_id=p) for v, p in pares
+        ))).delete()
+        FrequenciaProfessor.objects.bulk_create(
+            FrequenciaProfessor(
+                voluntario_id=voluntario_id,
+                periodo_letivo_id=periodo_id,
+                aulas=aulas,
+                chamadas=chamadas,
+                presencas=presencas,
+            )
+            for voluntario_id, periodo_id, aulas, chamadas, presencas in totais
+            if (voluntario_id, periodo_id) in pares
+        )
+    bump_versao(FrequenciaProfessor)
+
+
+def reconstruir_frequencias(chunk_size=2000):
+    """
+    Recalcula os consolidados a partir de todas as aulas. Retorna o número
+    de linhas (alunos, professores) gravadas.
+    """
+    with transaction.atomic():
+        turmas, matriculas, professores = _contexto()
+        alunos = defaultdict(lambda: [0, 0])
+        totais = defaultdict(lambda: [0, 0, 0])
+        linhas = Aula.objects.values_list(
+            'turma_disciplina_id',
+            'chamada',
+            'presentes',
+            'total_chamada',
+            'total_presentes',
+        ).iterator(chunk_size=chunk_size)
+        for td_id, chamada, bits_presentes, total_ch, total_pr in linhas:
+            turma_id, periodo_id = turmas[td_id]
+            presentes = Bitmap(bits_presentes)
+            for ordem in Bitmap(chamada):
+                aluno_id = matriculas.get((turma_id, ordem))
+                if aluno_id is not None:
+                    contagem = alunos[(td_id, aluno_id)]
+                    contagem[0] += 1
+                    contagem[1] += ordem in presentes
+            if periodo_id is None:
+                continue
+            for voluntario_id in professores[td_id]:
+                contagem = totais[(voluntario_id, periodo_id)]
+                contagem[0] += 1
+                contagem[1] += total_ch
+                contagem[2] += total_pr
+
+        FrequenciaAluno.objects.all().delete()
+        FrequenciaProfessor.objects.all().delete()
+        FrequenciaAluno.objects.bulk_create(
+            (
+                FrequenciaAluno(
+                    turma_disciplina_id=td_id,
+                    aluno_id=aluno_id,
+                    aulas=aulas,
+                    presencas=presencas,
+                )
+                for (td_id, aluno_id), (aulas, presencas) in alunos.items()
+            ),
+            batch_size=chunk_size,
+        )
+        FrequenciaProfessor.objects.bulk_create(
+            (
+                FrequenciaProfessor(
+                    voluntario_id=voluntario_id,
+                    periodo_letivo_id=periodo_id,
+                    aulas=aulas,
+                    chamadas=chamadas,
+                    presencas=presencas,
+                )
+                for (voluntario_id, periodo_id), (
+                    aulas, chamadas, presencas
+                ) in totais.items()
+            ),
+            batch_size=chunk_size,
+        )
+    return len(alunos), len(totais)
+
+#endregion ---
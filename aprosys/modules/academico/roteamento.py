@@ -0,0 +1,181 @@
+"""
+Roteamento de leituras para a réplica do banco (settings.DATABASES
+['replica'], opcional).
+
+As listagens de pesquisa e os relatórios são marcados com
+@leitura_replica; só as queries feitas dentro deles, e só as dos models do
+app, vão para a réplica. Todo o resto, incluindo as escritas, usa o
+primário ('default'). Depois de um POST (ou outro método que altera dados)
+a sessão fica REPLICA_ATRASO_MAXIMO segundos lendo do primário, para que o
+usuário veja o que acabou de gravar mesmo com a réplica atrasada.
+
+Sem a réplica configurada, tudo continua no 'default'.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+REPLICA = 'replica'
+SESSAO_ULTIMA_ESCRITA = '_academico_ultima_escrita'
+METODOS_SEGUROS = ('GET', 'HEAD', 'OPTIONS')
+
+# Vale para a thread (WSGI) ou a task (ASGI) atual; o sync_to_async copia o
+# contexto, então as queries das views async também são roteadas.
+_ler_da_replica = ContextVar('academico_ler_da_replica', default=False)
+
+
+def replica_configurada():
+    return REPLICA in settings.DATABASES
+
+
+@contextmanager
+def usar_replica(ativo=True):
+    """
+    Leituras dos models do app dentro do bloco vão para a réplica (ou, com
+    ativo=False, ficam no primário mesmo dentro de uma view marcada).
+    """
+    token = _ler_da_replica.set(ativo)
+    try:
+        yield
+    finally:
+        _ler_da_replica.reset(token)
+
+
+def usar_primario():
+    return usar_replica(False)
+
+
+def _gravou_recentemente(ultima_escrita):
+    atraso = getattr(settings, 'REPLICA_ATRASO_MAXIMO', 10)
+    return time.time() - (ultima_escrita or 0) < atraso
+
+
+def _pode_usar_replica(request):
+    return (
+        replica_configurada()
+        and request.method in METODOS_SEGUROS
+        and not _gravou_recentemente(
+            request.session.get(SESSAO_ULTIMA_ESCRITA)
+        )
+    )
+
+
+async def _apode_usar_replica(request):
+    return (
+        replica_configurada()
+        and request.method in METODOS_SEGUROS
+        and not _gravou_recentemente(
+            await request.session.aget(SESSAO_ULTIMA_ESCRITA)
+        )
+    )
+
+
+def _iterar_na_replica(conteudo):
+    # O corpo das respostas em streaming é gerado depois que a view
+    # retorna; cada pedaço é produzido com o roteamento ligado.
+    iterador = iter(conteudo)
+    while True:
+        with usar_replica():
+            try:
+                parte = next(iterador)
+            except StopIteration:
+                return
+        yield parte
+
+
+def leitura_replica(view_func):
+    """
+    Decorator das views somente leitura (pesquisas e relatórios) cujas
+    queries podem ir para a réplica.
+
+    Deve ser o decorator mais interno: o usuário e as checagens de acesso
+    (login_required, role_required) continuam lidos do primário.
+    """
+
+    if iscoroutinefunction(view_func):
+
+        @wraps(view_func)
+        async def _async_wrapped(request, *args, **kwargs):
+            if not await _apode_usar_replica(request):
+                return await view_func(request, *args, **kwargs)
+            with usar_replica():
+                return await view_func(request, *args, **kwargs)
+
+        return _async_wrapped
+
+    @wraps(view_func)
+    def _wrapped(request, *args, **kwargs):
+        if not _pode_usar_replica(request):
+            return view_func(request, *args, **kwargs)
+        with usar_replica():
+            response = view_func(request, *args, **kwargs)
+        if response.streaming and not response.is_async:
+            response.streaming_content = _iterar_na_replica(
+                response.streaming_content
+            )
+        return response
+
+    return _wrapped
+
+
+def _deve_marcar(request):
+    # Sem réplica não há atraso a compensar; depois do logout não há sessão
+    # a fixar no primário.
+    user = getattr(request, 'user', None)
+    return (
+        replica_configurada()
+        and request.method not in METODOS_SEGUROS
+        and hasattr(request, 'session')
+        and user is not None
+        and user.is_authenticated
+    )
+
+
+def marcar_escrita(request, response):
+    """
+    Guarda na sessão o horário das requisições que podem ter gravado dados
+    (chamado pelo ReplicaMiddleware).
+    """
+    if _deve_marcar(request):
+        request.session[SESSAO_ULTIMA_ESCRITA] = time.time()
+
+
+async def amarcar_escrita(request, response):
+    if _deve_marcar(request):
+        await request.session.aset(SESSAO_ULTIMA_ESCRITA, time.time())
+
+
+class ReplicaRouter:
+    """
+    Leituras marcadas (usar_replica/@leitura_replica) dos models do app vão
+    para a réplica; escritas e migrations ficam no primário.
+    """
+
+    def db_for_read(self, model, **hints):  # noqa: PLR6301 (hook do Django)
+        if (
+            _ler_da_replica.get()
+            and model._meta.app_label == 'academico'
+            and replica_configurada()
+        ):
+            return REPLICA
+        return None
+
+    def db_for_write(self, model, **hints):  # noqa: PLR6301 (hook do Django)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(  # noqa: PLR6301 (hook do Django)
+        self, obj1, obj2, **hints
+    ):
+        # Réplica e primário têm os mesmos dados
+        return True
+
+    def allow_migrate(  # noqa: PLR6301 (hook do Django)
+        self, db, app_label, model_name=None, **hints
+    ):
+        return db != REPLICA
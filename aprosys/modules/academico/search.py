@@ -0,0 +1,159 @@
+import unicodedata
+
+from django.db import DatabaseError, connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+# O tokenizer trigram do FTS5 só indexa termos com 3 ou mais caracteres.
+# Termos menores caem no LIKE simples sobre a coluna `busca`.
+MIN_TRIGRAM = 3
+
+# Cache, por alias de banco, das tabelas FTS existentes.
+_fts_tables = {}
+
+
+def normalizar(texto):
+    """
+    Remove acentos, converte para minúsculas e colapsa espaços, de modo que
+    "João" e "joao" gerem o mesmo texto de busca.
+    """
+    if not texto:
+        return ''
+    decomposto = unicodedata.normalize('NFKD', str(texto))
+    sem_acentos = ''.join(
+        c for c in decomposto if not unicodedata.combining(c)
+    )
+    return ' '.join(sem_acentos.casefold().split())
+
+
+def fts_table(model):
+    return f'{model._meta.db_table}_busca'
+
+
+def _sqlite_has_fts5(cursor):
+    try:
+        cursor.execute(
+            "CREATE VIRTUAL TABLE temp._fts5_probe USING fts5("
+            "x, tokenize='trigram')"
+        )
+        cursor.execute('DROP TABLE temp._fts5_probe')
+    except DatabaseError:
+        return False
+    return True
+
+
+def _sqlite_install(cursor, model, existing_tables):
+    table = model._meta.db_table
+    pk = model._meta.pk.column
+    fts = fts_table(model)
+
+    cursor.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'trigger' "
+        'AND tbl_name = %s',
+        [table],
+    )
+    triggers = {row[0] for row in cursor.fetchall()}
+    expected = {f'{fts}_ai', f'{fts}_ad', f'{fts}_au'}
+    if fts in existing_tables and expected <= triggers:
+        return
+
+    # Alterações de schema no SQLite recriam a tabela e descartam os
+    # triggers; nesse caso o índice é recriado e reconstruído do zero.
+    cursor.execute(f'DROP TABLE IF EXISTS "{fts}"')
+    cursor.execute(
+        f'CREATE VIRTUAL TABLE "{fts}" USING fts5('
+        f"busca, content='{table}', content_rowid='{pk}', "
+        "tokenize='trigram')"
+    )
+    cursor.execute(
+        f'CREATE TRIGGER IF NOT EXISTS "{fts}_ai" AFTER INSERT ON "{table}" '
+        f'BEGIN INSERT INTO "{fts}"(rowid, busca) '
+        f'VALUES (new."{pk}", new.busca); END'
+    )
+    cursor.execute(
+        f'CREATE TRIGGER IF NOT EXISTS "{fts}_ad" AFTER DELETE ON "{table}" '
+        f'BEGIN INSERT INTO "{fts}"("{fts}", rowid, busca) '
+        f"VALUES ('delete', old.\"{pk}\", old.busca); END"
+    )
+    cursor.execute(
+        f'CREATE TRIGGER IF NOT EXISTS "{fts}_au" AFTER UPDATE ON "{table}" '
+        f'BEGIN INSERT INTO "{fts}"("{fts}", rowid, busca) '
+        f"VALUES ('delete', old.\"{pk}\", old.busca); "
+        f'INSERT INTO "{fts}"(rowid, busca) '
+        f'VALUES (new."{pk}", new.busca); END'
+    )
+    cursor.execute(f"""INSERT INTO "{fts}"("{fts}") VALUES ('rebuild')""")
+
+
+def _postgresql_install(cursor, model):
+    table = model._meta.db_table
+    cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    cursor.execute(
+        f'CREATE INDEX IF NOT EXISTS "{table}_busca_trgm" '
+        f'ON "{table}" USING gin (busca gin_trgm_ops)'
+    )
+
+
+def instalar_indices_busca(models, using='default'):
+    """
+    Cria (ou recria, se necessário) o índice de texto da coluna `busca`:
+    FTS5 com tokenizer trigram no SQLite e GIN pg_trgm no PostgreSQL.
+    Nos demais bancos a busca usa apenas LIKE sobre `busca`.
+    """
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            if not _sqlite_has_fts5(cursor):
+                return
+            existing = set(connection.introspection.table_names(cursor))
+            for model in models:
+                _sqlite_install(cursor, model, existing)
+        elif connection.vendor == 'postgresql':
+            for model in models:
+                _postgresql_install(cursor, model)
+    _fts_tables.pop(using, None)
+
+
+def _has_fts(model, using):
+    if using not in _fts_tables:
+        connection = connections[using]
+        if connection.vendor != 'sqlite':
+            _fts_tables[using] = set()
+        else:
+            _fts_tables[using] = {
+                t
+                for t in connection.introspection.table_names()
+                if t.endswith('_busca')
+            }
+    return fts_table(model) in _fts_tables[using]
+
+
+def filtro_busca(model, q, using='default'):
+    """
+    Retorna um Q que encontra os registros de `model` cujo texto de busca
+    contém todos os termos de `q`, ignorando acentos e maiúsculas.
+    """
+    termos = normalizar(q).split()
+    filtro = Q()
+    if not termos:
+        return filtro
+
+    longos = [t for t in termos if len(t) >= MIN_TRIGRAM]
+    curtos = [t for t in termos if len(t) < MIN_TRIGRAM]
+
+    if longos and _has_fts(model, using):
+        fts = fts_table(model)
+        match = ' AND '.join(
+            '"{}"'.format(t.replace('"', '""')) for t in longos
+        )
+        filtro &= Q(
+            pk__in=RawSQL(
+                f'SELECT rowid FROM "{fts}" WHERE "{fts}" MATCH %s', (match,)
+            )
+        )
+    else:
+        curtos = termos
+
+    for termo in curtos:
+        filtro &= Q(busca__contains=termo)
+    return filtro
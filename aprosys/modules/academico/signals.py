@@ -0,0 +1,188 @@
+from django.db.models import QuerySet
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from .conditional import bump_versao
+from .dashboard import invalidar_estatisticas
+from .imagens import apagar_miniaturas, gerar_miniaturas
+from .models import (
+    Aula,
+    CustomUser,
+    TurmaAluno,
+    TurmaDisciplina,
+    TurmaDisciplinaProfessor,
+    Voluntario,
+)
+from .perfil import invalidar_perfil
+from .presenca import atualizar_frequencias, recalcular_professores
+from .visibility import invalidar_visibilidade
+
+#region --- VERSÕES PARA GET CONDICIONAL ---
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def bump_versao_model(sender, **kwargs):
+    # CustomUser fica de fora: o last_login muda a cada login e invalidaria
+    # todas as páginas sem alterar nenhum dado exibido nas listagens.
+    if sender._meta.app_label == 'academico' and sender is not CustomUser:
+        bump_versao(sender)
+
+
+@receiver(m2m_changed)
+def bump_versao_m2m(sender, instance, action, **kwargs):
+    if action.startswith('post_') and instance._meta.app_label == 'academico':
+        bump_versao(type(instance))
+
+#endregion ---
+
+#region --- PERFIL DO VOLUNTÁRIO ---
+
+
+@receiver(post_save, sender=Voluntario)
+@receiver(post_delete, sender=Voluntario)
+def invalidar_perfil_voluntario(sender, instance, **kwargs):
+    invalidar_perfil(instance.pk)
+
+#endregion ---
+
+#region --- MINIATURAS DA FOTO DO VOLUNTÁRIO ---
+
+
+@receiver(pre_save, sender=Voluntario)
+def guardar_foto_anterior(sender, instance, **kwargs):
+    instance._foto_anterior = ''
+    if instance.pk is not None:
+        instance._foto_anterior = (
+            sender.objects.filter(pk=instance.pk)
+            .values_list('foto', flat=True)
+            .first()
+        ) or ''
+
+
+@receiver(post_save, sender=Voluntario)
+def atualizar_miniaturas(sender, instance, **kwargs):
+    # Só quando a foto muda; salvar o cadastro sem trocar a foto não
+    # reprocessa a imagem.
+    anterior = getattr(instance, '_foto_anterior', '')
+    atual = instance.foto.name or ''
+    if atual == anterior:
+        return
+    if atual:
+        gerar_miniaturas(atual)
+    if anterior:
+        apagar_miniaturas(anterior)
+
+
+@receiver(post_delete, sender=Voluntario)
+def apagar_miniaturas_voluntario(sender, instance, **kwargs):
+    if instance.foto:
+        apagar_miniaturas(instance.foto.name)
+
+#endregion ---
+
+#region --- VISIBILIDADE E DASHBOARD DO PROFESSOR ---
+
+
+def _professores_da_turma(turma_id):
+    return set(
+        TurmaDisciplinaProfessor.objects.filter(
+            turma_disciplina__turma_id=turma_id
+        ).values_list('voluntario_id', flat=True)
+    )
+
+
+def _professores_afetados(instance):
+    if isinstance(instance, TurmaDisciplinaProfessor):
+        return {instance.voluntario_id}
+    if isinstance(instance, TurmaDisciplina):
+        return set(
+            TurmaDisciplinaProfessor.objects.filter(
+                turma_disciplina_id=instance.pk
+            ).values_list('voluntario_id', flat=True)
+        )
+    return _professores_da_turma(instance.turma_id)
+
+
+@receiver(pre_save, sender=TurmaDisciplinaProfessor)
+@receiver(pre_save, sender=TurmaAluno)
+def guardar_vinculo_anterior(sender, instance, **kwargs):
+    # Se o vínculo trocar de professor/turma, o dono anterior também precisa
+    # ter o cache invalidado.
+    instance._professores_anteriores = set()
+    if instance.pk is None:
+        return
+    anterior = sender.objects.filter(pk=instance.pk).first()
+    if anterior is not None:
+        instance._professores_anteriores = _professores_afetados(anterior)
+
+
+@receiver(post_save, sender=TurmaDisciplinaProfessor)
+@receiver(post_save, sender=TurmaDisciplina)
+@receiver(post_save, sender=TurmaAluno)
+@receiver(post_delete, sender=TurmaDisciplinaProfessor)
+@receiver(post_delete, sender=TurmaDisciplina)
+@receiver(post_delete, sender=TurmaAluno)
+def invalidar_caches_professores(sender, instance, **kwargs):
+    afetados = _professores_afetados(instance)
+    afetados |= getattr(instance, '_professores_anteriores', set())
+    invalidar_visibilidade(afetados)
+    invalidar_estatisticas(afetados)
+
+#endregion ---
+
+#region --- FREQUÊNCIA ---
+
+
+@receiver(post_delete, sender=Aula)
+def descontar_aula_excluida(sender, instance, origin=None, **kwargs):
+    # As chamadas gravadas passam por presenca.registrar_aulas; aqui só é
+    # preciso tirar dos consolidados as aulas excluídas diretamente. Na
+    # cascata (turma, disciplina...) os consolidados dos alunos caem junto
+    # com a turma/disciplina e os dos professores são recalculados uma vez
+    # por vínculo excluído, não uma vez por aula.
+    origem = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if origem is Aula:
+        atualizar_frequencias([(instance, None)])
+
+
+def _frequencias_do_vinculo(vinculo):
+    periodo_id = (
+        TurmaDisciplina.objects.filter(pk=vinculo.turma_disciplina_id)
+        .values_list('turma__periodo_letivo_id', flat=True)
+        .first()
+    )
+    return {(vinculo.voluntario_id, periodo_id)}
+
+
+@receiver(pre_save, sender=TurmaDisciplinaProfessor)
+@receiver(pre_delete, sender=TurmaDisciplinaProfessor)
+def guardar_frequencias_do_vinculo(sender, instance, **kwargs):
+    # Professor (e período) que deixam de receber as aulas do vínculo
+    instance._frequencias_anteriores = set()
+    if instance.pk is None:
+        return
+    anterior = instance
+    if kwargs['signal'] is pre_save:
+        anterior = sender.objects.filter(pk=instance.pk).first()
+    if anterior is not None:
+        instance._frequencias_anteriores = _frequencias_do_vinculo(anterior)
+
+
+@receiver(post_save, sender=TurmaDisciplinaProfessor)
+@receiver(post_delete, sender=TurmaDisciplinaProfessor)
+def recalcular_frequencias_do_vinculo(sender, instance, **kwargs):
+    # As aulas já dadas passam para o professor vinculado agora, como em
+    # presenca.reconstruir_frequencias
+    pares = getattr(instance, '_frequencias_anteriores', set())
+    if kwargs['signal'] is post_save:
+        pares |= _frequencias_do_vinculo(instance)
+    recalcular_professores(pares)
+
+#endregion ---
@@ -0,0 +1,20 @@
+"""
+Ajustes das conexões SQLite (settings.SQLITE_PRAGMAS), aplicados a cada
+nova conexão pelo signal connection_created (ver apps.py).
+"""
+
+from django.conf import settings
+
+
+def aplicar_pragmas(cursor, pragmas):
+    for nome, valor in pragmas.items():
+        cursor.execute(f'PRAGMA {nome} = {valor}')
+
+
+def configurar_conexao(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', {})
+    if pragmas:
+        with connection.cursor() as cursor:
+            aplicar_pragmas(cursor, pragmas)
@@ -0,0 +1,249 @@
+"""
+Fila de tarefas em segundo plano guardada no próprio banco (tabela Tarefa),
+sem broker externo.
+
+As views enfileiram com `enfileirar()` e respondem na hora; o comando
+`manage.py runworker` reserva e executa as tarefas. Falhas são tentadas de
+novo com espera exponencial, e o progresso gravado em Tarefa pode ser
+consultado pelas páginas (view status_tarefa).
+"""
+
+import traceback
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.core.files.storage import default_storage
+from django.db.models import F
+from django.utils import timezone
+
+from . import importacao
+from .boletins import gerar_boletins
+from .models import Curso, Disciplina, Tarefa
+
+# Espera antes da tentativa n: BACKOFF_BASE * 2 ** (n - 1), até BACKOFF_MAX
+BACKOFF_BASE = 10
+BACKOFF_MAX = 10 * 60
+# Tarefas em execução sem heartbeat (Tarefa.atualizar_progresso) por esse
+# tempo são consideradas abandonadas (worker encerrado no meio da execução).
+TIMEOUT_EXECUCAO = timedelta(minutes=15)
+# Registros excluídos por lote em excluir_registros, com um heartbeat por
+# lote
+LOTE_EXCLUSAO = 200
+
+
+@dataclass(frozen=True)
+class TipoTarefa:
+    funcao: object
+    descricao: str
+    # Nome da URL para voltar ao concluir, ou função que o obtém dos
+    # parâmetros da tarefa
+    retorno: object = ''
+
+
+REGISTRO = {}
+
+
+def url_retorno(tarefa):
+    tipo = REGISTRO.get(tarefa.tipo)
+    if tipo is None or not tipo.retorno:
+        return ''
+    if callable(tipo.retorno):
+        return tipo.retorno(tarefa.parametros)
+    return tipo.retorno
+
+
+def tarefa(tipo, descricao, retorno=''):
+    """
+    Registra a função como executora do `tipo`. Ela recebe a Tarefa e os
+    parâmetros enfileirados e retorna o resultado (JSON) a ser gravado.
+    """
+
+    def decorator(funcao):
+        REGISTRO[tipo] = TipoTarefa(funcao, descricao, retorno)
+        return funcao
+
+    return decorator
+
+
+def enfileirar(tipo, criado_por=None, max_tentativas=3, **parametros):
+    if tipo not in REGISTRO:
+        raise ValueError(f'Tipo de tarefa desconhecido: {tipo}')
+    return Tarefa.objects.create(
+        tipo=tipo,
+        parametros=parametros,
+        criado_por=criado_por,
+        max_tentativas=max_tentativas,
+    )
+
+
+#region --- EXECUÇÃO (usada pelo runworker) ---
+
+def reservar_proxima(worker):
+    """
+    Reserva a próxima tarefa pendente para o `worker`. A reserva é um
+    UPDATE condicionado ao status, então dois workers nunca pegam a mesma
+    tarefa.
+    """
+    agora = timezone.now()
+    candidatas = (
+        Tarefa.objects.filter(status='PENDENTE', executar_em__lte=agora)
+        .order_by('executar_em', 'pk')
+        .values_list('pk', flat=True)[:10]
+    )
+    for pk in candidatas:
+        reservada = Tarefa.objects.filter(pk=pk, status='PENDENTE').update(
+            status='EXECUTANDO',
+            worker=worker,
+            tentativas=F('tentativas') + 1,
+            progresso=0,
+            atualizado_em=agora,
+            heartbeat_em=agora,
+        )
+        if reservada:
+            return Tarefa.objects.get(pk=pk)
+    return None
+
+
+def executar(tarefa):
+    tipo = REGISTRO.get(tarefa.tipo)
+    try:
+        if tipo is None:
+            raise LookupError(f'Tipo de tarefa desconhecido: {tarefa.tipo}')
+        resultado = tipo.funcao(tarefa, **tarefa.parametros)
+    except Exception:
+        _registrar_falha(tarefa, traceback.format_exc())
+        return False
+
+    agora = timezone.now()
+    Tarefa.objects.filter(pk=tarefa.pk).update(
+        status='CONCLUIDA',
+        progresso=100,
+        resultado=resultado,
+        erro='',
+        concluido_em=agora,
+        atualizado_em=agora,
+    )
+    return True
+
+
+def _registrar_falha(tarefa, erro):
+    agora = timezone.now()
+    if tarefa.tentativas < tarefa.max_tentativas:
+        espera = min(BACKOFF_BASE * 2 ** (tarefa.tentativas - 1), BACKOFF_MAX)
+        Tarefa.objects.filter(pk=tarefa.pk).update(
+            status='PENDENTE',
+            executar_em=agora + timedelta(seconds=espera),
+            mensagem=f'Falhou; nova tentativa em {espera}s.',
+            erro=erro,
+            worker='',
+            atualizado_em=agora,
+        )
+    else:
+        Tarefa.objects.filter(pk=tarefa.pk).update(
+            status='FALHOU',
+            mensagem='Falhou após todas as tentativas.',
+            erro=erro,
+            concluido_em=agora,
+            atualizado_em=agora,
+        )
+
+
+def recuperar_travadas(timeout=TIMEOUT_EXECUCAO):
+    """
+    Devolve à fila as tarefas abandonadas por um worker que parou no meio
+    da execução (ou marca como falha, se já esgotaram as tentativas).
+    """
+    agora = timezone.now()
+    travadas = Tarefa.objects.filter(
+        status='EXECUTANDO', heartbeat_em__lt=agora - timeout
+    )
+    travadas.filter(tentativas__gte=F('max_tentativas')).update(
+        status='FALHOU',
+        mensagem='Worker interrompido durante a execução.',
+        concluido_em=agora,
+        atualizado_em=agora,
+    )
+    travadas.update(
+        status='PENDENTE',
+        mensagem='Worker interrompido; tarefa devolvida à fila.',
+        worker='',
+        executar_em=agora,
+        atualizado_em=agora,
+    )
+
+#endregion ---
+
+
+#region --- TIPOS DE TAREFA ---
+
+@tarefa('importar_alunos', 'Importação de alunos', 'pesquisar_aluno')
+def _importar_alunos(tarefa, arquivo, nome):
+    def ao_concluir_lote(relatorio):
+        # Gravado na transação do lote: se a tarefa falhar depois, a nova
+        # tentativa continua do lote seguinte
+        tarefa.atualizar_progresso(
+            mensagem=f'{relatorio.total} linhas processadas.',
+            retomada=relatorio.retomada(),
+        )
+
+    with default_storage.open(arquivo, 'rb') as planilha:
+        relatorio = importacao.importar_alunos(
+            importacao.ler_planilha(planilha, nome),
+            ao_concluir_lote=ao_concluir_lote,
+            retomada=tarefa.retomada,
+        )
+    default_storage.delete(arquivo)
+    return {
+        'resumo': (
+            f'{relatorio.total} linhas lidas, {relatorio.importados} alunos '
+            f'importados, {relatorio.rejeitados} linhas com erro.'
+        ),
+        'erros': relatorio.erros[:1000],
+    }
+
+
+@tarefa('gerar_boletins', 'Geração de boletins', 'boletins')
+def _gerar_boletins(tarefa, periodo_id, forcar=False):
+    def progresso(gerados, pendentes):
+        tarefa.atualizar_progresso(
+            100 * gerados // pendentes, f'{gerados} de {pendentes} boletins.'
+        )
+
+    relatorio = gerar_boletins(periodo_id, forcar=forcar, progresso=progresso)
+    return {
+        'resumo': (
+            f'{relatorio.gerados} boletins gerados e {relatorio.inalterados} '
+            f'inalterados, de {relatorio.total} matrículas.'
+        ),
+    }
+
+
+# Models que podem ser excluídos em massa pela fila
+MODELOS_EXCLUSAO = {
+    'disciplina': (Disciplina, 'pesquisar_disciplina'),
+    'curso': (Curso, 'pesquisar_curso'),
+}
+
+
+@tarefa(
+    'excluir_registros',
+    'Exclusão em massa',
+    lambda parametros: MODELOS_EXCLUSAO[parametros['modelo']][1],
+)
+def _excluir_registros(tarefa, modelo, ids):
+    model, _ = MODELOS_EXCLUSAO[modelo]
+    # Em lotes, com heartbeat a cada um: uma exclusão longa não é dada
+    # como abandonada. Numa nova tentativa, os já excluídos não casam mais.
+    count = 0
+    for inicio in range(0, len(ids), LOTE_EXCLUSAO):
+        lote = ids[inicio:inicio + LOTE_EXCLUSAO]
+        # O delete() retorna uma tupla, onde o primeiro item é a contagem
+        # (incluindo os registros excluídos em cascata)
+        count += model.objects.filter(pk__in=lote).delete()[0]
+        feitos = min(inicio + LOTE_EXCLUSAO, len(ids))
+        tarefa.atualizar_progresso(
+            100 * feitos // len(ids), f'{feitos} de {len(ids)} registros.'
+        )
+    return {'resumo': f'{count} registros excluídos.'}
+
+#endregion ---
@@ -0,0 +1,64 @@
+import hashlib
+from weakref import WeakKeyDictionary
+
+from django import template
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.template.loader_tags import IncludeNode
+from django.utils.safestring import mark_safe
+
+register = template.Library()
+
+# Um dia: a chave muda sozinha quando o template muda (_versao)
+FRAGMENTOS_TIMEOUT = 60 * 60 * 24
+
+# Versão de cada template compilado. Com o loader em cache o objeto só
+# muda quando o template é recarregado, e a versão é recalculada.
+_versoes = WeakKeyDictionary()
+
+
+def _versao(compilado, engine):
+    """
+    Hash do código do template e dos includes de nome fixo que ele faz,
+    para que a alteração de qualquer um deles invalide o fragmento.
+    """
+    versao = _versoes.get(compilado)
+    if versao is None:
+        hasher = hashlib.md5(
+            compilado.source.encode(), usedforsecurity=False
+        )
+        for node in compilado.nodelist.get_nodes_by_type(IncludeNode):
+            if not node.template.is_var:
+                incluido = engine.get_template(node.template.var)
+                hasher.update(_versao(incluido, engine).encode())
+        versao = _versoes[compilado] = hasher.hexdigest()[:12]
+    return versao
+
+
+@register.simple_tag(takes_context=True)
+def include_cacheado(context, nome, *variacoes):
+    """
+    Como o {% include %}, mas guarda o HTML no cache, por versão do
+    template e pelos valores de `variacoes`. Só serve para fragmentos cujo
+    HTML depende apenas desses valores (nada do usuário, CSRF etc.).
+
+        {% load fragmentos %}
+        {% include_cacheado 'includes/sidebar.html' papel url_name %}
+
+    settings.FRAGMENTOS_CACHE = False desliga o cache (ver
+    manage.py benchmark_fragmentos).
+    """
+    engine = context.template.engine
+    compilado = engine.get_template(nome)
+    if not getattr(settings, 'FRAGMENTOS_CACHE', True):
+        return compilado.render(context)
+
+    chave = make_template_fragment_key(
+        f'{nome}.{_versao(compilado, engine)}', variacoes
+    )
+    html = cache.get(chave)
+    if html is None:
+        html = compilado.render(context)
+        cache.set(chave, html, FRAGMENTOS_TIMEOUT)
+    return mark_safe(html)
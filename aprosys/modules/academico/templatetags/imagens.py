@@ -0,0 +1,27 @@
+from django import template
+from django.core.files.storage import default_storage
+
+from ..imagens import TAMANHOS, caminho_miniatura
+
+register = template.Library()
+
+
+@register.inclusion_tag('includes/foto_voluntario.html')
+def foto_voluntario(voluntario, tamanho='pequena'):
+    """
+    Foto do voluntário no `tamanho` pedido (ver imagens.TAMANHOS), em WebP
+    com JPEG para navegadores sem suporte. Sem foto, usa a imagem padrão.
+
+        {% load imagens %}
+        {% foto_voluntario user.voluntario 'media' %}
+    """
+    contexto = {'voluntario': voluntario, 'lado': TAMANHOS[tamanho]}
+    foto = getattr(voluntario, 'foto', None)
+    if foto:
+        contexto['webp'] = default_storage.url(
+            caminho_miniatura(foto.name, tamanho, 'webp')
+        )
+        contexto['jpg'] = default_storage.url(
+            caminho_miniatura(foto.name, tamanho, 'jpg')
+        )
+    return contexto
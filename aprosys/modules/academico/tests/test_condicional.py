@@ -0,0 +1,34 @@
+from http import HTTPStatus
+
+from django.test import Client
+from django.urls import reverse
+
+
+def test_if_modified_since_sozinho_nao_gera_304(dados):
+    coordenador = Client()
+    coordenador.force_login(dados.usuarios['COORDENADOR'])
+    url = reverse('pesquisar_curso')
+    response = coordenador.get(url)
+    assert response.status_code == HTTPStatus.OK
+    assert not response.has_header('Last-Modified')
+
+    # Outro usuário, com a data de uma página que ele nunca recebeu
+    outro = Client()
+    outro.force_login(dados.usuarios['SUPERUSUARIO'])
+    response = outro.get(
+        url, HTTP_IF_MODIFIED_SINCE='Fri, 01 Jan 2100 00:00:00 GMT'
+    )
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_etag_valida_a_mesma_pagina(dados):
+    client = Client()
+    client.force_login(dados.usuarios['COORDENADOR'])
+    url = reverse('pesquisar_curso')
+    # A primeira resposta cria o cookie CSRF, que entra no ETag
+    client.get(url)
+    etag = client.get(url)['ETag']
+
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
@@ -0,0 +1,65 @@
+import pytest
+from modules.academico.forms import AlunoImportForm
+from modules.academico.importacao import importar_alunos
+from modules.academico.models import Aluno
+
+LOTE = 2
+LINHAS = 5
+LOTE_INTERROMPIDO = 2
+
+
+class Interrompida(Exception):
+    pass
+
+
+def _linhas(etiqueta, total):
+    return [
+        {
+            'nome': f'Aluno {i}',
+            'email': f'importado{i}.{etiqueta}@exemplo.org',
+            'rua': 'Rua Exemplo',
+            'numero': '1',
+            'status': 'Ativo',
+            'periodo_interesse': 'Matutino',
+            'estado_civil': 'Solteiro(a)',
+            'nascimento': '01/02/2005',
+        }
+        for i in range(total)
+    ]
+
+
+def test_nova_tentativa_continua_do_ultimo_lote_gravado(dados):
+    linhas = _linhas('retomada', LINHAS)
+    gravada = {}
+
+    def falhar_no_segundo_lote(relatorio):
+        if relatorio.lotes == LOTE_INTERROMPIDO:
+            raise Interrompida
+        gravada['retomada'] = relatorio.retomada()
+
+    with pytest.raises(Interrompida):
+        importar_alunos(
+            linhas, chunk_size=LOTE, ao_concluir_lote=falhar_no_segundo_lote
+        )
+    # O segundo lote foi desfeito junto com o ponto de retomada
+    emails = Aluno.objects.filter(email__contains='.retomada@')
+    assert emails.count() == LOTE
+
+    relatorio = importar_alunos(
+        linhas, chunk_size=LOTE, retomada=gravada['retomada']
+    )
+
+    assert relatorio.rejeitados == 0
+    assert relatorio.total == relatorio.importados == LINHAS
+    assert emails.count() == LINHAS
+
+
+def test_cada_formulario_de_importacao_tem_os_proprios_campos():
+    # O AlunoForm altera os attrs dos widgets em cada instância
+    primeiro, segundo = AlunoImportForm(), AlunoImportForm()
+
+    assert primeiro.fields['nome'] is not segundo.fields['nome']
+    assert (
+        primeiro.fields['nome'].widget.attrs
+        is not segundo.fields['nome'].widget.attrs
+    )
@@ -0,0 +1,27 @@
+from http import HTTPStatus
+
+import pytest
+from django.test import Client
+from django.urls import reverse
+from modules.academico.auditoria import CONSULTAS, auditar
+
+
+@pytest.mark.parametrize('papel', ['SUPERUSUARIO', 'COORDENADOR', 'PROFESSOR'])
+@pytest.mark.parametrize(('nome', 'querystring'), CONSULTAS)
+def test_pesquisa_sem_varredura_completa(dados, papel, nome, querystring):
+    client = Client()
+    client.force_login(dados.usuarios[papel])
+    url = reverse(nome)
+    if querystring:
+        url += f'?{querystring}'
+
+    status, planos = auditar(client, url)
+
+    if status == HTTPStatus.FORBIDDEN:
+        pytest.skip(f'{papel} não acessa {nome}')
+    assert status == HTTPStatus.OK
+    assert planos
+    varreduras = [
+        (plano.sql, plano.linhas) for plano in planos if plano.varridas
+    ]
+    assert not varreduras
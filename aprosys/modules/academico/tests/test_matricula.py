@@ -0,0 +1,15 @@
+from modules.academico.models import Turma, TurmaAluno
+
+
+def test_ordem_de_aluno_removido_nao_e_reutilizada(dados):
+    turma, outra = Turma.objects.order_by('pk')[:2]
+    aluno = TurmaAluno.objects.filter(turma=outra).first().aluno
+    ultima = TurmaAluno.objects.filter(turma=turma).order_by('ordem').last()
+
+    matricula = TurmaAluno.objects.create(turma=turma, aluno=aluno)
+    assert matricula.ordem == ultima.ordem + 1
+    matricula.delete()
+
+    nova = TurmaAluno.objects.create(turma=turma, aluno=aluno)
+    assert nova.ordem == ultima.ordem + 2
+    nova.delete()
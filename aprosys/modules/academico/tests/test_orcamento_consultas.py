@@ -0,0 +1,88 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import transaction
+from modules.academico.medicoes import IGNORADAS, ORCAMENTOS, medir_volume
+from modules.academico.urls import urlpatterns
+
+PAPEIS = ['SUPERUSUARIO', 'COORDENADOR', 'PROFESSOR']
+# Alunos em cada volume medido: no menor, as listagens cabem em uma página
+VOLUMES = [20, 300]
+
+# Páginas da coordenação: o professor recebe 403
+SO_COORDENACAO = {
+    'cadastrar_aluno',
+    'editar_aluno',
+    'detalhes_aluno',
+    'importar_alunos',
+    'cadastrar_disciplina',
+    'editar_disciplina',
+    'cadastrar_turma',
+    'cadastrar_voluntario',
+    'relatorio_frequencia',
+    'boletins',
+    'cadastrar_curso',
+    'editar_curso',
+}
+# O GET das exclusões em massa volta para a pesquisa
+REDIRECIONAM = {'excluir_disciplinas_massa', 'excluir_cursos_massa'}
+SO_SUPERUSUARIO = {'metricas'}
+# A tarefa medida foi criada pelo superusuário
+SO_QUEM_CRIOU = {'acompanhar_tarefa', 'status_tarefa'}
+
+
+def _status_esperado(nome, papel):
+    if papel != 'SUPERUSUARIO':
+        if nome in SO_QUEM_CRIOU:
+            return HTTPStatus.NOT_FOUND
+        if nome in SO_SUPERUSUARIO:
+            return HTTPStatus.FORBIDDEN
+    if papel == 'PROFESSOR' and nome in SO_COORDENACAO | REDIRECIONAM:
+        return HTTPStatus.FORBIDDEN
+    if nome in REDIRECIONAM:
+        return HTTPStatus.FOUND
+    return HTTPStatus.OK
+
+
+@pytest.fixture(scope='module')
+def medicoes(dados):
+    """
+    {alunos: {(rota, papel): (queries, status)}} de cada volume. Cada um é
+    medido em uma transação desfeita no final, sobre o banco esvaziado
+    (sem a massa da sessão), como os bancos novos de orcamento_consultas.
+    """
+    resultados = {}
+    for alunos in VOLUMES:
+        with transaction.atomic():
+            call_command('flush', interactive=False, inhibit_post_migrate=True)
+            _, resultados[alunos] = medir_volume(alunos)
+            transaction.set_rollback(True)
+    return resultados
+
+
+def test_toda_pagina_tem_orcamento():
+    nomes = {
+        padrao.name
+        for padrao in urlpatterns
+        if getattr(padrao, 'name', None) and padrao.name not in IGNORADAS
+    }
+    assert nomes - ORCAMENTOS.keys() == set()
+
+
+@pytest.mark.parametrize('alunos', VOLUMES)
+@pytest.mark.parametrize('papel', PAPEIS)
+@pytest.mark.parametrize('nome', sorted(ORCAMENTOS))
+def test_orcamento_de_queries(medicoes, nome, papel, alunos):
+    queries, status = medicoes[alunos][(nome, papel)]
+
+    assert status == _status_esperado(nome, papel)
+    assert queries <= ORCAMENTOS[nome]
+
+
+@pytest.mark.parametrize('papel', PAPEIS)
+@pytest.mark.parametrize('nome', sorted(ORCAMENTOS))
+def test_queries_nao_crescem_com_o_volume(medicoes, nome, papel):
+    menor, maior = (medicoes[alunos][(nome, papel)][0] for alunos in VOLUMES)
+
+    assert maior == menor
@@ -0,0 +1,35 @@
+from django.test import Client
+from django.urls import reverse
+
+
+def _pagina(client, **params):
+    response = client.get(reverse('pesquisar_aluno'), params)
+    return response.context['page']
+
+
+def test_cursor_de_outra_direcao_volta_a_primeira_pagina(dados):
+    client = Client()
+    client.force_login(dados.usuarios['COORDENADOR'])
+    crescente = _pagina(client, page_size=10)
+    assert crescente.has_next
+
+    decrescente = _pagina(client, page_size=10, dir='desc')
+    trocada = _pagina(
+        client, page_size=10, dir='desc', after=crescente.next_cursor
+    )
+
+    assert not trocada.has_previous
+    assert [a.pk for a in trocada] == [a.pk for a in decrescente]
+
+
+def test_cursor_segue_para_a_proxima_pagina(dados):
+    client = Client()
+    client.force_login(dados.usuarios['COORDENADOR'])
+    primeira = _pagina(client, page_size=10, dir='desc')
+
+    segunda = _pagina(
+        client, page_size=10, dir='desc', after=primeira.next_cursor
+    )
+
+    assert segunda.has_previous
+    assert not {a.pk for a in primeira} & {a.pk for a in segunda}
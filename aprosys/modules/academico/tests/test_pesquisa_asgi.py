@@ -0,0 +1,33 @@
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient, override_settings
+from modules.academico import search
+
+PESQUISAS = [
+    '/academico/alunos/pesquisar/',
+    '/academico/disciplinas/pesquisar/',
+    '/academico/turmas/pesquisar/',
+    '/academico/voluntarios/pesquisar/',
+    '/academico/cursos/pesquisar/',
+]
+
+
+async def _pesquisar(user, url):
+    client = AsyncClient()
+    await client.aforce_login(user)
+    return await client.get(url)
+
+
+@pytest.mark.parametrize('termo', ['silva', 'si', 'sil va'])
+@pytest.mark.parametrize('url', PESQUISAS)
+@override_settings(ROOT_URLCONF='aprosys.urls_asgi')
+def test_pesquisa_assincrona_com_termo(dados, cache_limpo, url, termo):
+    # Sem as tabelas FTS em cache, a primeira busca consulta o banco
+    search._fts_tables.clear()
+    for papel in ('COORDENADOR', 'PROFESSOR'):
+        response = async_to_sync(_pesquisar)(
+            dados.usuarios[papel], f'{url}?q={termo}'
+        )
+        assert response.status_code == HTTPStatus.OK, (papel, url)
@@ -0,0 +1,150 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from modules.academico import massa
+from modules.academico.models import (
+    Aula,
+    CustomUser,
+    FrequenciaAluno,
+    FrequenciaProfessor,
+    Turma,
+    TurmaDisciplina,
+    TurmaDisciplinaProfessor,
+    Voluntario,
+)
+from modules.academico.presenca import reconstruir_frequencias
+
+SEM_CHAMADA = ['MONITOR', 'SEM_VOLUNTARIO']
+
+
+@pytest.fixture(scope='module')
+def sem_chamada(dados):
+    """
+    Um monitor e um usuário autocadastrado, sem voluntário: nenhum dos
+    dois pode fazer a chamada.
+    """
+    usuarios = {}
+    for i, papel in enumerate(SEM_CHAMADA):
+        user = usuarios[papel] = CustomUser.objects.create_user(
+            username=f'chamada-{papel.lower()}',
+            email=f'chamada.{papel.lower()}@exemplo.org',
+            password=None,
+            nome=f'Sem chamada {i}',
+        )
+        if papel != 'SEM_VOLUNTARIO':
+            Voluntario.objects.create(
+                user=user,
+                nome=user.nome,
+                cpf=f'{i:011}',
+                email=user.email,
+                rua='Rua Exemplo',
+                numero='1',
+                tipo_voluntario=papel,
+                status_processo_voluntario=Voluntario.STATUS_ATIVO,
+            )
+    return usuarios
+
+
+@pytest.mark.parametrize('papel', SEM_CHAMADA)
+def test_chamada_recusada_sem_papel_de_professor(sem_chamada, papel):
+    client = Client()
+    client.force_login(sem_chamada[papel])
+    turma_disciplina = TurmaDisciplina.objects.filter(status=1).first()
+    url = reverse('registrar_presenca', args=[turma_disciplina.pk])
+    aulas = Aula.objects.filter(turma_disciplina=turma_disciplina)
+    total = aulas.count()
+
+    listagem = client.get(reverse('listar_chamadas'))
+    chamada = client.get(url)
+    gravacao = client.post(
+        url, {'data': timezone.localdate().isoformat(), 'conteudo': 'x'}
+    )
+
+    assert listagem.status_code == HTTPStatus.FORBIDDEN
+    assert chamada.status_code == HTTPStatus.FORBIDDEN
+    assert gravacao.status_code == HTTPStatus.FORBIDDEN
+    assert aulas.count() == total
+
+
+@pytest.mark.parametrize(
+    ('papel', 'exibida'),
+    [('MONITOR', False), ('SEM_VOLUNTARIO', False), ('COORDENADOR', True)],
+)
+def test_menu_so_mostra_a_chamada_a_quem_pode_fazer(
+    dados, sem_chamada, cache_limpo, papel, exibida
+):
+    client = Client()
+    client.force_login(sem_chamada.get(papel) or dados.usuarios[papel])
+
+    response = client.get(reverse('home'))
+
+    assert response.status_code == HTTPStatus.OK
+    link = f'href="{reverse("listar_chamadas")}"'
+    assert (link in response.text) is exibida
+
+
+@pytest.fixture(scope='module')
+def turmas_com_aulas(dados):
+    """Massa própria, com dois professores: os testes excluem registros."""
+    return massa.popular(
+        alunos=20, alunos_por_turma=5, professores=2, semente=20
+    )
+
+
+def _consolidados():
+    return (
+        set(FrequenciaAluno.objects.values_list(
+            'turma_disciplina_id', 'aluno_id', 'aulas', 'presencas'
+        )),
+        set(FrequenciaProfessor.objects.values_list(
+            'voluntario_id', 'periodo_letivo_id', 'aulas', 'chamadas',
+            'presencas',
+        )),
+    )
+
+
+def test_troca_de_professor_mantem_consolidados_iguais_aos_reconstruidos(
+    turmas_com_aulas,
+):
+    vinculo = TurmaDisciplinaProfessor.objects.filter(
+        turma_disciplina__turma__periodo_letivo=turmas_com_aulas.periodo
+    ).first()
+    vinculo.voluntario = next(
+        professor
+        for professor in turmas_com_aulas.professores
+        if professor.pk != vinculo.voluntario_id
+    )
+    vinculo.save()
+    aula = Aula.objects.filter(turma_disciplina=vinculo.turma_disciplina)
+    aula.first().delete()
+
+    consolidados = _consolidados()
+    reconstruir_frequencias()
+
+    assert _consolidados() == consolidados
+
+
+def test_exclusao_da_turma_nao_ajusta_consolidados_aula_por_aula(
+    turmas_com_aulas,
+):
+    turma = Turma.objects.filter(
+        periodo_letivo=turmas_com_aulas.periodo
+    ).last()
+    assert Aula.objects.filter(turma_disciplina__turma=turma).exists()
+
+    with CaptureQueriesContext(connection) as queries:
+        turma.delete()
+    consolidados = _consolidados()
+    reconstruir_frequencias()
+
+    assert _consolidados() == consolidados
+    assert not [
+        query
+        for query in queries
+        if query['sql'].startswith('UPDATE "academico_frequencia')
+    ]
@@ -0,0 +1,70 @@
+from datetime import timedelta
+
+from django.utils import timezone
+from modules.academico import tarefas
+from modules.academico.models import Curso, Tarefa
+
+LOTE = 2
+CURSOS = 5
+LOTES = 3
+
+
+def _em_execucao(
+    atualizado_em, heartbeat_em, tipo='gerar_boletins', **campos
+):
+    return Tarefa.objects.create(
+        tipo=tipo,
+        status='EXECUTANDO',
+        tentativas=1,
+        worker='teste',
+        atualizado_em=atualizado_em,
+        heartbeat_em=heartbeat_em,
+        **campos,
+    )
+
+
+def test_recuperacao_usa_o_heartbeat(dados):
+    agora = timezone.now()
+    antigo = agora - tarefas.TIMEOUT_EXECUCAO - timedelta(minutes=1)
+    viva = _em_execucao(atualizado_em=antigo, heartbeat_em=agora)
+    abandonada = _em_execucao(atualizado_em=agora, heartbeat_em=antigo)
+
+    tarefas.recuperar_travadas()
+
+    viva.refresh_from_db()
+    abandonada.refresh_from_db()
+    assert viva.status == 'EXECUTANDO'
+    assert abandonada.status == 'PENDENTE'
+
+
+def test_exclusao_em_lotes_renova_o_heartbeat(dados, monkeypatch):
+    monkeypatch.setattr(tarefas, 'LOTE_EXCLUSAO', LOTE)
+    ids = [
+        Curso.objects.create(nome=f'Curso em lote {i}').pk
+        for i in range(CURSOS)
+    ]
+    antigo = timezone.now() - tarefas.TIMEOUT_EXECUCAO
+    tarefa = _em_execucao(
+        atualizado_em=antigo,
+        heartbeat_em=antigo,
+        tipo='excluir_registros',
+        parametros={'modelo': 'curso', 'ids': ids},
+    )
+
+    heartbeats = []
+    atualizar_progresso = Tarefa.atualizar_progresso
+
+    def registrar(self, *args, **kwargs):
+        atualizar_progresso(self, *args, **kwargs)
+        heartbeats.append(
+            Tarefa.objects.values_list('heartbeat_em', flat=True).get(
+                pk=self.pk
+            )
+        )
+
+    monkeypatch.setattr(Tarefa, 'atualizar_progresso', registrar)
+
+    assert tarefas.executar(tarefa)
+    assert len(heartbeats) == LOTES
+    assert all(heartbeat > antigo for heartbeat in heartbeats)
+    assert not Curso.objects.filter(pk__in=ids).exists()
@@ -32,6 +32,16 @@ urlpatterns = [
         views.aluno_form_view,
         name='detalhes_aluno',
     ),
+    path(
+        'academico/alunos/importar/',
+        views.importar_alunos,
+        name='importar_alunos',
+    ),
+    path(
+        'academico/alunos/exportar/',
+        views.exportar_alunos,
+        name='exportar_alunos',
+    ),
     # Anderson
 
     # --------- Disciplina ----------
@@ -45,6 +55,11 @@ urlpatterns = [
         views.pesquisar_disciplina,
         name='pesquisar_disciplina',
     ),
+    path(
+        'academico/disciplinas/pesquisar/json/',
+        views.pesquisar_disciplina_json,
+        name='pesquisar_disciplina_json',
+    ),
     path (
         'academico/disciplinas/editar/<int:disciplina_id>/', views.cadastrar_disciplina, name='editar_disciplina'
     ),
@@ -77,6 +92,11 @@ urlpatterns = [
         views.pesquisar_turma,
         name='pesquisar_turma',
     ),
+    path(
+        'academico/turmas/exportar/',
+        views.exportar_turmas,
+        name='exportar_turmas',
+    ),
     
     # --------- Voluntários ----------
     path(
@@ -89,7 +109,54 @@ urlpatterns = [
         views.pesquisar_voluntario,
         name='pesquisar_voluntario',
     ),
+    path(
+        'academico/voluntarios/exportar/',
+        views.exportar_voluntarios,
+        name='exportar_voluntarios',
+    ),
     
+    # --------- Aulas e Presença ----------
+    path(
+        'academico/aulas/',
+        views.listar_chamadas,
+        name='listar_chamadas',
+    ),
+    path(
+        'academico/aulas/<int:turma_disciplina_id>/chamada/',
+        views.registrar_presenca,
+        name='registrar_presenca',
+    ),
+    path(
+        'academico/aulas/frequencia/',
+        views.relatorio_frequencia,
+        name='relatorio_frequencia',
+    ),
+    path(
+        'academico/boletins/',
+        views.boletins,
+        name='boletins',
+    ),
+    path(
+        'academico/boletins/<int:turma_aluno_id>/',
+        views.baixar_boletim,
+        name='baixar_boletim',
+    ),
+
+    # --------- Tarefas em segundo plano ----------
+    path(
+        'academico/tarefas/<int:pk>/',
+        views.acompanhar_tarefa,
+        name='acompanhar_tarefa',
+    ),
+    path(
+        'academico/tarefas/<int:pk>/status/',
+        views.status_tarefa,
+        name='status_tarefa',
+    ),
+
+    # --------- Métricas (Prometheus) ----------
+    path('metrics', views.metricas, name='metricas'),
+
     # --------- Cursos ----------
     path(
         'academico/cursos/cadastrar/',
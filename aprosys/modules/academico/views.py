@@ -1,35 +1,70 @@
 import json
-
+import os
+import uuid
 from functools import wraps
 
+from asgiref.sync import sync_to_async
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.db.models import Q
-from django.http import HttpResponse, HttpResponseForbidden
-from django.shortcuts import redirect, render, get_object_or_404
-
+from django.core.files.storage import default_storage
+from django.db.models import Count, Max, Q
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponse,
+    HttpResponseForbidden,
+    JsonResponse,
+    StreamingHttpResponse,
+)
+from django.shortcuts import get_object_or_404, redirect, render
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from django.utils.text import slugify
+
+from . import instrumentacao, presenca, tarefas
+from .conditional import conditional_page
+from .dashboard import get_estatisticas
+from .exportacao import Coluna, exportar
 from .forms import (
     AlunoForm,
+    ChamadaForm,
     CursoForm,
     CustomUserForm,
     DisciplinaForm,
+    ImportarAlunosForm,
     PeriodoLetivoForm,
     TurmaForm,
     VoluntarioForm,
 )
 from .models import (
     Aluno,
+    Aula,
+    Boletim,
     Curso,
     Disciplina,
+    FrequenciaAluno,
+    FrequenciaProfessor,
     PeriodoLetivo,
+    Tarefa,
     Turma,
     TurmaAluno,
+    TurmaDisciplina,
     TurmaDisciplinaProfessor,
     Voluntario,
 )
+from .pagination import apaginate_keyset, order_keyset, paginate_keyset
+from .roteamento import leitura_replica
+from .search import filtro_busca
+from .visibility import aget_visibilidade, get_visibilidade
 
 #region --- UTILITÁRIOS, AUTENTICAÇÃO E NAVEGAÇÃO BASE ---  
 
+# Models que definem o que um professor enxerga nas listagens, e Voluntario,
+# exibido no cabeçalho de todas as páginas. Entram no ETag de toda página
+# com GET condicional.
+VINCULOS = (Voluntario, TurmaDisciplinaProfessor, TurmaDisciplina, TurmaAluno)
+
 # Decorator personalizado para restringir o acesso a views com base no tipo de voluntário
 def role_required(allowed_roles):
     def decorator(view_func):
@@ -39,9 +74,10 @@ def role_required(allowed_roles):
                 return view_func(request, *args, **kwargs)
             if not request.user.is_authenticated:
                 return redirect('login')
-            if not hasattr(request.user, 'voluntario'):
+            # O papel vem da sessão (PerfilVoluntarioMiddleware), sem query
+            if not request.perfil:
                 return HttpResponseForbidden()
-            if request.user.voluntario.tipo_voluntario not in allowed_roles:
+            if request.perfil.tipo_voluntario not in allowed_roles:
                 return HttpResponseForbidden()
             return view_func(request, *args, **kwargs)
 
@@ -66,55 +102,91 @@ def user_registration(request):
 # Renderiza a página inicial (Dashboard) do sistema Aprova System após o login
 @login_required
 def home(request):
-    return render(request, 'academico/home.html')
+    return render(
+        request,
+        'academico/home.html',
+        {'estatisticas': get_estatisticas(request)},
+    )
 #endregion ---
 
 #region --- ALUNOS - ANDERSON ---
-@login_required
-def pesquisar_aluno(request):
+
+
+def _consultar_alunos(request, visibilidade=None):
+    """
+    Aplica os filtros de permissão e pesquisa de alunos, usados pela listagem
+    e pela exportação. Retorna (queryset, campo de ordenação, parâmetros).
+    As views assíncronas passam a `visibilidade` já carregada.
+    """
     query = request.GET.get('q', '')
     order = request.GET.get('order', 'nome')
     dir = request.GET.get('dir', 'asc')
 
-    voluntario = getattr(request.user, 'voluntario', None)
-
     alunos = Aluno.objects.all()
 
-    if voluntario and voluntario.tipo_voluntario == 'PROFESSOR':
-        turmas_ids = (
-            TurmaDisciplinaProfessor.objects.filter(
-                voluntario=voluntario, status=1, turma_disciplina__status=1
-            )
-            .values_list('turma_disciplina__turma_id', flat=True)
-            .distinct()
-        )
-
-        alunos_ids = (
-            TurmaAluno.objects.filter(turma_id__in=turmas_ids, status=1)
-            .values_list('aluno_id', flat=True)
-            .distinct()
-        )
-
+    if request.perfil.is_professor:
+        visibilidade = visibilidade or get_visibilidade(request.user.pk)
+        alunos_ids = visibilidade['aluno_ids']
         alunos = Aluno.objects.filter(id__in=alunos_ids)
 
     if query:
-        alunos = alunos.filter(nome__icontains=query)
+        alunos = alunos.filter(filtro_busca(Aluno, query))
+
+    allowed_fields = {
+        'nome': 'nome',
+        'status': 'status',
+    }
+    if order not in allowed_fields:
+        order = 'nome'
+
+    params = {'q': query, 'order': order, 'dir': dir}
+    return alunos, allowed_fields[order], params
 
-    if dir == 'desc':
-        order = f'-{order}'
-    alunos = alunos.order_by(order)
+
+@login_required
+@conditional_page(Aluno, *VINCULOS)
+@leitura_replica
+def pesquisar_aluno(request):
+    alunos, campo, params = _consultar_alunos(request)
+    page = paginate_keyset(request, alunos, campo, params['dir'])
 
     context = {
-        'alunos': alunos,
-        'q': query,
-        'order': request.GET.get('order', 'nome'),
-        'dir': request.GET.get('dir', 'asc'),
+        'alunos': page.object_list,
+        'page': page,
+        **params,
     }
 
     return render(request, 'academico/alunos/pesquisar_aluno.html', context)
 
+
+COLUNAS_EXPORTACAO_ALUNO = (
+    Coluna('ID', 'id'),
+    Coluna('Nome', 'nome'),
+    Coluna('E-mail', 'email'),
+    Coluna('Contato', 'contato'),
+    Coluna('Nascimento', 'nascimento'),
+    Coluna('Cidade', 'cidade'),
+    Coluna('Estado', 'estado'),
+    Coluna('Status', 'status', Aluno.STATUS_CHOICES),
+)
+
+
+# Exporta em CSV/XLSX todos os alunos da pesquisa atual (mesmos filtros e
+# ordenação da listagem, sem paginação)
+@login_required
+@leitura_replica
+def exportar_alunos(request):
+    alunos, campo, params = _consultar_alunos(request)
+    return exportar(
+        order_keyset(alunos, campo, params['dir']),
+        COLUNAS_EXPORTACAO_ALUNO,
+        'alunos',
+        request.GET.get('formato', 'csv'),
+    )
+
 @login_required
 @role_required(['COORDENADOR'])
+@conditional_page(Aluno, Curso, Voluntario)
 def aluno_form_view(request, aluno_id=None):
     """
     View unificada para Matricular, Editar e Ver Detalhes de um Aluno.
@@ -161,10 +233,45 @@ def aluno_form_view(request, aluno_id=None):
         'active_menu': 'alunos'
     }
     return render(request, 'academico/alunos/aluno_form.html', context)
+
+
+# Importação em lote de alunos a partir de planilha CSV/XLSX. A planilha é
+# guardada no storage e importada pelo worker; o relatório de erros por
+# linha aparece na página da tarefa.
+@login_required
+@role_required(['COORDENADOR'])
+def importar_alunos(request):
+    if request.method == 'POST':
+        form = ImportarAlunosForm(request.POST, request.FILES)
+        if form.is_valid():
+            arquivo = form.cleaned_data['arquivo']
+            extensao = os.path.splitext(arquivo.name)[1].lower()
+            caminho = default_storage.save(
+                f'importacoes/{uuid.uuid4().hex}{extensao}', arquivo
+            )
+            tarefa = tarefas.enfileirar(
+                'importar_alunos',
+                criado_por=request.user,
+                arquivo=caminho,
+                nome=arquivo.name,
+            )
+            return redirect('acompanhar_tarefa', pk=tarefa.pk)
+    else:
+        form = ImportarAlunosForm()
+
+    return render(
+        request,
+        'academico/alunos/importar_alunos.html',
+        {'form': form, 'active_menu': 'alunos'},
+    )
 #endregion ---
 
 #region --- DISCIPLINA - LORENA ---
 
+
+STATUS_DISCIPLINA_DISPLAY = dict(Disciplina.STATUS_DISCIPLINA_CHOICES)
+AREA_CONHECIMENTO_DISPLAY = dict(Disciplina.AREA_CONHECIMENTO_CHOICES)
+
 # View unificada para Cadastrar e Editar Disciplina. Suporta abertura via popup para campos relacionados.
 @role_required(['COORDENADOR'])
 @login_required
@@ -196,33 +303,31 @@ def cadastrar_disciplina(request, disciplina_id=None):
     )
 
 
-@login_required
-def pesquisar_disciplina(request):
-    q = request.GET.get('q', '').strip()
-    voluntario = getattr(request.user, 'voluntario', None)
+# Contagens do cabeçalho em uma única query (agregação condicional)
+TOTAIS_DISCIPLINA = {
+    'total_ativos': Count('pk', filter=Q(status=1)),
+    'total_inativos': Count('pk', filter=Q(status=0)),
+}
+
 
+def _consultar_disciplinas(request, visibilidade=None):
+    """
+    Aplica os filtros de permissão, pesquisa e ordenação de disciplinas.
+    Retorna (queryset de dicts, parâmetros da busca); as contagens do
+    cabeçalho saem de queryset.aggregate(**TOTAIS_DISCIPLINA).
+    """
+    q = request.GET.get('q', '').strip()
     disciplinas = Disciplina.objects.all()
 
     # 1. Filtro de permissão do Professor
-    if voluntario and voluntario.tipo_voluntario == 'PROFESSOR':
-        disciplina_ids = (
-            TurmaDisciplinaProfessor.objects.filter(
-                voluntario=voluntario, status=1, turma_disciplina__status=1
-            )
-            .values_list('turma_disciplina__disciplina_id', flat=True)
-            .distinct()
-        )
+    if request.perfil.is_professor:
+        visibilidade = visibilidade or get_visibilidade(request.user.pk)
+        disciplina_ids = visibilidade['disciplina_ids']
         disciplinas = disciplinas.filter(id__in=disciplina_ids)
 
     # 2. Filtro de pesquisa por texto
     if q:
-        disciplinas = disciplinas.filter(
-            Q(nome__icontains=q) | Q(area_conhecimento__icontains=q)
-        )
-
-    # Contagens para o cabeçalho
-    total_ativos = disciplinas.filter(status=True).count()
-    total_inativos = disciplinas.filter(status=False).count()
+        disciplinas = disciplinas.filter(filtro_busca(Disciplina, q))
 
     # 3. Ordenação
     allowed_fields = {
@@ -237,38 +342,66 @@ def pesquisar_disciplina(request):
         order = 'nome'
 
     prefix = '' if direction == 'asc' else '-'
-    disciplinas = disciplinas.order_by(f'{prefix}{allowed_fields[order]}')
-
-    # --- NOVO: Preparação dos dados para o JavaScript ---
-    disciplinas_data = []
-    for d in disciplinas:
-        disciplinas_data.append({
-            'id': d.pk,
-            'nome': d.nome,
-            'status_display': d.get_status_display(),
-            'area_display': d.get_area_conhecimento_display(),
-            'status_raw': d.status,
-        })
-    
-    # Geramos o texto JSON
-    disciplinas_json = json.dumps(disciplinas_data)
+    disciplinas = disciplinas.order_by(
+        f'{prefix}{allowed_fields[order]}'
+    ).values('id', 'nome', 'area_conhecimento', 'status')
+
+    return disciplinas, {'q': q, 'order': order, 'dir': direction}
+
+
+def _disciplina_data(row):
+    return {
+        'id': row['id'],
+        'nome': row['nome'],
+        'status_display': STATUS_DISCIPLINA_DISPLAY.get(row['status']),
+        'area_display': AREA_CONHECIMENTO_DISPLAY.get(
+            row['area_conhecimento']
+        ),
+        'status_raw': row['status'],
+    }
+
+
+@login_required
+@conditional_page(Disciplina, *VINCULOS)
+@leitura_replica
+def pesquisar_disciplina(request):
+    disciplinas, params = _consultar_disciplinas(request)
+    totais = disciplinas.aggregate(**TOTAIS_DISCIPLINA)
+
+    # Uma única leitura das linhas, usada pela tabela e pelo JSON do mobile
+    disciplinas_data = [_disciplina_data(row) for row in disciplinas]
 
     return render(
         request,
         'academico/disciplinas/pesquisar_disciplina.html',
         {
-            'disciplinas': disciplinas,
-            'q': q,
-            'order': order,
-            'dir': direction,
+            'disciplinas': disciplinas_data,
+            **params,
             'active_menu': 'disciplinas',
-            'total_ativos': total_ativos,
-            'total_inativos': total_inativos,
-            'disciplinas_json': disciplinas_json, # Passamos o JSON aqui
+            **totais,
         },
     )
 
 
+# Versão JSON de pesquisar_disciplina, para a tabela agrupada carregar os
+# dados sem renderizar a página inteira. As linhas são serializadas em
+# streaming, direto do cursor.
+@login_required
+@conditional_page(Disciplina, *VINCULOS)
+@leitura_replica
+def pesquisar_disciplina_json(request):
+    disciplinas, _ = _consultar_disciplinas(request)
+    totais = disciplinas.aggregate(**TOTAIS_DISCIPLINA)
+
+    def stream():
+        yield json.dumps(totais)[:-1] + ', "disciplinas": ['
+        for i, row in enumerate(disciplinas.iterator(chunk_size=500)):
+            yield (', ' if i else '') + json.dumps(_disciplina_data(row))
+        yield ']}'
+
+    return StreamingHttpResponse(stream(), content_type='application/json')
+
+
 # Exclui uma disciplina específica do banco de dados e retorna    uma mensagem de confirmação
 @role_required(['COORDENADOR'])
 @login_required
@@ -288,11 +421,16 @@ def excluir_disciplinas_massa(request):
 
     if request.method == 'POST':
         ids_raw = request.POST.get('disciplina_ids', '')
-        if ids_raw:
-            ids_list = ids_raw.split(',')
-            # O delete() retorna uma tupla, onde o primeiro item é a contagem
-            count = Disciplina.objects.filter(pk__in=ids_list).delete()[0]
-            messages.success(request, f'{count} disciplinas excluídas com sucesso!')
+        ids_list = [pk for pk in ids_raw.split(',') if pk.isdigit()]
+        if ids_list:
+            # A exclusão (com os registros em cascata) roda no worker
+            tarefa = tarefas.enfileirar(
+                'excluir_registros',
+                criado_por=request.user,
+                modelo='disciplina',
+                ids=ids_list,
+            )
+            return redirect('acompanhar_tarefa', pk=tarefa.pk)
     return redirect('pesquisar_disciplina')
 
 #endregion ---
@@ -314,6 +452,8 @@ def cadastrar_periodo(request):
 
 @role_required(['COORDENADOR'])
 @login_required
+@conditional_page(PeriodoLetivo, Voluntario)
+@leitura_replica
 def pesquisar_periodo(request):
     q = request.GET.get('q', '').strip()
     periodos = PeriodoLetivo.objects.all()
@@ -340,14 +480,16 @@ def pesquisar_periodo(request):
     if order not in allowed_fields:
         order = 'nome'
 
-    prefix = '' if direction == 'asc' else '-'
-    periodos = periodos.order_by(f'{prefix}{allowed_fields[order]}')
+    page = paginate_keyset(
+        request, periodos, allowed_fields[order], direction
+    )
 
     return render(
         request,
         'academico/periodos/pesquisar_periodo.html',
         {
-            'periodos': periodos,
+            'periodos': page.object_list,
+            'page': page,
             'q': q,
             'order': order,
             'dir': direction,
@@ -412,30 +554,45 @@ def cadastrar_curso(request, curso_id=None):
     )
 
 
-# Lista os cursos com suporte a busca por nome e ordenação.
-@login_required
-def pesquisar_curso(request):
-
+def _consultar_cursos(request):
+    """
+    Aplica a pesquisa de cursos. Retorna (queryset, campo de ordenação,
+    parâmetros).
+    """
     q = request.GET.get('q', '').strip()
     cursos = Curso.objects.all()
 
     if q:
         cursos = cursos.filter(Q(nome__icontains=q))
 
+    allowed_fields = {
+        'nome': 'nome',
+    }
     order = request.GET.get('order', 'nome')
     direction = request.GET.get('dir', 'asc')
-    prefix = '' if direction == 'asc' else '-'
-    
-    cursos = cursos.order_by(f'{prefix}{order}')
+
+    if order not in allowed_fields:
+        order = 'nome'
+
+    params = {'q': q, 'order': order, 'dir': direction}
+    return cursos, allowed_fields[order], params
+
+
+# Lista os cursos com suporte a busca por nome e ordenação.
+@login_required
+@conditional_page(Curso, Voluntario)
+@leitura_replica
+def pesquisar_curso(request):
+    cursos, campo, params = _consultar_cursos(request)
+    page = paginate_keyset(request, cursos, campo, params['dir'])
 
     return render(
         request,
         'academico/cursos/pesquisar_curso.html',
         {
-            'cursos': cursos,
-            'q': q,
-            'order': order,
-            'dir': direction,
+            'cursos': page.object_list,
+            'page': page,
+            **params,
             'active_menu': 'cursos',
         }
     )
@@ -460,15 +617,21 @@ def excluir_cursos_massa(request):
 
     if request.method == 'POST':
         ids_raw = request.POST.get('curso_ids', '')
-        if ids_raw:
-            ids_list = ids_raw.split(',')
-            count = Curso.objects.filter(pk__in=ids_list).delete()[0]
-            messages.success(request, f'{count} cursos excluídos com sucesso!')
+        ids_list = [pk for pk in ids_raw.split(',') if pk.isdigit()]
+        if ids_list:
+            tarefa = tarefas.enfileirar(
+                'excluir_registros',
+                criado_por=request.user,
+                modelo='curso',
+                ids=ids_list,
+            )
+            return redirect('acompanhar_tarefa', pk=tarefa.pk)
     return redirect('pesquisar_curso')
 
 
 # Exibe os detalhes de um curso em modo somente leitura (visualizar).
 @login_required
+@conditional_page(Curso, Voluntario)
 def informacoes_curso(request, pk):
 
     curso = get_object_or_404(Curso, pk=pk)
@@ -505,27 +668,25 @@ def cadastrar_turma(request):
         {'form': form, 'active_menu': 'turmas'},
     )
 
-@login_required
-def pesquisar_turma(request):
-    q = request.GET.get('q', '').strip()
-    voluntario = getattr(request.user, 'voluntario', None)
 
+def _consultar_turmas(request, visibilidade=None):
+    """
+    Aplica os filtros de permissão e pesquisa de turmas, usados pela listagem
+    e pela exportação. Retorna (queryset, campo de ordenação, parâmetros).
+    As views assíncronas passam a `visibilidade` já carregada.
+    """
+    q = request.GET.get('q', '').strip()
     turmas = Turma.objects.all()
 
-    if voluntario and voluntario.tipo_voluntario == 'PROFESSOR':
-        # Filtra turmas onde o professor leciona via TurmaDisciplinaProfessor
-        turmas_ids = (
-            TurmaDisciplinaProfessor.objects.filter(
-                voluntario=voluntario, status=1, turma_disciplina__status=1
-            )
-            .values_list('turma_disciplina__turma_id', flat=True)
-            .distinct()
-        )
+    if request.perfil.is_professor:
+        # Turmas onde o professor leciona via TurmaDisciplinaProfessor
+        visibilidade = visibilidade or get_visibilidade(request.user.pk)
+        turmas_ids = visibilidade['turma_ids']
         turmas = turmas.filter(id_turma__in=turmas_ids)
 
     if q:
         turmas = turmas.filter(
-            Q(nome__icontains=q) | Q(periodo_letivo__nome__icontains=q)
+            filtro_busca(Turma, q) | Q(periodo_letivo__nome__icontains=q)
         )
 
     allowed_fields = {
@@ -542,20 +703,51 @@ def pesquisar_turma(request):
     if order not in allowed_fields:
         order = 'nome'
 
-    prefix = '' if direction == 'asc' else '-'
-    turmas = turmas.order_by(f'{prefix}{allowed_fields[order]}')
+    params = {'q': q, 'order': order, 'dir': direction}
+    return turmas, allowed_fields[order], params
+
+
+@login_required
+@conditional_page(Turma, PeriodoLetivo, *VINCULOS)
+@leitura_replica
+def pesquisar_turma(request):
+    turmas, campo, params = _consultar_turmas(request)
+    turmas = turmas.select_related('periodo_letivo')
+    page = paginate_keyset(request, turmas, campo, params['dir'])
 
     return render(
         request,
         'academico/turmas/pesquisar_turma.html',
         {
-            'turmas': turmas,
-            'q': q,
-            'order': order,
-            'dir': direction,
+            'turmas': page.object_list,
+            'page': page,
+            **params,
             'active_menu': 'turmas',
         },
     )
+
+
+COLUNAS_EXPORTACAO_TURMA = (
+    Coluna('ID', 'id_turma'),
+    Coluna('Nome', 'nome'),
+    Coluna('Período letivo', 'periodo_letivo__nome'),
+    Coluna('Capacidade', 'capacidade'),
+    Coluna('Data de início', 'data_inicio'),
+    Coluna('Data final', 'data_fim'),
+    Coluna('Status', 'status', Turma.STATUS),
+)
+
+
+@login_required
+@leitura_replica
+def exportar_turmas(request):
+    turmas, campo, params = _consultar_turmas(request)
+    return exportar(
+        order_keyset(turmas, campo, params['dir']),
+        COLUNAS_EXPORTACAO_TURMA,
+        'turmas',
+        request.GET.get('formato', 'csv'),
+    )
 #endregion ---
 
 #region --- VOLUNTÁRIOS --- 
@@ -577,8 +769,12 @@ def cadastrar_voluntario(request):
         {'form': form, 'active_menu': 'voluntarios'},
     )
 
-@login_required
-def pesquisar_voluntario(request):
+
+def _consultar_voluntarios(request):
+    """
+    Aplica a pesquisa de voluntários, usada pela listagem e pela exportação.
+    Retorna (queryset, campo de ordenação, parâmetros).
+    """
     q = request.GET.get('q', '').strip()
     order = request.GET.get('order', 'nome')
     direction = request.GET.get('dir', 'asc')
@@ -586,9 +782,7 @@ def pesquisar_voluntario(request):
     voluntarios = Voluntario.objects.all()
 
     if q:
-        voluntarios = voluntarios.filter(
-            Q(nome__icontains=q) | Q(email__icontains=q)
-        )
+        voluntarios = voluntarios.filter(filtro_busca(Voluntario, q))
 
     allowed_sort_fields = {
         'nome': 'nome',
@@ -596,21 +790,456 @@ def pesquisar_voluntario(request):
         'tipo_voluntario': 'tipo_voluntario',
         'status': 'status_processo_voluntario',
     }
-    sort_field = allowed_sort_fields.get(order, 'nome')
+    if order not in allowed_sort_fields:
+        order = 'nome'
 
-    if direction == 'desc':
-        sort_field = f'-{sort_field}'
+    params = {'q': q, 'order': order, 'dir': direction}
+    return voluntarios, allowed_sort_fields[order], params
 
-    voluntarios = voluntarios.order_by(sort_field)
+
+@login_required
+@conditional_page(Voluntario)
+@leitura_replica
+def pesquisar_voluntario(request):
+    voluntarios, campo, params = _consultar_voluntarios(request)
+    page = paginate_keyset(request, voluntarios, campo, params['dir'])
 
     context = {
-        'voluntarios': voluntarios,
-        'q': q,
-        'order': order,
-        'dir': direction,
+        'voluntarios': page.object_list,
+        'page': page,
+        **params,
         'active_menu': 'voluntarios',
     }
     return render(
         request, 'academico/voluntarios/pesquisar_voluntario.html', context
     )
-#endregion ---
\ No newline at end of file
+
+
+COLUNAS_EXPORTACAO_VOLUNTARIO = (
+    Coluna('ID', 'pk'),
+    Coluna('Nome', 'nome'),
+    Coluna('E-mail', 'email'),
+    Coluna('Telefone', 'telefone_contato'),
+    Coluna('Cidade', 'cidade'),
+    Coluna('Estado', 'estado'),
+    Coluna('Tipo', 'tipo_voluntario', Voluntario.TIPO_VOLUNTARIO_CHOICES),
+    Coluna(
+        'Status do processo',
+        'status_processo_voluntario',
+        Voluntario.STATUS_PROCESSO_CHOICES,
+    ),
+)
+
+
+@login_required
+@leitura_replica
+def exportar_voluntarios(request):
+    voluntarios, campo, params = _consultar_voluntarios(request)
+    return exportar(
+        order_keyset(voluntarios, campo, params['dir']),
+        COLUNAS_EXPORTACAO_VOLUNTARIO,
+        'voluntarios',
+        request.GET.get('formato', 'csv'),
+    )
+#endregion ---
+
+#region --- AULAS E PRESENÇA ---
+
+
+PAPEIS_CHAMADA = ['PROFESSOR', 'COORDENADOR']
+
+
+def _turma_disciplinas_visiveis(request):
+    # O professor vê só as suas disciplinas; o coordenador e o superusuário,
+    # todas. Qualquer outro papel não vê nenhuma (404 na chamada).
+    turma_disciplinas = TurmaDisciplina.objects.filter(status=1)
+    if request.perfil.is_professor:
+        visiveis = get_visibilidade(request.user.pk)['turma_disciplina_ids']
+        return turma_disciplinas.filter(id__in=visiveis)
+    if (
+        request.user.is_superuser
+        or request.perfil.tipo_voluntario == 'COORDENADOR'
+    ):
+        return turma_disciplinas
+    return turma_disciplinas.none()
+
+
+# Lista as disciplinas de turma em que o usuário pode fazer a chamada
+@login_required
+@role_required(PAPEIS_CHAMADA)
+@conditional_page(Aula, Turma, Disciplina, *VINCULOS)
+def listar_chamadas(request):
+    turma_disciplinas = (
+        _turma_disciplinas_visiveis(request)
+        .select_related('turma', 'disciplina')
+        .annotate(total_aulas=Count('aulas'), ultima_aula=Max('aulas__data'))
+        .order_by('turma__nome', 'disciplina__nome')
+    )
+    return render(
+        request,
+        'academico/aulas/listar_chamadas.html',
+        {'turma_disciplinas': turma_disciplinas, 'active_menu': 'aulas'},
+    )
+
+
+# Chamada da turma inteira em um único POST, gravada com um único upsert
+@login_required
+@role_required(PAPEIS_CHAMADA)
+def registrar_presenca(request, turma_disciplina_id):
+    turma_disciplina = get_object_or_404(
+        _turma_disciplinas_visiveis(request).select_related(
+            'turma', 'disciplina'
+        ),
+        pk=turma_disciplina_id,
+    )
+    chamada = presenca.lista_chamada(turma_disciplina.turma_id)
+
+    if request.method == 'POST':
+        form = ChamadaForm(request.POST, chamada=chamada)
+        if form.is_valid():
+            aula = presenca.montar_aula(
+                turma_disciplina,
+                form.cleaned_data['data'],
+                [ordem for ordem, _, _ in chamada],
+                form.cleaned_data['presentes'],
+                conteudo=form.cleaned_data['conteudo'],
+                registrado_por_id=request.user.pk if request.perfil else None,
+            )
+            presenca.registrar_aulas([aula])
+            messages.success(
+                request,
+                f'Chamada de {aula.data:%d/%m/%Y} registrada: '
+                f'{aula.total_presentes} de {aula.total_chamada} presentes.',
+            )
+            return redirect(f'{request.path}?data={aula.data.isoformat()}')
+    else:
+        try:
+            data = parse_date(request.GET.get('data', ''))
+        except ValueError:
+            data = None
+        data = data or timezone.localdate()
+        aula = Aula.objects.filter(
+            turma_disciplina=turma_disciplina, data=data
+        ).first()
+        initial = {'data': data, 'conteudo': ''}
+        if aula:
+            presentes = presenca.Bitmap(aula.presentes)
+            initial['conteudo'] = aula.conteudo
+            initial['presentes'] = [
+                ordem for ordem, _, _ in chamada if ordem in presentes
+            ]
+        else:
+            # Chamada nova começa com todos presentes
+            initial['presentes'] = [ordem for ordem, _, _ in chamada]
+        form = ChamadaForm(initial=initial, chamada=chamada)
+
+    aulas = turma_disciplina.aulas.order_by('-data').only(
+        'data', 'total_chamada', 'total_presentes'
+    )[:20]
+    # Frequência acumulada de cada aluno, lida do consolidado
+    frequencias = {
+        f.aluno_id: f for f in turma_disciplina.frequencias.all()
+    }
+    alunos = [
+        (checkbox, frequencias.get(aluno_id))
+        for checkbox, (_, aluno_id, _) in zip(form['presentes'], chamada)
+    ]
+    return render(
+        request,
+        'academico/aulas/registrar_presenca.html',
+        {
+            'form': form,
+            'alunos': alunos,
+            'turma_disciplina': turma_disciplina,
+            'aulas': aulas,
+            'active_menu': 'aulas',
+        },
+    )
+
+
+# Relatório de frequência por professor (no período letivo) e por aluno (na
+# disciplina da turma), lido dos consolidados FrequenciaProfessor/Aluno
+@login_required
+@role_required(['COORDENADOR'])
+@conditional_page(
+    FrequenciaAluno, FrequenciaProfessor, PeriodoLetivo, *VINCULOS
+)
+@leitura_replica
+def relatorio_frequencia(request):
+    periodos = PeriodoLetivo.objects.order_by('-ano', '-semestre')
+    periodo_id = request.GET.get('periodo', '')
+    turma_disciplina_id = request.GET.get('turma_disciplina', '')
+
+    professores = FrequenciaProfessor.objects.none()
+    if periodo_id.isdigit():
+        professores = (
+            FrequenciaProfessor.objects.filter(periodo_letivo_id=periodo_id)
+            .select_related('voluntario')
+            .order_by('voluntario__nome')
+        )
+
+    turma_disciplina = None
+    alunos = FrequenciaAluno.objects.none()
+    if turma_disciplina_id.isdigit():
+        turma_disciplina = get_object_or_404(
+            TurmaDisciplina.objects.select_related('turma', 'disciplina'),
+            pk=turma_disciplina_id,
+        )
+        alunos = turma_disciplina.frequencias.select_related(
+            'aluno'
+        ).order_by('aluno__nome')
+
+    return render(
+        request,
+        'academico/aulas/relatorio_frequencia.html',
+        {
+            'periodos': periodos,
+            'periodo_id': periodo_id,
+            'professores': professores,
+            'turma_disciplina': turma_disciplina,
+            'alunos': alunos,
+            'active_menu': 'aulas',
+        },
+    )
+#endregion ---
+
+
+#region --- BOLETINS ---
+def _periodo_param(dados):
+    periodo_id = dados.get('periodo', '')
+    return int(periodo_id) if periodo_id.isdigit() else None
+
+
+# Lista os boletins do período e enfileira a geração em lote (POST)
+@login_required
+@role_required(['COORDENADOR'])
+def boletins(request):
+    if request.method == 'POST':
+        periodo = get_object_or_404(
+            PeriodoLetivo, pk=_periodo_param(request.POST)
+        )
+        tarefa = tarefas.enfileirar(
+            'gerar_boletins',
+            criado_por=request.user,
+            periodo_id=periodo.pk,
+            forcar='forcar' in request.POST,
+        )
+        return redirect('acompanhar_tarefa', pk=tarefa.pk)
+
+    periodo_id = _periodo_param(request.GET)
+    lista = Boletim.objects.none()
+    if periodo_id:
+        lista = (
+            Boletim.objects.filter(
+                turma_aluno__turma__periodo_letivo_id=periodo_id
+            )
+            .select_related('turma_aluno__aluno', 'turma_aluno__turma')
+            .order_by('turma_aluno__turma__nome', 'turma_aluno__aluno__nome')
+        )
+
+    return render(
+        request,
+        'academico/boletins/boletins.html',
+        {
+            'periodos': PeriodoLetivo.objects.order_by('-ano', '-semestre'),
+            'periodo_id': periodo_id,
+            'boletins': lista,
+            'active_menu': 'aulas',
+        },
+    )
+
+
+@login_required
+def baixar_boletim(request, turma_aluno_id):
+    boletim = get_object_or_404(
+        Boletim.objects.select_related('turma_aluno__aluno'),
+        turma_aluno_id=turma_aluno_id,
+    )
+    if request.perfil.is_professor:
+        turma_ids = get_visibilidade(request.user.pk)['turma_ids']
+        if boletim.turma_aluno.turma_id not in turma_ids:
+            raise Http404
+    return FileResponse(
+        default_storage.open(boletim.arquivo, 'rb'),
+        as_attachment=True,
+        filename=f'boletim-{slugify(boletim.turma_aluno.aluno.nome)}.pdf',
+    )
+#endregion ---
+
+
+#region --- TAREFAS EM SEGUNDO PLANO ---
+def _tarefa_do_usuario(request, pk):
+    tarefa = get_object_or_404(Tarefa, pk=pk)
+    dono = tarefa.criado_por_id == request.user.pk
+    if not (dono or request.user.is_superuser):
+        raise Http404
+    return tarefa
+
+
+# Página que acompanha uma tarefa enfileirada, consultando status_tarefa
+# até ela terminar.
+@login_required
+def acompanhar_tarefa(request, pk):
+    tarefa = _tarefa_do_usuario(request, pk)
+    tipo = tarefas.REGISTRO.get(tarefa.tipo)
+    retorno = tarefas.url_retorno(tarefa)
+    return render(
+        request,
+        'academico/tarefas/acompanhar_tarefa.html',
+        {
+            'tarefa': tarefa,
+            'descricao': tipo.descricao if tipo else tarefa.tipo,
+            'url_retorno': reverse(retorno) if retorno else '',
+        },
+    )
+
+
+@login_required
+def status_tarefa(request, pk):
+    tarefa = _tarefa_do_usuario(request, pk)
+    return JsonResponse({
+        'status': tarefa.status,
+        'status_display': tarefa.get_status_display(),
+        'progresso': tarefa.progresso,
+        'mensagem': tarefa.mensagem,
+        'finalizada': tarefa.finalizada,
+    })
+#endregion ---
+
+
+#region --- MÉTRICAS ---
+# Histogramas de tempo e queries por URL (instrumentacao.py), no formato
+# texto do Prometheus.
+def metricas(request):
+    if not instrumentacao.autorizado(request):
+        return HttpResponseForbidden()
+    return HttpResponse(
+        instrumentacao.exportar(), content_type=instrumentacao.CONTENT_TYPE
+    )
+#endregion ---
+
+
+#region --- PESQUISAS ASSÍNCRONAS (ASGI) ---
+# Versões async das listagens, servidas pelo app ASGI (aprosys/asgi.py,
+# rotas em aprosys/urls_asgi.py) no lugar das síncronas. Mesmos filtros,
+# templates e contexto; as queries usam o ORM assíncrono e não prendem uma
+# thread enquanto esperam o banco. O template é renderizado em thread, pois
+# pode acessar relações ainda não carregadas.
+
+async def _avisibilidade(request):
+    if request.perfil.is_professor:
+        return await aget_visibilidade(request.user.pk)
+    return None
+
+
+_arender = sync_to_async(render)
+
+# A montagem das consultas pode ir ao banco (filtro_busca confere as
+# tabelas FTS na primeira busca), o que não é permitido no event loop.
+_aconsultar_alunos = sync_to_async(_consultar_alunos)
+_aconsultar_disciplinas = sync_to_async(_consultar_disciplinas)
+_aconsultar_cursos = sync_to_async(_consultar_cursos)
+_aconsultar_turmas = sync_to_async(_consultar_turmas)
+_aconsultar_voluntarios = sync_to_async(_consultar_voluntarios)
+
+
+@login_required
+@conditional_page(Aluno, *VINCULOS)
+@leitura_replica
+async def apesquisar_aluno(request):
+    alunos, campo, params = await _aconsultar_alunos(
+        request, await _avisibilidade(request)
+    )
+    page = await apaginate_keyset(request, alunos, campo, params['dir'])
+
+    return await _arender(
+        request,
+        'academico/alunos/pesquisar_aluno.html',
+        {'alunos': page.object_list, 'page': page, **params},
+    )
+
+
+@login_required
+@conditional_page(Disciplina, *VINCULOS)
+@leitura_replica
+async def apesquisar_disciplina(request):
+    disciplinas, params = await _aconsultar_disciplinas(
+        request, await _avisibilidade(request)
+    )
+    totais = await disciplinas.aaggregate(**TOTAIS_DISCIPLINA)
+    disciplinas_data = [
+        _disciplina_data(row)
+        async for row in disciplinas.aiterator(chunk_size=500)
+    ]
+
+    return await _arender(
+        request,
+        'academico/disciplinas/pesquisar_disciplina.html',
+        {
+            'disciplinas': disciplinas_data,
+            **params,
+            'active_menu': 'disciplinas',
+            **totais,
+        },
+    )
+
+
+@login_required
+@conditional_page(Curso, Voluntario)
+@leitura_replica
+async def apesquisar_curso(request):
+    cursos, campo, params = await _aconsultar_cursos(request)
+    page = await apaginate_keyset(request, cursos, campo, params['dir'])
+
+    return await _arender(
+        request,
+        'academico/cursos/pesquisar_curso.html',
+        {
+            'cursos': page.object_list,
+            'page': page,
+            **params,
+            'active_menu': 'cursos',
+        },
+    )
+
+
+@login_required
+@conditional_page(Turma, PeriodoLetivo, *VINCULOS)
+@leitura_replica
+async def apesquisar_turma(request):
+    turmas, campo, params = await _aconsultar_turmas(
+        request, await _avisibilidade(request)
+    )
+    turmas = turmas.select_related('periodo_letivo')
+    page = await apaginate_keyset(request, turmas, campo, params['dir'])
+
+    return await _arender(
+        request,
+        'academico/turmas/pesquisar_turma.html',
+        {
+            'turmas': page.object_list,
+            'page': page,
+            **params,
+            'active_menu': 'turmas',
+        },
+    )
+
+
+@login_required
+@conditional_page(Voluntario)
+@leitura_replica
+async def apesquisar_voluntario(request):
+    voluntarios, campo, params = await _aconsultar_voluntarios(request)
+    page = await apaginate_keyset(request, voluntarios, campo, params['dir'])
+
+    return await _arender(
+        request,
+        'academico/voluntarios/pesquisar_voluntario.html',
+        {
+            'voluntarios': page.object_list,
+            'page': page,
+            **params,
+            'active_menu': 'voluntarios',
+        },
+    )
+#endregion ---
@@ -0,0 +1,83 @@
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+
+from .models import TurmaAluno, TurmaDisciplinaProfessor
+from .roteamento import usar_primario
+
+# Os signals invalidam o cache a cada alteração de vínculo; o timeout só
+# limita o tempo de vida de dados alterados por update()/bulk_* (que não
+# disparam signals).
+VISIBILIDADE_TIMEOUT = 60 * 60
+
+
+def _cache_key(voluntario_id):
+    return f'academico:visibilidade:{voluntario_id}'
+
+
+# Fica em cache: lida do primário para não guardar dados atrasados da
+# réplica por uma hora.
+@usar_primario()
+def _calcular_visibilidade(voluntario_id):
+    turma_ids = set()
+    disciplina_ids = set()
+    turma_disciplina_ids = set()
+    vinculos = TurmaDisciplinaProfessor.objects.filter(
+        voluntario_id=voluntario_id, status=1, turma_disciplina__status=1
+    ).values_list(
+        'turma_disciplina_id',
+        'turma_disciplina__turma_id',
+        'turma_disciplina__disciplina_id',
+    )
+    for turma_disciplina_id, turma_id, disciplina_id in vinculos:
+        turma_disciplina_ids.add(turma_disciplina_id)
+        turma_ids.add(turma_id)
+        disciplina_ids.add(disciplina_id)
+
+    aluno_ids = set()
+    if turma_ids:
+        aluno_ids = set(
+            TurmaAluno.objects.filter(
+                turma_id__in=turma_ids, status=1
+            ).values_list('aluno_id', flat=True)
+        )
+
+    return {
+        'turma_ids': frozenset(turma_ids - {None}),
+        'aluno_ids': frozenset(aluno_ids - {None}),
+        'disciplina_ids': frozenset(disciplina_ids - {None}),
+        'turma_disciplina_ids': frozenset(turma_disciplina_ids),
+    }
+
+
+def get_visibilidade(voluntario_id):
+    """
+    Retorna os IDs de turmas, alunos, disciplinas e turma/disciplinas
+    visíveis para o professor, no formato {'turma_ids': ..., 'aluno_ids':
+    ..., 'disciplina_ids': ..., 'turma_disciplina_ids': ...}.
+    """
+    key = _cache_key(voluntario_id)
+    visibilidade = cache.get(key)
+    if visibilidade is None:
+        visibilidade = _calcular_visibilidade(voluntario_id)
+        cache.set(key, visibilidade, VISIBILIDADE_TIMEOUT)
+    return visibilidade
+
+
+def invalidar_visibilidade(voluntario_ids):
+    keys = [_cache_key(pk) for pk in voluntario_ids if pk is not None]
+    if keys:
+        cache.delete_many(keys)
+
+
+async def aget_visibilidade(voluntario_id):
+    """
+    Versão de get_visibilidade para views assíncronas.
+    """
+    key = _cache_key(voluntario_id)
+    visibilidade = await cache.aget(key)
+    if visibilidade is None:
+        visibilidade = await sync_to_async(_calcular_visibilidade)(
+            voluntario_id
+        )
+        await cache.aset(key, visibilidade, VISIBILIDADE_TIMEOUT)
+    return visibilidade